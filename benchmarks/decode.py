@@ -0,0 +1,111 @@
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+
+from trello_cli.utils import json_decode
+from trello_cli.utils.trello_api import CardRecord
+
+
+@dataclass
+class DecodeResult:
+    """
+    Measurements of one way of decoding a page of cards: best decode time, and memory held by the decoded cards.
+    """
+    path: str
+    cards: int
+    decode_ms: float
+    retained_kb: int
+    bytes_per_card: int
+
+
+def cards_response(cards: int,
+                   lists: int = 5,
+                   labels: int = 8) -> bytes:
+    """
+    :return: (bytes) Body of a board cards response with every field Trello sends by default, as when no fields
+        parameter is given.
+    """
+    list_ids = [f"64a1f0c2b1e{index:013x}" for index in range(lists)]
+    label_ids = [f"64a1f0c2c2e{index:013x}" for index in range(labels)]
+    return json.dumps([{"id": f"64b2{index:020x}", "name": f"Card {index}", "desc": f"Description of card {index}",
+                        "idList": list_ids[index % lists], "idBoard": "64a1f0c2a0e0000000000000",
+                        "idLabels": label_ids[index % labels:index % labels + 2], "idMembers": [], "idChecklists": [],
+                        "url": f"https://trello.com/c/{index:08x}/{index}-card-{index}",
+                        "shortUrl": f"https://trello.com/c/{index:08x}", "shortLink": f"{index:08x}", "closed": False,
+                        "dateLastActivity": "2024-01-01T00:00:00.000Z", "due": None, "dueComplete": False,
+                        "pos": 16384 * index, "subscribed": False, "isTemplate": False,
+                        "badges": {"votes": 0, "comments": 1, "attachments": 0, "checkItems": 0, "description": True}}
+                       for index in range(cards)]).encode()
+
+
+def measure(path: str,
+            decode: Callable[[bytes], Any],
+            content: bytes,
+            cards: int,
+            runs: int) -> DecodeResult:
+    """
+    Decodes the content runs times, keeping the best time, then measures the memory held by one decoded result.
+    """
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        decode(content)
+        best = min(best, time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        decoded = decode(content)
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del decoded
+
+    return DecodeResult(path=path, cards=cards, decode_ms=round(best * 1000, 2), retained_kb=retained // 1024,
+                        bytes_per_card=retained // cards)
+
+
+def decode_paths() -> dict[str, Callable[[bytes], Any]]:
+    """
+    :return: (dict) The decoding paths compared: the generic dicts used before, and the compact models, with the
+        standard library parser and, when installed, the faster one.
+    """
+    paths = {"dicts (json)": json.loads,
+             "models (json)": lambda content: [CardRecord.from_dict(card) for card in json.loads(content)]}
+    if json_decode.orjson is not None:
+        paths["dicts (orjson)"] = json_decode.orjson.loads
+        paths["models (orjson)"] = lambda content: [CardRecord.from_dict(card)
+                                                    for card in json_decode.orjson.loads(content)]
+    return paths
+
+
+def run(cards: int,
+        runs: int = 5) -> list[DecodeResult]:
+    content = cards_response(cards)
+    return [measure(path, decode, content, cards, runs) for path, decode in decode_paths().items()]
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """
+    Compares the decode time and the memory held by a page of cards decoded as generic dicts and as compact models,
+    and prints one JSON line per path.
+
+    Example usage, from the root directory:
+    python -m benchmarks.decode --cards 20000
+    """
+    parser = argparse.ArgumentParser(description="Decode time and memory of the Trello response models.",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--cards", type=int, default=20000, help="Cards in the decoded response.")
+    parser.add_argument("--runs", type=int, default=5, help="Decodes of each path, the best one is reported.")
+    args = parser.parse_args(argv)
+
+    for result in run(args.cards, args.runs):
+        print(json.dumps(asdict(result)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import argparse
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from io import StringIO
+from pathlib import Path
+from typing import Callable, Optional
+
+from trello_cli.trello_cli import build_parser, create_card_from_args
+from trello_cli.utils.authentication import TrelloCredentials
+from trello_cli.utils.bulk import BulkCardCreator, BulkResult, CardSpec
+from trello_cli.utils.trello_api import ConnectionPoolConfig, TrelloAPI
+
+from benchmarks.stand_in_server import FaultConfig, TrelloStandInServer
+
+BASELINES_DIR = Path(__file__).parent / "baselines"
+BOARD_SHORT_LINK = "bEnChMrk"
+BOARD_URL = f"https://trello.com/b/{BOARD_SHORT_LINK}/benchmark"
+
+# the benchmarks exercise the real TrelloAPI stack against the stand-in, only the credentials are dummies
+BENCHMARK_CREDENTIALS = [TrelloCredentials("benchmark-key", "benchmark-token")]
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Measurements of one scenario. Latencies are in milliseconds, peak RSS in kilobytes.
+    """
+    scenario: str
+    cards: int
+    errors: int
+    seconds: float
+    cards_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    peak_rss_kb: int
+
+
+def percentile(latencies: list[float], q: float) -> float:
+    """
+    :param latencies: (list[float]) measured latencies, in seconds.
+    :param q: (float) percentile between 0 and 100.
+
+    :return: (float) The percentile, in milliseconds.
+    """
+    if len(latencies) < 2:
+        return latencies[0] * 1000 if latencies else 0.0
+    return statistics.quantiles(latencies, n=100, method="inclusive")[int(q) - 1] * 1000
+
+
+def peak_rss_kb() -> int:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if platform.system() == "Darwin" else peak
+
+
+def summarize(scenario: str, latencies: list[float], errors: int, seconds: float) -> BenchmarkResult:
+    return BenchmarkResult(scenario=scenario,
+                           cards=len(latencies),
+                           errors=errors,
+                           seconds=round(seconds, 3),
+                           cards_per_second=round(len(latencies) / seconds, 2),
+                           p50_ms=round(percentile(latencies, 50), 2),
+                           p95_ms=round(percentile(latencies, 95), 2),
+                           p99_ms=round(percentile(latencies, 99), 2),
+                           peak_rss_kb=peak_rss_kb())
+
+
+def single_card_scenario(server: TrelloStandInServer, cards: int) -> BenchmarkResult:
+    """
+    Creates the cards one at a time through the same flow as the single card CLI, with a new TrelloAPI each time.
+    """
+    latencies = []
+    errors = 0
+    args = build_parser().parse_args(["--board_url", BOARD_URL, "--list_name", "TO DO", "--card_name", "Benchmark card",
+                                      "--card_description", "Benchmark description",
+                                      "--card_comment", "Benchmark comment", "--label_name", "Benchmark"])
+    started = time.perf_counter()
+    for _ in range(cards):
+        card_started = time.perf_counter()
+        try:
+            with TrelloAPI(rate_limit=False, api_url=server.api_url, credentials=BENCHMARK_CREDENTIALS) as trello, \
+                    redirect_stdout(StringIO()):
+                create_card_from_args(trello, args)
+        except Exception:  # pylint: disable=broad-except
+            errors += 1
+        latencies.append(time.perf_counter() - card_started)
+
+    return summarize("single", latencies, errors, time.perf_counter() - started)
+
+
+class TimedBulkCardCreator(BulkCardCreator):
+    """
+    BulkCardCreator recording the latency of each row.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.latencies: list[float] = []
+
+    def create(self, row: int, spec: CardSpec) -> BulkResult:
+        started = time.perf_counter()
+        result = super().create(row, spec)
+        self.latencies.append(time.perf_counter() - started)
+        return result
+
+
+def bulk_scenario(server: TrelloStandInServer, cards: int, concurrency: int) -> BenchmarkResult:
+    """
+    Creates the cards through the bulk mode, with the given number of workers.
+    """
+    specs = (CardSpec(BOARD_URL, "TO DO", f"Benchmark card {index}", "Benchmark description", "Benchmark comment",
+                      "Benchmark") for index in range(cards))
+    pool_config = ConnectionPoolConfig(pool_maxsize=concurrency)
+
+    with TrelloAPI(pool_config, rate_limit=False, api_url=server.api_url, credentials=BENCHMARK_CREDENTIALS) as trello:
+        creator = TimedBulkCardCreator(trello, concurrency=concurrency)
+        started = time.perf_counter()
+        _, failed = creator.run(specs)
+        seconds = time.perf_counter() - started
+
+    return summarize(f"bulk_c{concurrency}", creator.latencies, failed, seconds)
+
+
+def compare(results: list[BenchmarkResult], baseline: dict, tolerance: float) -> list[str]:
+    """
+    :param results: (list[BenchmarkResult]) current measurements.
+    :param baseline: (dict) saved baseline, by scenario.
+    :param tolerance: (float) allowed relative degradation, e.g. 0.1 for 10%.
+
+    :return: (list[str]) Description of every regression found.
+    """
+    regressions = []
+    for result in results:
+        saved = baseline.get(result.scenario)
+        if saved is None:
+            continue
+        if result.cards_per_second < saved["cards_per_second"] * (1 - tolerance):
+            regressions.append(f"{result.scenario}: {result.cards_per_second} cards/s, baseline "
+                               f"{saved['cards_per_second']}")
+        if result.p95_ms > saved["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{result.scenario}: p95 {result.p95_ms} ms, baseline {saved['p95_ms']}")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """
+    Runs the benchmark scenarios against a local Trello stand-in server and prints one JSON line per scenario.
+
+    Example usage, from the root directory:
+    python -m benchmarks.run_benchmarks --cards 500 --concurrency 1 8 32 --latency 0.02 --jitter 0.01 --save local
+    python -m benchmarks.run_benchmarks --cards 500 --concurrency 1 8 32 --latency 0.02 --jitter 0.01 --compare local
+    """
+    parser = argparse.ArgumentParser(description="Throughput and latency benchmarks of trello_cli against a local "
+                                                 "Trello stand-in server.",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--cards", type=int, default=200, help="Cards created by each bulk scenario.")
+    parser.add_argument("--single_cards", type=int, default=20, help="Cards created by the single card scenario.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32],
+                        help="Concurrency levels of the bulk scenarios.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random seconds added to every response.")
+    parser.add_argument("--error_rate", type=float, default=0.0, help="Fraction of responses with a 500 error.")
+    parser.add_argument("--rate_limit_rate", type=float, default=0.0, help="Fraction of responses with a 429 error.")
+    parser.add_argument("--save", type=str, help="Name of the baseline to save the results to.")
+    parser.add_argument("--compare", type=str, help="Name of the baseline to compare the results with.")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed relative degradation when comparing.")
+    args = parser.parse_args(argv)
+
+    faults = FaultConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                         rate_limit_rate=args.rate_limit_rate)
+
+    scenarios: list[Callable[[TrelloStandInServer], BenchmarkResult]] = [
+        lambda server: single_card_scenario(server, args.single_cards)]
+    scenarios += [lambda server, concurrency=concurrency: bulk_scenario(server, args.cards, concurrency)
+                  for concurrency in args.concurrency]
+
+    results = []
+    with TrelloStandInServer(faults) as server:
+        server.trello.add_board("Benchmark", BOARD_SHORT_LINK, list_names=("TO DO",), label_names=("Benchmark",))
+        for scenario in scenarios:
+            result = scenario(server)
+            results.append(result)
+            print(json.dumps(asdict(result)))
+
+    if args.save:
+        BASELINES_DIR.mkdir(exist_ok=True)
+        baseline_path = BASELINES_DIR / f"{args.save}.json"
+        baseline_path.write_text(json.dumps({"settings": vars(args),
+                                             "results": {result.scenario: asdict(result) for result in results}},
+                                            indent=2), encoding="utf-8")
+        print(f"Baseline saved to {baseline_path}", file=sys.stderr)
+
+    if args.compare:
+        baseline = json.loads((BASELINES_DIR / f"{args.compare}.json").read_text(encoding="utf-8"))
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for regression in regressions:
+            print(f"[REGRESSION] {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(-1)
+
+
+if __name__ == "__main__":
+    main()
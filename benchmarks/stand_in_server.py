@@ -0,0 +1,129 @@
+import json
+import random
+from email import policy
+from email.parser import BytesParser
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from trello_cli.utils.fake_trello import FakeTrello
+
+
+@dataclass
+class FaultConfig:
+    """
+    Faults injected in every response of the stand-in server.
+
+    :param latency: (float) seconds added to every response.
+    :param jitter: (float) maximum random seconds added on top of latency.
+    :param error_rate: (float) fraction of requests answered with a 500 error.
+    :param rate_limit_rate: (float) fraction of requests answered with a 429 error.
+    :param retry_after: (float) Retry-After seconds sent with the 429 responses.
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 0.0
+
+
+def parse_multipart(content_type: str,
+                    body: bytes) -> dict[str, str]:
+    """
+    :return: (dict) The form fields of a multipart/form-data body, with the size of the uploaded file as 'bytes'.
+    """
+    message = BytesParser(policy=policy.HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+    params = {}
+    for part in message.iter_parts():
+        content = part.get_payload(decode=True)
+        if part.get_filename() is not None:
+            params["bytes"] = str(len(content))
+        else:
+            params[part.get_param("name", header="content-disposition")] = content.decode()
+    return params
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the FakeTrello of the server, injecting the configured faults.
+    """
+    server: "TrelloStandInServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        pass
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        self._handle("GET")
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        self._handle("POST")
+
+    def do_PUT(self) -> None:  # pylint: disable=invalid-name
+        self._handle("PUT")
+
+    def _handle(self, method: str) -> None:
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        length = int(self.headers.get("Content-Length", 0))
+        content_type = self.headers.get("Content-Type", "")
+        if length and content_type.startswith("multipart/form-data"):
+            params.update(parse_multipart(content_type, self.rfile.read(length)))
+        elif length:
+            params.update({key: str(value) for key, value in json.loads(self.rfile.read(length)).items()})
+
+        faults = self.server.faults
+        time.sleep(faults.latency + random.uniform(0, faults.jitter))
+
+        headers = {}
+        roll = random.random()
+        if roll < faults.rate_limit_rate:
+            status, response = 429, "API_TOKEN_LIMIT_EXCEEDED"
+            headers["Retry-After"] = str(faults.retry_after)
+        elif roll < faults.rate_limit_rate + faults.error_rate:
+            status, response = 500, "injected server error"
+        else:
+            status, response = self.server.trello.handle(method, url.path, params)
+
+        body = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for header, value in headers.items():
+            self.send_header(header, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TrelloStandInServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering like Trello from a FakeTrello, on localhost. Use as a context manager to serve in a
+    background thread:
+
+        with TrelloStandInServer() as server:
+            trello = TrelloAPI(api_url=server.api_url)
+    """
+    daemon_threads = True
+
+    def __init__(self, faults: Optional[FaultConfig] = None,
+                 port: int = 0) -> None:
+        super().__init__(("127.0.0.1", port), StandInRequestHandler)
+        self.faults = faults or FaultConfig()
+        self.trello = FakeTrello()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def api_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/1"
+
+    def __enter__(self) -> "TrelloStandInServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,88 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# budget, in microseconds, for the cumulative import time of the CLI module, enforced by test/test_startup.py
+CLI_IMPORT_BUDGET_US = 50_000
+
+
+def run_python(args: list[str]) -> subprocess.CompletedProcess:
+    """
+    Runs a new interpreter, with the trello_cli package importable from the source tree.
+
+    :param args: (list[str]) interpreter args.
+
+    :return: (subprocess.CompletedProcess) Finished process, with its stdout and stderr.
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")]))}
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, check=False)
+
+
+def import_times(args: list[str]) -> dict[str, int]:
+    """
+    Runs the interpreter with -X importtime and parses its report.
+
+    :param args: (list[str]) interpreter args, e.g. ['-c', 'import trello_cli.trello_cli'] or
+        ['-m', 'trello_cli', '--help'].
+
+    :return: (dict[str, int]) Cumulative import time of every imported module, in microseconds.
+    """
+    report = run_python(["-X", "importtime", *args]).stderr
+    times = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def wall_time(args: list[str], runs: int = 5) -> float:
+    """
+    :return: (float) Best wall time of the interpreter run with the given args, in seconds.
+    """
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        run_python(args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """
+    Reports the slowest imports of the CLI and the wall time of 'trello_cli --help' and of an arg validation error,
+    compared with an empty interpreter.
+
+    Example usage, from the root directory:
+    python -m benchmarks.startup --top 15
+    """
+    parser = argparse.ArgumentParser(description="Startup time of the trello_cli command.",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports listed.")
+    parser.add_argument("--runs", type=int, default=5, help="Runs of each command, the best one is reported.")
+    args = parser.parse_args(argv)
+
+    times = import_times(["-m", "trello_cli", "--help"])
+    print(f"{'module':<48}{'cumulative ms':>14}")
+    for module, cumulative in sorted(times.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{module:<48}{cumulative / 1000:>14.1f}")
+
+    cli_import = import_times(["-c", "import trello_cli.trello_cli"]).get("trello_cli.trello_cli", 0)
+    print(f"\ntrello_cli.trello_cli import: {cli_import / 1000:.1f} ms (budget {CLI_IMPORT_BUDGET_US / 1000:.0f} ms)")
+
+    baseline = wall_time(["-c", "pass"], args.runs)
+    for name, command in (("--help", ["-m", "trello_cli", "--help"]),
+                          ("arg error", ["-m", "trello_cli", "--board_url", "https://trello.com/b/x"])):
+        print(f"trello_cli {name}: {wall_time(command, args.runs) * 1000:.1f} ms "
+              f"(empty interpreter {baseline * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+from trello_cli.trello_cli import main
+
+main()
@@ -1,26 +1,354 @@
+import os
 import sys
 import argparse
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from utils.trello_api import TrelloAPI
-from utils.exceptions import APIRequestException, ListNotFoundException, LabelNotFoundException
+if __name__ == "__main__" and not __package__:
+    # run as a script: import the trello_cli package instead of this module
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-# Set Logging
-logging.basicConfig(level=logging.INFO)
+# pylint: disable=import-outside-toplevel,wrong-import-position
+# the Trello API code, and requests with it, is only imported once the args are validated, so that --help and arg
+# errors return right away
+if TYPE_CHECKING:
+    from trello_cli.utils.task_graph import TaskGraph
+    from trello_cli.utils.trello_api import CardInfo, LabelInfo, TrelloAPI
 
+# default time, in seconds, for a cached entry to be considered fresh. Same as utils.board_cache.DEFAULT_TTL
+DEFAULT_CACHE_TTL = 24 * 60 * 60
 
-def main(argv: Optional[list[str]] = None) -> None:
+SINGLE_CARD_ARGS = ("board_url", "list_name", "card_name", "card_description", "card_comment", "label_name")
+
+
+def create_trello(args: argparse.Namespace) -> "TrelloAPI":
     """
-    Runs the Trello API with the user provided args, creating a card on Trello, on the desired board and list, with
-    the requested label (will create the label if not found) and card title, description and a comment.
+    Creates the TrelloAPI instance, with the board cache unless disabled, with instrumentation when profiling, and
+    with label lock files, hedged GETs and operation deadlines when asked.
 
-    Example usage:
-    --board_url "https:<board_url>" --list_name "TO DO" --card_name "New Card"
-    --card_description "New card description" --card_comment "This is a comment for the new card"
-    --label_name "Custom Label"
+    :param args: (argparse.Namespace) parsed CLI args.
+
+    :return: (TrelloAPI) API instance.
+    """
+    from trello_cli.utils.board_cache import BoardCache
+    from trello_cli.utils.instrumentation import HistogramSink, Instrumentation
+    from trello_cli.utils.trello_api import TrelloAPI
+
+    cache = None if args.no_cache else BoardCache(ttl=args.cache_ttl)
+    instrumentation = Instrumentation([HistogramSink()]) if args.profile else None
+
+    hedging = None
+    if args.hedge:
+        from trello_cli.utils.hedging import HedgingPolicy
+
+        hedging = HedgingPolicy()
+
+    trello = TrelloAPI(cache=cache, instrumentation=instrumentation, hedging=hedging, operation_deadline=args.deadline)
+    if args.lock_labels:
+        from trello_cli.utils.single_flight import default_lock_dir
+
+        trello.label_lock_dir = default_lock_dir()
+    return trello
+
+
+def print_profile(trello: "TrelloAPI") -> None:
+    """
+    Prints to stderr the latency breakdown of each operation, when profiling.
+
+    :param trello: (TrelloAPI) API instance.
+    """
+    if trello.instrumentation is None:
+        return
+
+    from trello_cli.utils.instrumentation import HistogramSink
+
+    for sink in trello.instrumentation.sinks:
+        if isinstance(sink, HistogramSink):
+            print(sink.report(), file=sys.stderr)
+
+
+def run_bulk(args: argparse.Namespace) -> None:
+    """
+    Creates one card per row of the --input file, writing the NDJSON results to --output.
+    Exits with -1 if any row failed.
+
+    :param args: (argparse.Namespace) parsed CLI args.
+    """
+    from trello_cli.utils.bulk import BulkCardCreator, read_card_specs
+
+    input_format = args.input_format or ("jsonl" if args.input.endswith((".jsonl", ".ndjson")) else "csv")
+
+    with create_trello(args) as trello, open(args.input, newline="", encoding="utf-8") as input_file:
+        output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        try:
+            creator = BulkCardCreator(trello, concurrency=args.concurrency, upsert=args.upsert)
+            created, failed = creator.run(read_card_specs(input_file, input_format), output)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+            print_profile(trello)
+
+    logging.info("Bulk creation finished: {} cards created, {} rows failed.", created, failed)
+    if failed:
+        sys.exit(-1)
+
+
+def run_plan(args: argparse.Namespace) -> None:
+    """
+    Plans the cards of the --input file: prints the summary of the plan to stderr, then either writes the planned
+    requests as NDJSON to --output, or, with '--plan run', runs the plan writing the results as in bulk mode.
+    Exits with -1 if any row failed.
+
+    :param args: (argparse.Namespace) parsed CLI args.
+    """
+    from trello_cli.utils.bulk import read_card_specs
+    from trello_cli.utils.planner import BatchPlanner
+
+    input_format = args.input_format or ("jsonl" if args.input.endswith((".jsonl", ".ndjson")) else "csv")
+
+    with create_trello(args) as trello, open(args.input, newline="", encoding="utf-8") as input_file:
+        planner = BatchPlanner(trello)
+        plan = planner.plan(read_card_specs(input_file, input_format))
+
+        pool = trello.credential_pool
+        keys = len({credential.credentials.api_key for credential in pool.credentials})
+        print(plan.summary(len(pool), keys), file=sys.stderr)
+
+        output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        try:
+            if args.plan == "show":
+                plan.write_calls(output)
+                failed = len(plan.errors)
+            else:
+                created, failed = planner.execute(plan, output, concurrency=args.concurrency)
+                logging.info("Plan finished: {} cards created, {} rows failed.", created, failed)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+            print_profile(trello)
+
+    if failed:
+        sys.exit(-1)
+
+
+def run_spool(args: argparse.Namespace) -> None:
+    """
+    Adds the card of the single card args, or one card per row of the --input file, to the spool without waiting for
+    Trello. Exits with -1 if any row could not be read, in which case no card is added.
+
+    :param args: (argparse.Namespace) parsed CLI args.
+    """
+    from trello_cli.utils.spool import CardSpool
+
+    if args.input is None:
+        specs = [{name: getattr(args, name) for name in SINGLE_CARD_ARGS}]
+    else:
+        from trello_cli.utils.bulk import read_card_specs
+
+        input_format = args.input_format or ("jsonl" if args.input.endswith((".jsonl", ".ndjson")) else "csv")
+        with open(args.input, newline="", encoding="utf-8") as input_file:
+            specs = list(read_card_specs(input_file, input_format))
+        errors = [(row, spec) for row, spec in enumerate(specs, start=1) if isinstance(spec, Exception)]
+        for row, error in errors:
+            logging.error("Row {}: {}", row, error)
+        if errors:
+            sys.exit(-1)
+        specs = [vars(spec) for spec in specs]
+
+    spool = CardSpool(args.spool_path)
+    try:
+        job_ids = spool.enqueue_many(specs)
+    finally:
+        spool.close()
+    print(f"[CHECKPOINT] {len(job_ids)} card(s) spooled. Last job ID: {job_ids[-1]}")
+
+
+def run_flush(args: argparse.Namespace) -> None:
+    """
+    Creates on Trello the cards waiting in the spool, until none is due or, with --follow, until interrupted.
+    Exits with -1 if any card failed for good.
+
+    :param args: (argparse.Namespace) parsed CLI args.
+    """
+    from trello_cli.utils.spool import CardSpool
+    from trello_cli.utils.spool_flusher import SpoolFlusher
+
+    spool = CardSpool(args.spool_path)
+    with create_trello(args) as trello:
+        flusher = SpoolFlusher(spool, trello, concurrency=args.concurrency)
+        try:
+            created, failed = flusher.run(follow=args.follow)
+        except KeyboardInterrupt:
+            created, failed = flusher.created, flusher.failed
+        finally:
+            print_profile(trello)
+            counts = spool.counts()
+            spool.close()
+
+    logging.info("Spool flushed: {} cards created, {} failed, {} waiting for a retry.", created, failed,
+                 counts["pending"] + counts["in_progress"])
+    if failed:
+        sys.exit(-1)
+
+
+def run_export(args: argparse.Namespace) -> None:
+    """
+    Writes every card of the --board_url board as one NDJSON line to --output, streaming them page by page so that
+    memory use does not grow with the board.
+
+    :param args: (argparse.Namespace) parsed CLI args.
+    """
+    from trello_cli.utils.exceptions import APIRequestException
+
+    with create_trello(args) as trello:
+        output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        exported = 0
+        try:
+            board_data = trello.get_board_data(args.board_url)
+            for card in trello.iter_cards(board_data.id, since=args.since):
+                output.write(card.to_json() + "\n")
+                exported += 1
+        except APIRequestException as e:
+            logging.error(e)
+            sys.exit(-1)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+            print_profile(trello)
+
+    logging.info("Export finished: {} cards written.", exported)
+
+
+def run_daemon(args: argparse.Namespace) -> None:
+    """
+    Serves card creation jobs from trello_client on the --socket until interrupted, with one warm TrelloAPI.
+
+    :param args: (argparse.Namespace) parsed CLI args.
+    """
+    from trello_cli.utils.daemon import TrelloDaemon
+
+    with create_trello(args) as trello, TrelloDaemon(trello, args.socket) as daemon:
+        logging.info("trello_cli daemon listening on {}", daemon.socket_path)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            logging.info("trello_cli daemon stopped after creating {} cards.", daemon.cards_created)
+        finally:
+            print_profile(trello)
+
+
+def upsert_card(trello: "TrelloAPI", list_id: str, label_id: str, args: argparse.Namespace) -> tuple["CardInfo", str]:
+    """
+    Creates the card of the single card args or, with --upsert, skips or updates the card of the list with the same
+    name.
+
+    :return: (tuple[CardInfo, str]) The card and what was done: 'created', 'updated' or 'unchanged'.
+    """
+    if args.upsert is None:
+        return trello.create_card(list_id, label_id, args.card_name, args.card_description), "created"
+    return trello.upsert_card(list_id, label_id, args.card_name, args.card_description, on_match=args.upsert)
+
+
+def find_board_label(trello: "TrelloAPI", board_id: str, label_name: str) -> Optional["LabelInfo"]:
+    """
+    :return: (LabelInfo or None) The label of the board with the given name, or None if it does not exist.
+    """
+    from trello_cli.utils.exceptions import LabelNotFoundException
+
+    try:
+        return trello.get_label_from_board(board_id, label_name)
+    except LabelNotFoundException:
+        return None
+
+
+def build_card_graph(trello: "TrelloAPI", args: argparse.Namespace) -> "TaskGraph":
+    """
+    Builds the steps creating the card and its comment described by the single card CLI args, printing a checkpoint
+    after each step. The list lookup and the label lookup only depend on the board, so they run at the same time. A
+    missing label is only created once the list is found, so that a wrong list name makes no change to the board.
+
+    :param trello: (TrelloAPI) API instance.
+    :param args: (argparse.Namespace) parsed CLI args.
+
+    :return: (TaskGraph) Graph of the steps, ready to be run.
+    """
+    from trello_cli.utils.task_graph import TaskGraph
+
+    graph = TaskGraph()
+
+    # gets the necessary board data from the provided board URL
+    graph.add("board",
+              lambda: trello.get_board_data(args.board_url),
+              on_done=lambda _: print("[CHECKPOINT] Board ID found."))
+
+    # gets the list id from the provided list name
+    graph.add("list",
+              lambda board_data: trello.get_desired_list_id(board_data.id, args.list_name),
+              depends_on=("board",),
+              on_done=lambda _: print("[CHECKPOINT] List ID found."))
+
+    # looks for the label from the provided label_name, at the same time as the list
+    graph.add("label_lookup",
+              lambda board_data: find_board_label(trello, board_data.id, args.label_name),
+              depends_on=("board",))
+
+    # if the label does not exist, a new one will be created, once the list is found
+    graph.add("label",
+              lambda board_data, _, label: (label, False) if label is not None
+              else trello.get_or_create_label(board_data.id, args.label_name),
+              depends_on=("board", "list", "label_lookup"),
+              on_done=lambda label: print("[CHECKPOINT] Label not found. Created a new one." if label[1]
+                                          else "[CHECKPOINT] Label ID found."))
+
+    # creates the card or, in upsert mode, skips or updates the card of the list with the same name
+    graph.add("card",
+              lambda list_id, label: upsert_card(trello, list_id, label[0].id, args),
+              depends_on=("list", "label"),
+              on_done=lambda card: print(f"[CHECKPOINT] Card {card[1]}. Url: {card[0].url}"))
+
+    # creates the comment in the new card. Existing cards already have it
+    graph.add("comment",
+              lambda card: trello.create_card_comment(card[0].id, args.card_comment) if card[1] == "created" else None,
+              depends_on=("card",),
+              on_done=lambda comment: print("[FINISH] Comment created." if comment is not None
+                                            else "[FINISH] Card already exists, comment not created."))
+
+    # uploads the files to the new card at the same time, streaming them from disk. Existing cards already have them
+    if args.attach:
+        from trello_cli.utils.attachments import UploadProgress
+
+        progress = UploadProgress(sys.stderr)
+        graph.add("attachments",
+                  lambda card: trello.add_attachments(card[0].id, args.attach, progress=progress)
+                  if card[1] == "created" else None,
+                  depends_on=("card",),
+                  on_done=lambda attachments: print(f"[FINISH] {len(attachments)} file(s) attached."
+                                                    if attachments is not None
+                                                    else "[FINISH] Card already exists, files not attached."))
+
+    return graph
+
+
+def create_card_from_args(trello: "TrelloAPI", args: argparse.Namespace) -> None:
+    """
+    Creates the card and its comment described by the single card CLI args. The label is created if it does not
+    exist.
+
+    :raises APIRequestException: raised when any call to Trello fails.
+    :raises ListNotFoundException: raised when the requested list could not be found.
+
+    :param trello: (TrelloAPI) API instance.
+    :param args: (argparse.Namespace) parsed CLI args.
     """
+    build_card_graph(trello, args).run()
+
 
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the parser of the CLI args, also used by the benchmarks to run the CLI flows with the same defaults.
+
+    :return: (argparse.ArgumentParser) Parser of every mode of the CLI.
+    """
     parser = argparse.ArgumentParser(description="App to create a Trello card using Trello's RestAPI. "
                                                  "This app was made as technical assessment by Everton "
                                                  "Cardoso Acchetta on April 23",
@@ -30,33 +358,172 @@ def main(argv: Optional[list[str]] = None) -> None:
                         type=str,
                         action="store",
                         help="URL of the board that you wish to create the card on",
-                        required=True)
+                        required=False)
     parser.add_argument("--list_name",
                         type=str,
                         action="store",
                         help="Name of the list (column) to create the card on.",
-                        required=True)
+                        required=False)
     parser.add_argument("--card_name",
                         type=str,
                         action="store",
                         help="Title of the card to be created.",
-                        required=True)
+                        required=False)
     parser.add_argument("--card_description",
                         type=str,
                         action="store",
                         help="Description of the card to be created.",
-                        required=True)
+                        required=False)
     parser.add_argument("--card_comment",
                         type=str,
                         action="store",
                         help="Comment to be created with the card.",
-                        required=True)
+                        required=False)
     parser.add_argument("--label_name",
                         type=str,
                         action="store",
                         help="Name of the label to apply to the card. If the label does not exists, "
                              "it will be created.",
-                        required=True)
+                        required=False)
+    parser.add_argument("--input",
+                        type=str,
+                        action="store",
+                        help="CSV or JSON Lines file with one card per row, using the single card args as fields. "
+                             "When provided, the single card args are ignored.",
+                        required=False)
+    parser.add_argument("--input_format",
+                        type=str,
+                        choices=["csv", "jsonl"],
+                        help="Format of the --input file. Guessed from the file extension when not provided.",
+                        required=False)
+    parser.add_argument("--concurrency",
+                        type=int,
+                        default=8,
+                        help="Number of cards created at the same time in bulk mode.",
+                        required=False)
+    parser.add_argument("--output",
+                        type=str,
+                        default="-",
+                        help="File to write the bulk mode NDJSON results, or the exported cards, to. '-' writes to "
+                             "stdout.",
+                        required=False)
+    parser.add_argument("--plan",
+                        nargs="?",
+                        const="show",
+                        choices=["show", "run"],
+                        help="With --input, resolve the boards and print the requests needed to create the cards and "
+                             "their estimated time: 'show' writes the planned requests to --output without creating "
+                             "anything, 'run' then creates the cards with those requests only.",
+                        required=False)
+    parser.add_argument("--upsert",
+                        nargs="?",
+                        const="skip",
+                        choices=["skip", "update"],
+                        help="Do not create cards whose list already has a card with the same name: 'skip' leaves "
+                             "them as they are, 'update' updates their description and label. Comments are only "
+                             "added to new cards, so a comment that failed on a previous run is not added again. "
+                             "Can not be used with --spool, --flush or --serve.",
+                        required=False)
+    parser.add_argument("--attach",
+                        action="append",
+                        metavar="PATH",
+                        help="File to attach to the new card, streamed from disk. Repeat to attach several files, "
+                             "uploaded at the same time.",
+                        required=False)
+    parser.add_argument("--lock_labels",
+                        action="store_true",
+                        help="Hold a lock file while creating a missing label, so that trello_cli processes running "
+                             "at the same time do not create the same label twice.")
+    parser.add_argument("--hedge",
+                        action="store_true",
+                        help="Send again the board, list and label lookups slower than 95%% of the recent ones, and "
+                             "use the first response.")
+    parser.add_argument("--deadline",
+                        type=float,
+                        default=None,
+                        help="Seconds given to each Trello operation, with all its retries, before failing it.",
+                        required=False)
+    parser.add_argument("--no_cache",
+                        action="store_true",
+                        help="Always resolve the board, list and label from Trello instead of using the local cache.")
+    parser.add_argument("--profile",
+                        action="store_true",
+                        help="Print to stderr the latency breakdown of each Trello operation at exit.")
+    parser.add_argument("--cache_ttl",
+                        type=float,
+                        default=DEFAULT_CACHE_TTL,
+                        help="Seconds for which the cached board, list and label IDs are used before refreshing them.",
+                        required=False)
+
+    parser.add_argument("--spool",
+                        action="store_true",
+                        help="Add the card, or the --input rows, to the local spool instead of creating them on Trello. "
+                             "Use --flush to create the spooled cards.")
+    parser.add_argument("--flush",
+                        action="store_true",
+                        help="Create on Trello the cards waiting in the local spool.")
+    parser.add_argument("--follow",
+                        action="store_true",
+                        help="With --flush, keep creating the cards added to the spool until interrupted.")
+    parser.add_argument("--spool_path",
+                        type=str,
+                        help="SQLite file of the spool. Defaults to $XDG_DATA_HOME/trello_cli/spool.sqlite.",
+                        required=False)
+    parser.add_argument("--export",
+                        action="store_true",
+                        help="Write every card of the --board_url board as NDJSON to --output.")
+    parser.add_argument("--since",
+                        type=str,
+                        help="With --export, only write the cards created after this card ID or date.",
+                        required=False)
+    parser.add_argument("--serve",
+                        action="store_true",
+                        help="Run as a daemon creating the cards sent by trello_client, until interrupted.")
+    parser.add_argument("--socket",
+                        type=str,
+                        help="Unix socket the daemon listens on. Defaults to $XDG_RUNTIME_DIR/trello_cli/daemon.sock.",
+                        required=False)
+
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """
+    Runs the Trello API with the user provided args, creating a card on Trello, on the desired board and list, with
+    the requested label (will create the label if not found) and card title, description and a comment.
+
+    Example usage:
+    --board_url "https:<board_url>" --list_name "TO DO" --card_name "New Card"
+    --card_description "New card description" --card_comment "This is a comment for the new card"
+    --label_name "Custom Label"
+
+    Bulk usage, creating one card per row of a CSV or JSON Lines file with the same fields as the args above and
+    writing one NDJSON result per row:
+    --input cards.csv --concurrency 8 --output results.ndjson
+
+    Plan usage, printing the requests needed by a bulk input, and their estimated time, without creating anything,
+    or running them:
+    --input cards.csv --plan
+    --input cards.csv --plan run
+
+    Add --upsert to the single card or bulk args to skip the cards already in their list, so that running the same
+    input again creates no duplicates.
+
+    Spool usage, adding the card (or every --input row) to a local spool right away, then creating the spooled cards
+    on Trello:
+    <single card args> --spool
+    --flush --follow
+
+    Export usage, writing every card of a board as NDJSON:
+    --export --board_url "https:<board_url>" --output cards.ndjson
+
+    Daemon usage, keeping a warm TrelloAPI serving the jobs sent by trello_client with the single card args:
+    --serve
+    """
+
+    parser = build_parser()
+
+    logging.basicConfig(level=logging.INFO)
 
     # parse all the args
     try:
@@ -66,6 +533,52 @@ def main(argv: Optional[list[str]] = None) -> None:
         logging.error(e)
         sys.exit(-1)
 
+    # spooled and daemon cards are always created with a POST
+    if args.upsert is not None and (args.spool or args.flush or args.serve):
+        parser.error("--upsert can not be used with --spool, --flush or --serve")
+
+    if args.serve:
+        run_daemon(args)
+        return
+
+    if args.flush:
+        run_flush(args)
+        return
+
+    if args.export:
+        if args.board_url is None:
+            parser.error("the following arguments are required: --board_url")
+        run_export(args)
+        return
+
+    if args.input is None:
+        missing_args = [f"--{name}" for name in SINGLE_CARD_ARGS if getattr(args, name) is None]
+        if missing_args:
+            parser.error(f"the following arguments are required: {', '.join(missing_args)}")
+
+    if args.attach:
+        if args.input is not None or args.spool:
+            parser.error("--attach can only be used when creating a single card, without --spool")
+        missing_files = [path for path in args.attach if not os.path.isfile(path)]
+        if missing_files:
+            parser.error(f"the following files to attach were not found: {', '.join(missing_files)}")
+
+    if args.spool:
+        run_spool(args)
+        return
+
+    if args.plan is not None:
+        if args.input is None or args.upsert is not None:
+            parser.error("--plan needs --input and can not be used with --upsert")
+        run_plan(args)
+        return
+
+    if args.input is not None:
+        run_bulk(args)
+        return
+
+    from trello_cli.utils.exceptions import APIRequestException, ListNotFoundException
+
     parser_args = {"board_url": args.board_url,
                    "list_name": args.list_name,
                    "card_name": args.card_name,
@@ -73,53 +586,34 @@ def main(argv: Optional[list[str]] = None) -> None:
                    "card_comment": args.card_comment,
                    "label_name": args.label_name}
 
-    # creates the trello instance
-    trello = TrelloAPI()
-
-    try:
-        # gets the necessary board data from the provided board URL
-        board_data = trello.get_board_data(args.board_url)
-        print("[CHECKPOINT] Board ID found.")
-
-        # gets the list id from the provided list name
-        list_id = trello.get_desired_list_id(board_data.id, args.list_name)
-        print("[CHECKPOINT] List ID found.")
-
-    except (APIRequestException, ListNotFoundException) as e:
-        logging.error(e)
-        logging.debug(parser_args)
-        sys.exit(-1)
-
-    # gets the label id from the provided label_name. If the label does not exist, a new one will be created
-    try:
-        label_id = trello.get_label_from_board(board_data.id, args.label_name)
-        print("[CHECKPOINT] Label ID found.")
-    except LabelNotFoundException:
+    # creates the trello instance, with the board cache unless disabled
+    with create_trello(args) as trello:
+        graph = build_card_graph(trello, args)
         try:
-            label_id = trello.create_label(board_data.id, args.label_name)
-            print("[CHECKPOINT] Label not found. Created a new one.")
+            graph.run()
         except APIRequestException as e:
+            # the cached IDs are only used up to the card creation: a 404 after it is not caused by them, and running
+            # the steps again would create the card twice
+            if trello.cache is None or e.status_code != 404 or "card" in graph.results:
+                logging.error(e)
+                logging.debug(parser_args)
+                sys.exit(-1)
+
+            # a 404 with cached IDs means they are stale: drop the board from the cache and resolve everything again
+            logging.info("Trello returned 404 for cached IDs. Refreshing the board cache.")
+            trello.cache.invalidate_board_url(args.board_url)
+            try:
+                create_card_from_args(trello, args)
+            except (APIRequestException, ListNotFoundException) as retry_error:
+                logging.error(retry_error)
+                logging.debug(parser_args)
+                sys.exit(-1)
+        except ListNotFoundException as e:
             logging.error(e)
             logging.debug(parser_args)
             sys.exit(-1)
-    except APIRequestException as e:
-        logging.error(e)
-        logging.debug(parser_args)
-        sys.exit(-1)
-
-    try:
-        # creates the card
-        card_data = trello.create_card(list_id, label_id.id, args.card_name, args.card_description)
-        print(f"[CHECKPOINT] Card created. Url: {card_data.url}")
-
-        # creates the comment in the new card
-        _ = trello.create_card_comment(card_data.id, args.card_comment)
-        print("[FINISH] Comment created.")
-
-    except APIRequestException as e:
-        logging.error(e)
-        logging.debug(parser_args)
-        sys.exit(-1)
+        finally:
+            print_profile(trello)
 
 
 if __name__ == "__main__":
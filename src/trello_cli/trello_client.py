@@ -0,0 +1,95 @@
+import os
+import sys
+import argparse
+import logging
+from typing import Optional
+
+if __name__ == "__main__" and not __package__:
+    # run as a script: import the trello_cli package instead of its trello_cli.py module
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# pylint: disable=wrong-import-position
+from trello_cli.utils.daemon_client import DEFAULT_TIMEOUT, DaemonClient
+from trello_cli.utils.exceptions import DaemonUnavailableException
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """
+    Thin client of the trello_cli daemon (started with trello_cli.py --serve), creating a card with the same args as
+    trello_cli. Only the standard library is loaded, and the daemon already holds warm connections and resolved IDs,
+    so each card only costs its two POSTs to Trello.
+
+    Example usage:
+    --board_url "https:<board_url>" --list_name "TO DO" --card_name "New Card"
+    --card_description "New card description" --card_comment "This is a comment for the new card"
+    --label_name "Custom Label"
+    """
+
+    parser = argparse.ArgumentParser(description="Creates a Trello card through a running trello_cli daemon.",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument("--board_url",
+                        type=str,
+                        action="store",
+                        help="URL of the board that you wish to create the card on",
+                        required=True)
+    parser.add_argument("--list_name",
+                        type=str,
+                        action="store",
+                        help="Name of the list (column) to create the card on.",
+                        required=True)
+    parser.add_argument("--card_name",
+                        type=str,
+                        action="store",
+                        help="Title of the card to be created.",
+                        required=True)
+    parser.add_argument("--card_description",
+                        type=str,
+                        action="store",
+                        help="Description of the card to be created.",
+                        required=True)
+    parser.add_argument("--card_comment",
+                        type=str,
+                        action="store",
+                        help="Comment to be created with the card.",
+                        required=True)
+    parser.add_argument("--label_name",
+                        type=str,
+                        action="store",
+                        help="Name of the label to apply to the card. If the label does not exists, "
+                             "it will be created.",
+                        required=True)
+    parser.add_argument("--socket",
+                        type=str,
+                        help="Unix socket of the daemon. Defaults to $XDG_RUNTIME_DIR/trello_cli/daemon.sock.",
+                        required=False)
+    parser.add_argument("--timeout",
+                        type=float,
+                        default=DEFAULT_TIMEOUT,
+                        help="Seconds to wait for the daemon to create the card.",
+                        required=False)
+
+    logging.basicConfig(level=logging.INFO)
+
+    args = parser.parse_args(argv)
+    spec = {name: value for name, value in vars(args).items() if name not in ("socket", "timeout")}
+
+    try:
+        result = DaemonClient(args.socket, args.timeout).create_card(spec)
+    except DaemonUnavailableException as e:
+        logging.error(e)
+        sys.exit(-1)
+
+    if "error" in result:
+        if "card_url" in result:
+            print(f"[CHECKPOINT] Card created. Url: {result['card_url']}")
+        logging.error(result["error"])
+        logging.debug(spec)
+        sys.exit(-1)
+
+    print(f"[CHECKPOINT] Card created. Url: {result['card_url']}")
+    print("[FINISH] Comment created.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+from .brace_logging import install as _install_brace_logging
+
+_install_brace_logging()
@@ -0,0 +1,241 @@
+import asyncio
+from typing import Optional, Union
+
+from .authentication import TrelloAuthenticationFromEnv
+from .exceptions import APIRequestException, ListNotFoundException, LabelNotFoundException
+from .trello_api import (BOARD_FIELDS, CARD_FIELDS, LABEL_FIELDS, LIST_FIELDS, TRELLO_API_URL, BoardInfo, CardInfo,
+                         ConnectionPoolConfig, LabelInfo, RequestType, parse_board_short_link)
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - depends on the installed extras
+    aiohttp = None
+
+
+class AsyncTrelloAPI:
+    """
+    Asyncio version of the TrelloAPI. Add a card to a Trello board with label and comment.
+
+    All coroutines share a single aiohttp session, so hundreds of calls can be in flight on the same event loop while
+    reusing the pooled connections. Requires the optional 'async' dependencies (pip install trello_cli[async]).
+    """
+
+    def __init__(self, pool_config: Optional[ConnectionPoolConfig] = None,
+                 api_url: str = TRELLO_API_URL) -> None:
+        if aiohttp is None:
+            raise ImportError("AsyncTrelloAPI requires aiohttp. Install it with: pip install trello_cli[async]")
+
+        # get authentication
+        authentication = TrelloAuthenticationFromEnv()
+        self.query = {"key": authentication.API_KEY,
+                      "token": authentication.API_TOKEN}
+
+        self.headers = {"Accept": "application/json"}
+
+        # the session is created on first use, as it must be bound to the running event loop
+        self.pool_config = pool_config or ConnectionPoolConfig()
+        self.session: Optional["aiohttp.ClientSession"] = None
+
+        # default urls to be used
+        self.board_url = api_url + "/boards/{}"
+        self.boards_list_url = api_url + "/boards/{}/lists"
+        self.board_labels = api_url + "/boards/{}/labels"
+        self.cards_url = api_url + "/cards"
+        self.create_label_url = api_url + "/boards/{}/labels"
+        self.add_comment_url = api_url + "/cards/{}/actions/comments"
+
+    async def __aenter__(self) -> "AsyncTrelloAPI":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes every pooled connection held by this instance.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """
+        Returns the shared session, creating it with a connection pool sized by the pool config on first use.
+
+        :return: (aiohttp.ClientSession) Shared session.
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_config.pool_connections * self.pool_config.pool_maxsize,
+                                             limit_per_host=self.pool_config.pool_maxsize,
+                                             force_close=not self.pool_config.keep_alive)
+            timeout = aiohttp.ClientTimeout(connect=self.pool_config.connect_timeout,
+                                            sock_read=self.pool_config.read_timeout)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers)
+        return self.session
+
+    async def call_api(self, request_type: RequestType,
+                       endpoint: str,
+                       payload: Optional[Union[dict[str, str], str]]) -> dict[str, str] | list[dict[str, str]] | None:
+        """
+        Coroutine to call the Trello API via the shared aiohttp session
+
+        :param request_type: (RequestType) Type of Request. Supported Values - GET, POST
+        :param endpoint: (str) API Endpoint.
+        :param payload: (dict or str) API Request Parameters or Query String.
+
+        :return: (dict, list[dict] or None) Response.
+        """
+        session = self._get_session()
+        try:
+            if request_type == RequestType.GET:
+                request = session.get(endpoint, params=payload)
+            elif request_type == RequestType.POST:
+                request = session.post(endpoint, json=payload)
+            else:
+                return None
+
+            async with request as response:
+                if response.status in (200, 201):
+                    return await response.json(content_type=None)
+
+                response.raise_for_status()
+
+                return None
+
+        except aiohttp.ClientResponseError as errh:
+            raise APIRequestException(errh) from errh
+        except aiohttp.ClientConnectionError as errc:
+            raise APIRequestException(errc) from errc
+        except asyncio.TimeoutError as errt:
+            raise APIRequestException(errt) from errt
+        except aiohttp.ClientError as err:
+            raise APIRequestException(err) from err
+
+    async def get_board_data(self, board_url: str) -> BoardInfo:
+        """
+        Gets from Trello's API general data from the provided board url and returns the board's ID and Name.
+
+        :param board_url: (str) the board url
+
+        :return: (BoardInfo) Found board dataclass.
+        """
+
+        short_link = parse_board_short_link(board_url)
+        if short_link is not None:
+            response = await self.call_api(RequestType.GET,
+                                           self.board_url.format(short_link),
+                                           {**self.query, "fields": BOARD_FIELDS})
+        else:
+            response = await self.call_api(RequestType.GET, f"{board_url}.json", self.query)
+
+        return BoardInfo.from_dict(response)
+
+    async def get_desired_list_id(self, board_id: str,
+                                  list_name: str) -> str:
+        """
+        Gets from Trello's API the ID for the requested list in the provided board.
+
+        :raises ListNotFoundException: raised when the requested list could not be found.
+
+        :param board_id: (str) id of the board to search the list
+        :param list_name: (str) desired list's name
+
+        :return: (str) ID of the found list.
+        """
+        board_lists = await self.call_api(RequestType.GET,
+                                          self.boards_list_url.format(board_id),
+                                          {**self.query, "fields": LIST_FIELDS})
+
+        for current_list in board_lists:
+            if current_list['name'] == list_name:
+                return current_list['id']
+
+        raise ListNotFoundException(list_name)
+
+    async def get_label_from_board(self, board_id: str,
+                                   label_name: str) -> LabelInfo:
+        """
+        Gets from Trello's API the ID for the requested label in the provided board.
+
+        :raises LabelNotFoundException: raised when the requested label could not be found.
+
+        :param board_id: (str) id of the board to search the label
+        :param label_name: (str) name of the label to be searched for.
+
+        :return: (LabelInfo) Dataclass of the found label
+        """
+
+        labels = await self.call_api(RequestType.GET,
+                                     self.board_labels.format(board_id),
+                                     {**self.query, "fields": LABEL_FIELDS})
+
+        for board_label in labels:
+            if board_label["name"] == label_name:
+                return LabelInfo.from_dict(board_label)
+
+        raise LabelNotFoundException(label_name)
+
+    async def create_label(self, board_id: str,
+                           label_name: str) -> LabelInfo:
+        """
+        Creates a new label with no color and the given name in the provided board id.
+
+        :param board_id: (str) id of the board to create the label in.
+        :param label_name: (str) text to be used as label name.
+
+        :return: (LabelInfo) New label dataclass.
+        """
+
+        additional_params = {'name': label_name,
+                             'color': 'null'}
+
+        response = await self.call_api(RequestType.POST,
+                                       self.create_label_url.format(board_id),
+                                       {**self.query, **additional_params})
+
+        return LabelInfo.from_dict(response)
+
+    async def create_card(self, board_list_id: str,
+                          label_id: str,
+                          card_name: str,
+                          card_description: str) -> CardInfo:
+        """
+        Creates a new card in the list id provided with name and description and applies the given label to it.
+
+        :param board_list_id: (str) ID of the list that the card will be created on.
+        :param label_id: (str) ID of the label to be applied to the card
+        :param card_name: (str) Card's title.
+        :param card_description: (str) Card's description
+
+        :return: (CardInfo) New card dataclass.
+        """
+        additional_params = {"idList": board_list_id,
+                             "name": card_name,
+                             "idLabels": label_id,
+                             "desc": card_description,
+                             "fields": CARD_FIELDS}
+
+        response = await self.call_api(RequestType.POST,
+                                       self.cards_url,
+                                       {**self.query, **additional_params})
+
+        return CardInfo.from_dict(response)
+
+    async def create_card_comment(self, card_id: str,
+                                  comment: str) -> str:
+        """
+        Creates a new comment in the provided card_id.
+
+        :param card_id: (str) ID of the card to create the comment on.
+        :param comment: (str) text of the comment to be created
+
+        :return: (str) New comment's ID
+        """
+
+        additional_params = {'text': comment}
+
+        response = await self.call_api(RequestType.POST,
+                                       self.add_comment_url.format(card_id),
+                                       {**self.query, **additional_params})
+
+        return response['id']
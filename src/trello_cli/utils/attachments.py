@@ -0,0 +1,185 @@
+import mimetypes
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TextIO, Union
+
+# bytes read from disk at a time while uploading: memory use does not depend on the size of the file
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+@dataclass(frozen=True)
+class Attachment:
+    """
+    A file to attach to a card.
+
+    :param path: (Path) path of the file.
+    :param name: (str) name shown on the card.
+    :param mime_type: (str) MIME type of the file.
+    """
+    path: Path
+    name: str
+    mime_type: str
+
+    @classmethod
+    def from_path(cls, path: Union[str, Path],
+                  name: Optional[str] = None,
+                  mime_type: Optional[str] = None) -> "Attachment":
+        """
+        :param path: (str or Path) path of the file.
+        :param name: (str) name shown on the card. Defaults to the file name.
+        :param mime_type: (str) MIME type of the file. Guessed from its extension when not provided.
+
+        :return: (Attachment) The attachment.
+        """
+        path = Path(path)
+        return cls(path=path,
+                   name=name or path.name,
+                   mime_type=mime_type or mimetypes.guess_type(path.name)[0] or "application/octet-stream")
+
+    @property
+    def size(self) -> int:
+        return os.stat(self.path).st_size
+
+
+# called with the attachment and the number of its bytes sent so far
+ProgressCallback = Callable[[Attachment, int], None]
+
+
+class MultipartUpload:
+    """
+    Payload of a multipart/form-data POST made of form fields and one file. The body is never built in memory:
+    open() returns a stream reading the file from disk chunk by chunk, which can be opened again for a retry.
+    """
+
+    def __init__(self, fields: dict[str, str],
+                 attachment: Attachment,
+                 progress: Optional[ProgressCallback] = None) -> None:
+        self.fields = fields
+        self.attachment = attachment
+        self.progress = progress
+        self.boundary = uuid.uuid4().hex
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def with_fields(self, fields: dict[str, str]) -> "MultipartUpload":
+        """
+        :param fields: (dict) form fields replacing the current ones, e.g. with other credentials.
+
+        :return: (MultipartUpload) The same upload with the given fields.
+        """
+        upload = MultipartUpload(fields, self.attachment, self.progress)
+        upload.boundary = self.boundary
+        return upload
+
+    def _head(self) -> bytes:
+        parts = [f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+                 for name, value in self.fields.items()]
+        filename = self.attachment.name.replace('"', "%22")
+        parts.append(f'--{self.boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+                     f'Content-Type: {self.attachment.mime_type}\r\n\r\n')
+        return "".join(parts).encode()
+
+    def _tail(self) -> bytes:
+        return f"\r\n--{self.boundary}--\r\n".encode()
+
+    def open(self) -> "MultipartStream":
+        """
+        :return: (MultipartStream) A new stream of the encoded body.
+        """
+        return MultipartStream(self._head(), self.attachment, self._tail(), self.progress)
+
+
+class MultipartStream:
+    """
+    File-like multipart body, reading the attached file lazily. Has a length, so that it is sent with a
+    Content-Length header rather than chunked, and reports the file bytes read to the progress callback.
+    """
+
+    def __init__(self, head: bytes,
+                 attachment: Attachment,
+                 tail: bytes,
+                 progress: Optional[ProgressCallback] = None) -> None:
+        self.attachment = attachment
+        self.progress = progress
+        self._head = head
+        self._tail = tail
+        self._file = open(attachment.path, "rb")  # pylint: disable=consider-using-with
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._sent = 0
+        # remaining bytes of the head, then of the tail once the file is read
+        self._pending = memoryview(head)
+        self._file_done = False
+
+    def __len__(self) -> int:
+        return len(self._head) + self._size + len(self._tail)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while chunk := self.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+    def __enter__(self) -> "MultipartStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        :param size: (int) maximum number of bytes to read, -1 or None for up to UPLOAD_CHUNK_SIZE.
+
+        :return: (bytes) The next bytes of the body, empty once it is all read.
+        """
+        if size is None or size < 0:
+            size = UPLOAD_CHUNK_SIZE
+
+        if not self._pending and not self._file_done:
+            chunk = self._file.read(size)
+            if chunk:
+                self._sent += len(chunk)
+                if self.progress is not None:
+                    self.progress(self.attachment, self._sent)
+                return chunk
+            self._file_done = True
+            self._file.close()
+            self._pending = memoryview(self._tail)
+            if self._sent == 0 and self.progress is not None:
+                self.progress(self.attachment, 0)
+
+        chunk, self._pending = self._pending[:size], self._pending[size:]
+        return bytes(chunk)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class UploadProgress:
+    """
+    Progress callback writing a line to a stream every time an attachment crosses another step of its size.
+    Safe to share between threads.
+
+    :param stream: (TextIO) stream to write to, e.g. sys.stderr.
+    :param step: (int) percentage between two lines.
+    """
+
+    def __init__(self, stream: TextIO,
+                 step: int = 10) -> None:
+        self.stream = stream
+        self.step = step
+        self._lock = threading.Lock()
+        self._reported: dict[Attachment, int] = {}
+
+    def __call__(self, attachment: Attachment,
+                 sent: int) -> None:
+        total = attachment.size
+        percent = 100 if total == 0 else sent * 100 // total
+        percent -= percent % self.step
+        with self._lock:
+            if percent <= self._reported.get(attachment, -1):
+                return
+            self._reported[attachment] = percent
+        self.stream.write(f"[UPLOAD] {attachment.name}: {percent}% of {total} bytes\n")
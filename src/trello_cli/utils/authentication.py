@@ -1,9 +1,18 @@
+import json
+import re
 import sys
+from dataclasses import dataclass
 from os import environ
 from enum import Enum
 
 from .exceptions import EnvVarException
 
+# more tokens can be provided as TRELLO_API_TOKEN_<n>, with their key in TRELLO_API_KEY_<n> or else TRELLO_API_KEY
+NUMBERED_TOKEN_PATTERN = re.compile(r"TRELLO_API_TOKEN_(\d+)")
+
+# JSON file with a list of {"key": ..., "token": ...} credentials
+CREDENTIALS_FILE_VAR = "TRELLO_CREDENTIALS_FILE"
+
 
 class TrelloEnvVars(Enum):
     """
@@ -43,3 +52,65 @@ class TrelloAuthenticationFromEnv:
 
         if len(missing_vars) > 0:
             raise EnvVarException(missing_vars)
+
+
+@dataclass(frozen=True)
+class TrelloCredentials:
+    """
+    One Trello API key and token pair.
+    """
+    api_key: str
+    api_token: str
+
+
+def load_credentials_from_env() -> list[TrelloCredentials]:
+    """
+    Retrieves every credential available in the user environment: TRELLO_API_KEY and TRELLO_API_TOKEN, the numbered
+    TRELLO_API_TOKEN_<n> (with TRELLO_API_KEY_<n>, or TRELLO_API_KEY when missing) and the ones listed in the
+    TRELLO_CREDENTIALS_FILE JSON file. Duplicates are dropped.
+
+    :raises EnvVarException: raised when a numbered token has no key.
+    :raises OSError: raised when the credentials file can not be read.
+    :raises ValueError: raised when the credentials file is not a JSON list of key and token objects.
+
+    :return: (list[TrelloCredentials]) The credentials, in the order listed above.
+    """
+    credentials = []
+    base_key = environ.get(TrelloEnvVars.API_KEY.value)
+    if base_key and environ.get(TrelloEnvVars.API_TOKEN.value):
+        credentials.append(TrelloCredentials(base_key, environ[TrelloEnvVars.API_TOKEN.value]))
+
+    numbered = sorted((int(match.group(1)), value) for name, value in environ.items()
+                      if (match := NUMBERED_TOKEN_PATTERN.fullmatch(name)) and value)
+    for number, token in numbered:
+        api_key = environ.get(f"{TrelloEnvVars.API_KEY.value}_{number}") or base_key
+        if not api_key:
+            raise EnvVarException(f"{TrelloEnvVars.API_KEY.value}_{number}")
+        credentials.append(TrelloCredentials(api_key, token))
+
+    if environ.get(CREDENTIALS_FILE_VAR):
+        with open(environ[CREDENTIALS_FILE_VAR], encoding="utf-8") as credentials_file:
+            entries = json.load(credentials_file)
+        try:
+            credentials.extend(TrelloCredentials(entry["key"], entry["token"]) for entry in entries)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid credentials file {environ[CREDENTIALS_FILE_VAR]}: {e}") from e
+
+    return list(dict.fromkeys(credentials))
+
+
+def require_credentials_from_env() -> list[TrelloCredentials]:
+    """
+    Retrieves the credentials available in the user environment, see load_credentials_from_env(). Missing or invalid
+    credentials are reported like TrelloAuthenticationFromEnv does: the error is printed and the program exits.
+
+    :return: (list[TrelloCredentials]) The credentials, at least one.
+    """
+    try:
+        credentials = load_credentials_from_env()
+        if not credentials:
+            raise EnvVarException([var.value for var in TrelloEnvVars if not environ.get(var.value)])
+    except (EnvVarException, OSError, ValueError) as e:
+        print(f"[AUTHENTICATION ERROR] {e}")
+        sys.exit(-1)
+    return credentials
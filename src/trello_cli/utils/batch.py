@@ -0,0 +1,159 @@
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+from urllib.parse import quote, urlencode
+
+from .exceptions import APIRequestException
+from .trello_api import (LABEL_FIELDS, LIST_FIELDS, LabelInfo, ListInfo, RequestType, TrelloAPI, find_label,
+                         find_list_id)
+
+# maximum number of routes accepted by Trello in a single /1/batch request
+MAX_BATCH_SIZE = 10
+
+
+@dataclass
+class BatchedGet:
+    """
+    A GET route waiting to be sent in a batch, with the future of its caller and the function turning the route
+    response into the result of the future.
+    """
+    route: str
+    future: Future
+    parse: Callable[[Any], Any]
+
+
+class TrelloBatch:
+    """
+    Collects GET lookups and sends them to Trello's /1/batch endpoint, up to 10 routes per request. Every lookup
+    returns a Future resolving to the same dataclass, or raising the same exception, as the TrelloAPI method.
+
+    Pending lookups are sent when 10 of them are collected, on flush(), when leaving the context manager block, or,
+    if a window is given, that many seconds after the first pending lookup. Safe to use from many threads.
+
+    See: https://developer.atlassian.com/cloud/trello/rest/api-group-batch/#api-batch-get
+    """
+
+    def __init__(self, trello: TrelloAPI,
+                 window: Optional[float] = None) -> None:
+        self.trello = trello
+        self.window = window
+
+        self._lock = threading.Lock()
+        self._pending: list[BatchedGet] = []
+        self._timer: Optional[threading.Timer] = None
+
+    def __enter__(self) -> "TrelloBatch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+    def get(self, path: str,
+            params: Optional[dict[str, str]] = None,
+            parse: Callable[[Any], Any] = lambda response: response) -> Future:
+        """
+        Adds a GET route to the batch.
+
+        :param path: (str) API route without the version, e.g. '/boards/<id>/lists'.
+        :param params: (dict) query parameters of the route.
+        :param parse: (Callable) function turning the route response into the future result.
+
+        :return: (Future) Future of the parsed response.
+        """
+        # commas separate the routes of a batch, so the ones inside a route must be escaped
+        route = f"{path}?{urlencode(params, quote_via=quote)}" if params else path
+
+        batched = BatchedGet(route=route, future=Future(), parse=parse)
+        with self._lock:
+            self._pending.append(batched)
+            ready = self._take_pending() if len(self._pending) >= MAX_BATCH_SIZE else []
+            if not ready and self.window is not None and self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if ready:
+            self._send(ready)
+
+        return batched.future
+
+    def get_desired_list_id(self, board_id: str,
+                            list_name: str) -> Future:
+        """
+        Batched version of TrelloAPI.get_desired_list_id.
+
+        :return: (Future[str]) Future of the ID of the found list.
+        """
+        return self.get(f"/boards/{board_id}/lists",
+                        {"fields": LIST_FIELDS},
+                        lambda board_lists: find_list_id([ListInfo.from_dict(board_list) for board_list in board_lists],
+                                                         list_name))
+
+    def get_label_from_board(self, board_id: str,
+                             label_name: str) -> Future:
+        """
+        Batched version of TrelloAPI.get_label_from_board.
+
+        :return: (Future[LabelInfo]) Future of the found label.
+        """
+        return self.get(f"/boards/{board_id}/labels",
+                        {"fields": LABEL_FIELDS},
+                        lambda labels: find_label([LabelInfo.from_dict(label) for label in labels], label_name))
+
+    def get_labels(self, board_id: str) -> Future:
+        """
+        :return: (Future[list[LabelInfo]]) Future of every label of the board.
+        """
+        return self.get(f"/boards/{board_id}/labels",
+                        {"fields": LABEL_FIELDS},
+                        lambda labels: [LabelInfo.from_dict(label) for label in labels])
+
+    def flush(self) -> None:
+        """
+        Sends every pending lookup.
+        """
+        with self._lock:
+            pending = self._take_pending()
+
+        for start in range(0, len(pending), MAX_BATCH_SIZE):
+            self._send(pending[start:start + MAX_BATCH_SIZE])
+
+    def _take_pending(self) -> list[BatchedGet]:
+        # must be called holding the lock
+        pending, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return pending
+
+    def _send(self, batch: list[BatchedGet]) -> None:
+        """
+        Sends up to 10 routes in one request and resolves the future of each one with its own response.
+
+        :param batch: (list[BatchedGet]) routes to be sent.
+        """
+        # identical routes are only sent once
+        routes = list(dict.fromkeys(batched.route for batched in batch))
+
+        try:
+            responses = self.trello.call_api(RequestType.GET,
+                                             self.trello.batch_url,
+                                             {**self.trello.query, "urls": ",".join(routes)})
+        except APIRequestException as e:
+            for batched in batch:
+                batched.future.set_exception(e)
+            return
+
+        results = dict(zip(routes, responses))
+        for batched in batch:
+            result = results.get(batched.route)
+            try:
+                # successful routes are returned as {"200": response}, failed ones as the error description
+                if result is None or "200" not in result:
+                    error = result or {}
+                    raise APIRequestException(error.get("message", f"no batch response for {batched.route}"),
+                                              error.get("statusCode"))
+                batched.future.set_result(batched.parse(result["200"]))
+            except Exception as e:  # pylint: disable=broad-except
+                batched.future.set_exception(e)
@@ -0,0 +1,142 @@
+import sqlite3
+import threading
+import time
+from os import environ
+from pathlib import Path
+from typing import Optional, Union
+
+from .trello_api import BoardInfo, LabelInfo
+
+# default time, in seconds, for a cached entry to be considered fresh
+DEFAULT_TTL = 24 * 60 * 60
+
+
+def default_cache_path() -> Path:
+    """
+    Returns the default cache file location, following the XDG base directory specification.
+
+    :return: (Path) $XDG_CACHE_HOME/trello_cli/board_cache.sqlite, or ~/.cache/trello_cli/board_cache.sqlite.
+    """
+    cache_home = environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "trello_cli" / "board_cache.sqlite"
+
+
+class BoardCache:
+    """
+    On-disk cache of the board, list and label IDs resolved from Trello, stored in SQLite.
+
+    Entries older than ttl seconds are ignored. The cache can be shared between threads.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 ttl: float = DEFAULT_TTL) -> None:
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.ttl = ttl
+
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS boards (
+                board_url TEXT PRIMARY KEY, board_id TEXT NOT NULL, name TEXT NOT NULL, updated REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS lists (
+                board_id TEXT NOT NULL, name TEXT NOT NULL, list_id TEXT NOT NULL, updated REAL NOT NULL,
+                PRIMARY KEY (board_id, name));
+            CREATE TABLE IF NOT EXISTS labels (
+                board_id TEXT NOT NULL, name TEXT NOT NULL, label_id TEXT NOT NULL, updated REAL NOT NULL,
+                PRIMARY KEY (board_id, name));
+        """)
+
+    def close(self) -> None:
+        """
+        Closes the cache database.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _fetch_one(self, query: str, params: tuple[str, ...]) -> Optional[tuple[str, ...]]:
+        with self._lock:
+            row = self._connection.execute(query, (*params, time.time() - self.ttl)).fetchone()
+        return row
+
+    def _write(self, query: str, rows: list[tuple[str, ...]]) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.executemany(query, [(*row, now) for row in rows])
+
+    def get_board(self, board_url: str) -> Optional[BoardInfo]:
+        """
+        :param board_url: (str) the board url.
+
+        :return: (BoardInfo or None) Cached board, or None when missing or expired.
+        """
+        row = self._fetch_one("SELECT board_id, name FROM boards WHERE board_url = ? AND updated >= ?", (board_url,))
+        return BoardInfo(id=row[0], name=row[1]) if row else None
+
+    def set_board(self, board_url: str, board: BoardInfo) -> None:
+        self._write("INSERT OR REPLACE INTO boards VALUES (?, ?, ?, ?)", [(board_url, board.id, board.name)])
+
+    def get_list_id(self, board_id: str, list_name: str) -> Optional[str]:
+        """
+        :param board_id: (str) id of the board of the list.
+        :param list_name: (str) the list name.
+
+        :return: (str or None) Cached list ID, or None when missing or expired.
+        """
+        row = self._fetch_one("SELECT list_id FROM lists WHERE board_id = ? AND name = ? AND updated >= ?",
+                              (board_id, list_name))
+        return row[0] if row else None
+
+    def set_list_ids(self, board_id: str, list_ids: dict[str, str]) -> None:
+        """
+        :param board_id: (str) id of the board of the lists.
+        :param list_ids: (dict) list IDs by list name.
+        """
+        self._write("INSERT OR REPLACE INTO lists VALUES (?, ?, ?, ?)",
+                    [(board_id, name, list_id) for name, list_id in list_ids.items()])
+
+    def get_label(self, board_id: str, label_name: str) -> Optional[LabelInfo]:
+        """
+        :param board_id: (str) id of the board of the label.
+        :param label_name: (str) the label name.
+
+        :return: (LabelInfo or None) Cached label, or None when missing or expired.
+        """
+        row = self._fetch_one("SELECT label_id, name FROM labels WHERE board_id = ? AND name = ? AND updated >= ?",
+                              (board_id, label_name))
+        return LabelInfo(id=row[0], name=row[1]) if row else None
+
+    def set_labels(self, board_id: str, labels: list[LabelInfo]) -> None:
+        """
+        :param board_id: (str) id of the board of the labels.
+        :param labels: (list[LabelInfo]) labels to be cached.
+        """
+        self._write("INSERT OR REPLACE INTO labels VALUES (?, ?, ?, ?)",
+                    [(board_id, label.name, label.id) for label in labels])
+
+    def invalidate(self, board_id: Optional[str] = None) -> None:
+        """
+        Removes the cached entries of the given board, or of every board when no board is given.
+
+        :param board_id: (str) id of the board to be removed from the cache.
+        """
+        with self._lock:
+            if board_id is None:
+                self._connection.executescript("DELETE FROM boards; DELETE FROM lists; DELETE FROM labels;")
+                return
+            for table in ("boards", "lists", "labels"):
+                self._connection.execute(f"DELETE FROM {table} WHERE board_id = ?", (board_id,))
+
+    def invalidate_board_url(self, board_url: str) -> None:
+        """
+        Removes the cached entries of the board with the given url, including its lists and labels.
+
+        :param board_url: (str) the board url.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT board_id FROM boards WHERE board_url = ?", (board_url,)).fetchone()
+            self._connection.execute("DELETE FROM boards WHERE board_url = ?", (board_url,))
+        if row:
+            self.invalidate(row[0])
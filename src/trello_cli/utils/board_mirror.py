@@ -0,0 +1,336 @@
+import json
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from os import environ
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from .json_decode import loads
+from .trello_api import BoardInfo, BoardSnapshot, LabelInfo, RequestType, TrelloAPI
+
+# default maximum age, in seconds, of the mirrored data served by the lookups
+DEFAULT_MAX_STALENESS = 60.0
+
+# most actions returned by one request to the actions feed, the maximum accepted by Trello. A full page means there may
+# be more changes than the ones received, so the board is fully synced again instead
+ACTIONS_PAGE_LIMIT = 1000
+
+# actions changing the cards, lists or labels of a board
+MIRRORED_ACTIONS = ("createCard", "copyCard", "updateCard", "deleteCard", "moveCardToBoard", "moveCardFromBoard",
+                    "createList", "updateList", "moveListToBoard", "moveListFromBoard",
+                    "createLabel", "updateLabel", "deleteLabel")
+
+# card fields, in the mirror and as named by Trello
+CARD_FIELDS = {"name": "name", "desc": "desc", "list_id": "idList", "closed": "closed"}
+
+
+def default_mirror_path() -> Path:
+    """
+    Returns the default mirror file location, following the XDG base directory specification.
+
+    :return: (Path) $XDG_CACHE_HOME/trello_cli/board_mirror.sqlite, or ~/.cache/trello_cli/board_mirror.sqlite.
+    """
+    cache_home = environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "trello_cli" / "board_mirror.sqlite"
+
+
+@dataclass(slots=True)
+class MirroredCard:
+    """
+    A card of a mirrored board. desc is None when the card was only seen in the actions feed, which does not include
+    the description of new cards. Slotted, with its list id interned, as a mirror holds every card of the board.
+    """
+    id: str
+    list_id: str
+    name: str
+    url: str
+    desc: Optional[str] = None
+    closed: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MirroredCard":
+        return cls(id=data["id"], list_id=sys.intern(data["idList"]), name=data["name"], url=data["url"], desc=data.get("desc"),
+                   closed=data.get("closed", False))
+
+
+class BoardMirror:
+    """
+    Local copy of the lists, labels and cards of a board, stored in SQLite. The first sync downloads the whole board,
+    the next ones only apply the actions made since the last one seen, so their cost grows with the changes made to
+    the board instead of its size.
+
+    Lookups sync first when the last sync is older than max_staleness seconds, so they never answer with data older
+    than that. Safe to share between threads.
+    """
+
+    def __init__(self, trello: TrelloAPI,
+                 board_id: str,
+                 path: Optional[Union[str, Path]] = None,
+                 max_staleness: float = DEFAULT_MAX_STALENESS) -> None:
+        self.trello = trello
+        self.board_id = board_id
+        self.max_staleness = max_staleness
+        self.path = Path(path) if path is not None else default_mirror_path()
+
+        self.board: Optional[BoardInfo] = None
+        self.lists: dict[str, dict[str, Any]] = {}
+        self.labels: dict[str, dict[str, Any]] = {}
+        self.cards: dict[str, MirroredCard] = {}
+        self.last_action_id: Optional[str] = None
+        self.synced: Optional[float] = None
+        # snapshots built from the lists and labels, by normalize, dropped when either changes
+        self._snapshots: dict[bool, BoardSnapshot] = {}
+
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS mirrors (
+                board_id TEXT PRIMARY KEY, id TEXT NOT NULL, name TEXT NOT NULL, last_action_id TEXT,
+                synced REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS mirror_objects (
+                board_id TEXT NOT NULL, kind TEXT NOT NULL, id TEXT NOT NULL, data TEXT NOT NULL,
+                PRIMARY KEY (board_id, kind, id));
+        """)
+        self._load()
+
+    def close(self) -> None:
+        """
+        Closes the mirror database.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _load(self) -> None:
+        row = self._connection.execute("SELECT id, name, last_action_id, synced FROM mirrors WHERE board_id = ?",
+                                       (self.board_id,)).fetchone()
+        if row is None:
+            return
+
+        self.board = BoardInfo(id=row[0], name=row[1])
+        self.last_action_id, self.synced = row[2], row[3]
+        # rowid keeps the order of the board, which decides the first list or label found with a given name
+        for kind, object_id, data in self._connection.execute(
+                "SELECT kind, id, data FROM mirror_objects WHERE board_id = ? ORDER BY rowid", (self.board_id,)):
+            if kind == "card":
+                card = loads(data)
+                self.cards[object_id] = MirroredCard(**{**card, "list_id": card["list_id"] and sys.intern(card["list_id"])})
+            else:
+                getattr(self, f"{kind}s")[object_id] = loads(data)
+
+    @property
+    def staleness(self) -> float:
+        """
+        :return: (float) Seconds since the last sync, infinite when never synced.
+        """
+        return float("inf") if self.synced is None else time.time() - self.synced
+
+    def ensure_fresh(self) -> None:
+        """
+        Syncs the mirror when its data is older than max_staleness.
+
+        :raises APIRequestException: raised when the sync fails, instead of answering with stale data.
+        """
+        if self.staleness > self.max_staleness:
+            self.sync()
+
+    def sync(self) -> int:
+        """
+        Applies the actions made on the board since the last sync, or downloads the whole board on the first sync and
+        when there are too many actions to apply.
+
+        :return: (int) Number of actions applied, or -1 after a full sync.
+        """
+        with self._lock:
+            if self.last_action_id is None:
+                self.full_sync()
+                return -1
+
+            started = time.time()
+            actions = self.trello.call_api(RequestType.GET,
+                                           self.trello.board_actions_url.format(self.board_id),
+                                           {**self.trello.query,
+                                            "since": self.last_action_id,
+                                            "filter": ",".join(MIRRORED_ACTIONS),
+                                            "fields": "type,date,data",
+                                            "limit": str(ACTIONS_PAGE_LIMIT)})
+            if len(actions) >= ACTIONS_PAGE_LIMIT:
+                self.full_sync()
+                return -1
+
+            self._connection.execute("BEGIN")
+            try:
+                # the feed lists the newest actions first
+                for action in reversed(actions):
+                    self._apply(action)
+                if actions:
+                    self.last_action_id = actions[0]["id"]
+                self._save_state(started)
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+            return len(actions)
+
+    def full_sync(self) -> None:
+        """
+        Downloads the whole board, with its lists, labels and cards, replacing the mirrored data.
+        """
+        with self._lock:
+            started = time.time()
+            # the last action is read before the board, so that no change made in between is missed by the next sync
+            latest = self.trello.call_api(RequestType.GET,
+                                          self.trello.board_actions_url.format(self.board_id),
+                                          {**self.trello.query, "fields": "id", "limit": "1"})
+            board = self.trello.call_api(RequestType.GET,
+                                         self.trello.board_url.format(self.board_id),
+                                         {**self.trello.query,
+                                          "fields": "name",
+                                          "lists": "all",
+                                          "list_fields": "name,closed",
+                                          "labels": "all",
+                                          "label_fields": "name,color",
+                                          "labels_limit": "1000",
+                                          "cards": "all",
+                                          "card_fields": "name,desc,idList,closed,url"})
+
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.execute("DELETE FROM mirror_objects WHERE board_id = ?", (self.board_id,))
+                self.lists, self.labels, self.cards = {}, {}, {}
+                self._snapshots.clear()
+                self.board = BoardInfo.from_dict(board)
+                for board_list in board.get("lists", []):
+                    self._put("list", {"id": board_list["id"], "name": board_list["name"],
+                                       "closed": board_list.get("closed", False)})
+                for label in board.get("labels", []):
+                    self._put("label", {"id": label["id"], "name": label["name"], "color": label.get("color")})
+                for card in board.get("cards", []):
+                    self._put("card", MirroredCard.from_dict(card))
+                self.last_action_id = latest[0]["id"] if latest else ""
+                self._save_state(started)
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def _save_state(self, synced: float) -> None:
+        self.synced = synced
+        self._connection.execute("INSERT OR REPLACE INTO mirrors VALUES (?, ?, ?, ?, ?)",
+                                 (self.board_id, self.board.id, self.board.name, self.last_action_id, synced))
+
+    def _put(self, kind: str, value: Union[dict[str, Any], MirroredCard]) -> None:
+        if isinstance(value, MirroredCard):
+            self.cards[value.id] = value
+            data = asdict(value)
+        else:
+            getattr(self, f"{kind}s")[value["id"]] = value
+            self._snapshots.clear()
+            data = value
+        # updating in place keeps the rowid, and so the board order
+        self._connection.execute("INSERT INTO mirror_objects VALUES (?, ?, ?, ?) "
+                                 "ON CONFLICT (board_id, kind, id) DO UPDATE SET data = excluded.data",
+                                 (self.board_id, kind, data["id"], json.dumps(data)))
+
+    def _delete(self, kind: str, object_id: str) -> None:
+        getattr(self, f"{kind}s").pop(object_id, None)
+        self._snapshots.clear()
+        self._connection.execute("DELETE FROM mirror_objects WHERE board_id = ? AND kind = ? AND id = ?",
+                                 (self.board_id, kind, object_id))
+
+    def _apply(self, action: dict[str, Any]) -> None:  # pylint: disable=too-many-branches
+        """
+        Applies one action of the feed to the mirrored data. Actions on objects unknown to the mirror, and of types
+        not changing cards, lists or labels, are ignored.
+
+        :param action: (dict) action from the feed.
+        """
+        action_type, data = action["type"], action["data"]
+
+        if action_type in ("createCard", "copyCard", "moveCardToBoard"):
+            card = data["card"]
+            self._put("card", MirroredCard(id=card["id"], list_id=data.get("list", {}).get("id", card.get("idList")),
+                                           name=card["name"], url=f"https://trello.com/c/{card.get('shortLink', '')}",
+                                           desc=card.get("desc")))
+        elif action_type == "updateCard":
+            card = self.cards.get(data["card"]["id"])
+            if card is not None:
+                for attribute, trello_field in CARD_FIELDS.items():
+                    if trello_field in data["card"]:
+                        setattr(card, attribute, data["card"][trello_field])
+                self._put("card", card)
+        elif action_type in ("deleteCard", "moveCardFromBoard"):
+            self._delete("card", data["card"]["id"])
+        elif action_type in ("createList", "moveListToBoard"):
+            self._put("list", {"id": data["list"]["id"], "name": data["list"]["name"], "closed": False})
+        elif action_type == "updateList":
+            board_list = self.lists.get(data["list"]["id"])
+            if board_list is not None:
+                board_list.update({key: data["list"][key] for key in ("name", "closed") if key in data["list"]})
+                self._put("list", board_list)
+        elif action_type == "moveListFromBoard":
+            self._delete("list", data["list"]["id"])
+        elif action_type in ("createLabel", "updateLabel"):
+            label = {**self.labels.get(data["label"]["id"], {"color": None}), **data["label"]}
+            self._put("label", {"id": label["id"], "name": label.get("name", ""), "color": label.get("color")})
+        elif action_type == "deleteLabel":
+            self._delete("label", data["label"]["id"])
+
+    def add_label(self, label: LabelInfo) -> None:
+        """
+        Adds a label created through the TrelloAPI, so that it is found before the next sync.
+
+        :param label: (LabelInfo) the new label.
+        """
+        with self._lock:
+            self._put("label", {"id": label.id, "name": label.name, "color": None})
+
+    def snapshot(self, normalize: bool = False) -> BoardSnapshot:
+        """
+        :param normalize: (bool) match list and label names ignoring case and extra whitespace.
+
+        :return: (BoardSnapshot) Open lists and all labels of the board, synced first if stale.
+        """
+        self.ensure_fresh()
+        with self._lock:
+            if normalize not in self._snapshots:
+                self._snapshots[normalize] = BoardSnapshot.from_dict(
+                    {"id": self.board.id,
+                     "name": self.board.name,
+                     "lists": [board_list for board_list in self.lists.values() if not board_list["closed"]],
+                     "labels": list(self.labels.values())}, normalize)
+            return self._snapshots[normalize]
+
+    def get_list_id(self, list_name: str) -> str:
+        """
+        :raises ListNotFoundException: raised when no open list of the board has the requested name.
+
+        :return: (str) ID of the first open list with the given name.
+        """
+        return self.snapshot().get_list_id(list_name)
+
+    def get_label(self, label_name: str) -> LabelInfo:
+        """
+        :raises LabelNotFoundException: raised when no label of the board has the requested name.
+
+        :return: (LabelInfo) First label with the given name.
+        """
+        return self.snapshot().get_label(label_name)
+
+    def get_cards(self, list_id: Optional[str] = None,
+                  include_closed: bool = False) -> list[MirroredCard]:
+        """
+        :param list_id: (str) only return the cards of this list.
+        :param include_closed: (bool) also return the archived cards.
+
+        :return: (list[MirroredCard]) Cards of the board, synced first if stale.
+        """
+        self.ensure_fresh()
+        with self._lock:
+            return [card for card in self.cards.values()
+                    if (list_id is None or card.list_id == list_id) and (include_closed or not card.closed)]
@@ -0,0 +1,22 @@
+import logging
+
+
+class BraceLogRecord(logging.LogRecord):
+    """
+    LogRecord that also formats messages written with {} placeholders, the style the pylint configuration asks for.
+    Messages written with % placeholders, e.g. by other libraries, are formatted as usual.
+    """
+
+    def getMessage(self) -> str:
+        try:
+            return super().getMessage()
+        except (TypeError, ValueError):
+            return str(self.msg).format(*self.args)
+
+
+def install() -> None:
+    """
+    Makes the logging module create BraceLogRecord records, unless another record factory is already installed.
+    """
+    if logging.getLogRecordFactory() is logging.LogRecord:
+        logging.setLogRecordFactory(BraceLogRecord)
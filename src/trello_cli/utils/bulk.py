@@ -0,0 +1,283 @@
+import csv
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from typing import Callable, Iterable, Iterator, Optional, TextIO, TypeVar
+
+from .exceptions import APIRequestException, LabelNotFoundException, ListNotFoundException
+from .trello_api import BoardSnapshot, LabelInfo, TrelloAPI
+
+T = TypeVar("T")
+
+
+@dataclass
+class CardSpec:
+    """
+    All the fields needed to create one card, the same ones accepted by the trello_cli arguments.
+    """
+    board_url: str
+    list_name: str
+    card_name: str
+    card_description: str
+    card_comment: str
+    label_name: str
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str]) -> "CardSpec":
+        return cls(**{field.name: data[field.name] for field in fields(cls)})
+
+
+@dataclass
+class BulkResult:
+    """
+    Outcome of one input row. Either card_url or error is set, or both when the card was created but its comment was
+    not, so that the card is not created again when the row is retried. In upsert mode, action tells whether the card
+    was created, updated or left unchanged.
+    """
+    row: int
+    card_id: Optional[str] = None
+    card_url: Optional[str] = None
+    error: Optional[str] = None
+    retries: int = 0
+    action: Optional[str] = None
+
+    def to_json(self) -> str:
+        return json.dumps({key: value for key, value in asdict(self).items() if value is not None})
+
+
+def read_card_specs(file: TextIO, file_format: str) -> Iterator[CardSpec | ValueError]:
+    """
+    Streams the card specs from a CSV (with header) or JSON Lines file, one row at a time.
+
+    :raises ValueError: raised when the file format is not supported.
+
+    :param file: (TextIO) opened input file.
+    :param file_format: (str) 'csv' or 'jsonl'.
+
+    :return: (Iterator[CardSpec | ValueError]) Lazy iterator over the rows. Rows that can not be parsed, such as invalid
+        JSON, a JSON value other than an object or a missing field, are yielded as a ValueError, so that they are
+        reported without stopping the whole job.
+    """
+    if file_format == "csv":
+        rows = csv.DictReader(file)
+    elif file_format == "jsonl":
+        rows = (line for line in file if line.strip())
+    else:
+        raise ValueError(f"Unsupported input format: {file_format}")
+
+    for row in rows:
+        if file_format == "jsonl":
+            try:
+                row = json.loads(row)
+            except json.JSONDecodeError as e:
+                yield ValueError(f"Invalid row, not valid JSON: {e}")
+                continue
+            if not isinstance(row, dict):
+                yield ValueError(f"Invalid row, expected a JSON object, got {type(row).__name__}")
+                continue
+
+        try:
+            yield CardSpec.from_dict(row)
+        except (KeyError, TypeError) as e:
+            yield ValueError(f"Invalid row, missing field {e}")
+
+
+class BulkCardCreator:
+    """
+    Creates many cards through a bounded worker pool.
+
+    Each distinct board is fetched once as a BoardSnapshot, against which every list and label name is resolved, and
+    missing labels are created once and shared by every row that needs them. At most
+    max_pending rows are read ahead of the workers, so the input is never fully held in memory.
+
+    With upsert set to 'skip' or 'update', rows matching a card already in their list, by name or by upsert_key, skip
+    or update it instead of creating a new card, see TrelloAPI.upsert_card(). Comments are only added to new cards, so
+    running the same input again makes no change, and a card whose comment failed on a previous run is left without it.
+    """
+
+    def __init__(self, trello: TrelloAPI,
+                 concurrency: int = 8,
+                 max_pending: Optional[int] = None,
+                 upsert: Optional[str] = None,
+                 upsert_key: Optional[Callable[[dict], str]] = None) -> None:
+        self.trello = trello
+        self.concurrency = concurrency
+        self.max_pending = max_pending or concurrency * 2
+        self.upsert = upsert
+        self.upsert_key = upsert_key
+
+        self._lock = threading.Lock()
+        self._resolved: dict[tuple[str, ...], Future] = {}
+
+    @staticmethod
+    def _is_permanent(error: Exception) -> bool:
+        """
+        :return: (bool) True for errors that resolving again would raise again, such as a board, list or label that
+            does not exist.
+        """
+        if isinstance(error, APIRequestException):
+            return error.status_code == 404
+        return isinstance(error, (ListNotFoundException, LabelNotFoundException))
+
+    def _resolve_once(self, key: tuple[str, ...], resolver: Callable[[], T]) -> T:
+        """
+        Runs the resolver only for the first caller of the given key. Concurrent and later callers wait for and
+        reuse its result, or get the same exception raised. Transient errors are only shared with the concurrent
+        callers: the key is dropped, so that the next caller resolves it again.
+
+        :param key: (tuple) identifier of the resolved value.
+        :param resolver: (Callable) function computing the value.
+
+        :return: Resolved value.
+        """
+        with self._lock:
+            future = self._resolved.get(key)
+            owner = future is None
+            if owner:
+                future = self._resolved[key] = Future()
+
+        if owner:
+            try:
+                future.set_result(resolver())
+            except Exception as e:  # pylint: disable=broad-except
+                if not self._is_permanent(e):
+                    with self._lock:
+                        if self._resolved.get(key) is future:
+                            del self._resolved[key]
+                future.set_exception(e)
+
+        return future.result()
+
+    def seed(self, board_url: str,
+             snapshot: BoardSnapshot | Exception) -> None:
+        """
+        Provides the snapshot of a board resolved beforehand, or the error raised resolving it, so that the specs
+        using it make no lookup. Transient errors are not kept: the specs using the board resolve it again.
+
+        :param board_url: (str) url of the board, as given in the specs.
+        :param snapshot: (BoardSnapshot or Exception) snapshot of the board, or the error to raise for its specs.
+        """
+        future = Future()
+        if isinstance(snapshot, Exception):
+            if not self._is_permanent(snapshot):
+                return
+            future.set_exception(snapshot)
+        else:
+            future.set_result(snapshot)
+        with self._lock:
+            self._resolved[("board", board_url)] = future
+
+    def forget(self, board_url: str) -> None:
+        """
+        Drops the resolved snapshot and labels of a board, so that the next spec using it resolves them again.
+
+        :param board_url: (str) url of the board, as given in the specs.
+        """
+        with self._lock:
+            future = self._resolved.pop(("board", board_url), None)
+            if future is None or not future.done() or future.exception() is not None:
+                return
+            board_id = future.result().board.id
+            for key in [key for key in self._resolved if key[:2] == ("label", board_id)]:
+                del self._resolved[key]
+
+    def _get_snapshot(self, board_url: str) -> BoardSnapshot:
+        board = self.trello.get_board_data(board_url)
+        return self.trello.get_board_snapshot(board.id)
+
+    def _get_or_create_label(self, snapshot: BoardSnapshot, label_name: str) -> LabelInfo:
+        try:
+            return snapshot.get_label(label_name)
+        except LabelNotFoundException:
+            # shares the creation with the other callers of this process and, with label lock files, of other processes
+            return self.trello.get_or_create_label(snapshot.board.id, label_name, missing=True)[0]
+
+    def resolve(self, spec: CardSpec) -> tuple[str, LabelInfo]:
+        """
+        Resolves the list and label of a spec through the shared snapshots, creating the label if it does not exist.
+
+        :raises APIRequestException: raised when any call to Trello fails.
+        :raises ListNotFoundException: raised when the list could not be found.
+
+        :param spec: (CardSpec) card to be created.
+
+        :return: (tuple[str, LabelInfo]) ID of the list and the label.
+        """
+        snapshot = self._resolve_once(("board", spec.board_url), lambda: self._get_snapshot(spec.board_url))
+        list_id = snapshot.get_list_id(spec.list_name)
+        label = self._resolve_once(("label", snapshot.board.id, spec.label_name),
+                                   lambda: self._get_or_create_label(snapshot, spec.label_name))
+        return list_id, label
+
+    def create(self, row: int, spec: CardSpec) -> BulkResult:
+        """
+        Creates the card and comment of one spec, resolving its board, list and label through the shared snapshots.
+
+        :param row: (int) row number of the spec in the input.
+        :param spec: (CardSpec) card to be created.
+
+        :return: (BulkResult) Created card, error, or both when the card was created but its comment failed.
+        """
+        card = None
+        action = None
+        error = None
+        try:
+            list_id, label = self.resolve(spec)
+
+            if self.upsert is None:
+                card = self.trello.create_card(list_id, label.id, spec.card_name, spec.card_description)
+            else:
+                card, action = self.trello.upsert_card(list_id, label.id, spec.card_name, spec.card_description,
+                                                       on_match=self.upsert, key=self.upsert_key)
+            if action in (None, "created"):
+                self.trello.create_card_comment(card.id, spec.card_comment)
+
+        except (APIRequestException, ListNotFoundException) as e:
+            if card is None:
+                return BulkResult(row=row, error=str(e), retries=self.trello.last_retries)
+            error = str(e)
+
+        return BulkResult(row=row, card_id=card.id, card_url=card.url, error=error,
+                          retries=card.retries + self.trello.last_retries, action=action)
+
+    def run(self, specs: Iterable[CardSpec | Exception],
+            output: Optional[TextIO] = None) -> tuple[int, int]:
+        """
+        Creates the cards of every spec, writing each result as a NDJSON line to output as soon as it is done.
+
+        :param specs: (Iterable) card specs, or exceptions for rows that could not be parsed.
+        :param output: (TextIO) stream to write the results to.
+
+        :return: (tuple[int, int]) Number of created cards and number of failed rows.
+        """
+        slots = threading.BoundedSemaphore(self.max_pending)
+        counts = {"created": 0, "failed": 0}
+
+        def write(result: BulkResult) -> None:
+            with self._lock:
+                counts["created" if result.error is None else "failed"] += 1
+                if output is not None:
+                    output.write(result.to_json() + "\n")
+                    output.flush()
+
+        def on_done(future: Future, row: int) -> None:
+            try:
+                write(future.result())
+            except Exception as e:  # pylint: disable=broad-except
+                write(BulkResult(row=row, error=str(e)))
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for row, spec in enumerate(specs, start=1):
+                if isinstance(spec, Exception):
+                    write(BulkResult(row=row, error=str(spec)))
+                    continue
+
+                # backpressure: wait for a free slot before reading the next row
+                slots.acquire()  # pylint: disable=consider-using-with
+                future = executor.submit(self.create, row, spec)
+                future.add_done_callback(lambda done, row=row: on_done(done, row))
+
+        return counts["created"], counts["failed"]
@@ -0,0 +1,79 @@
+import threading
+from typing import Any, Callable, Optional
+
+from .trello_api import RequestType, TrelloAPI
+
+# card fields kept in the index, enough to tell whether an upserted card changed
+INDEX_FIELDS = "id,url,name,desc,idLabels"
+
+
+def card_name_key(card: dict[str, Any]) -> str:
+    """
+    Default upsert key: cards with the same name are the same card.
+
+    :param card: (dict) card with at least its name and desc.
+
+    :return: (str) Key of the card.
+    """
+    return card["name"]
+
+
+class CardIndex:
+    """
+    Hash index of the open cards of one list, by a key computed from each card (its name by default). The list is
+    fetched with a single request the first time the index is used, then every card created through the index is
+    added to it, so any number of lookups cost no further request.
+
+    Use lock(key) around a lookup and the creation of a missing card, so that two threads upserting the same key do
+    not both create it. Safe to share between threads.
+    """
+
+    def __init__(self, trello: TrelloAPI,
+                 list_id: str,
+                 key: Callable[[dict[str, Any]], str] = card_name_key) -> None:
+        self.trello = trello
+        self.list_id = list_id
+        self.key = key
+
+        self._lock = threading.Lock()
+        self._cards: Optional[dict[str, dict[str, Any]]] = None
+        self._key_locks: dict[str, threading.Lock] = {}
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            if self._cards is None:
+                cards = self.trello.call_api(RequestType.GET,
+                                             self.trello.list_cards_url.format(self.list_id),
+                                             {**self.trello.query, "fields": INDEX_FIELDS})
+                # the first card with a given key wins, as in the list and label lookups
+                self._cards = {}
+                for card in cards:
+                    self._cards.setdefault(self.key(card), card)
+            return self._cards
+
+    def lock(self, key: str) -> threading.Lock:
+        """
+        :param key: (str) key of a card.
+
+        :return: (threading.Lock) Lock serializing the upserts of the given key.
+        """
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        :param key: (str) key of the card.
+
+        :return: (dict or None) The indexed card with the given key, with its id, url, name, desc and idLabels.
+        """
+        return self._load().get(key)
+
+    def add(self, card: dict[str, Any]) -> None:
+        """
+        Adds or replaces a card created or updated after the list was fetched.
+
+        :param card: (dict) the card, with its id, url, name, desc and idLabels.
+        """
+        cards = self._load()
+        with self._lock:
+            cards[self.key(card)] = card
@@ -0,0 +1,122 @@
+import threading
+import time
+from collections.abc import Mapping
+from typing import Iterable, Optional
+
+from .authentication import TrelloCredentials
+from .rate_limit import RateLimiter, get_rate_limiter, parse_retry_after
+
+# seconds for which a credential rejected with 401 is left out of the pool
+UNAUTHORIZED_COOLDOWN = 300.0
+
+
+class PooledCredential:
+    """
+    A credential of a CredentialPool, with its rate limiter and load.
+    """
+
+    def __init__(self, credentials: TrelloCredentials,
+                 rate_limiter: Optional[RateLimiter]) -> None:
+        self.credentials = credentials
+        self.rate_limiter = rate_limiter
+        # requests being sent with the credential, and sent since the pool was created
+        self.in_flight = 0
+        self.sent = 0
+        # time.monotonic() until which the credential is left out after a 401 or 429
+        self.dropped_until = 0.0
+
+    def apply(self, payload: dict[str, str]) -> dict[str, str]:
+        """
+        :param payload: (dict) request parameters.
+
+        :return: (dict) The parameters authenticated with this credential.
+        """
+        return {**payload, "key": self.credentials.api_key, "token": self.credentials.api_token}
+
+
+class CredentialPool:
+    """
+    Spreads the requests of a TrelloAPI across many Trello API keys and tokens, so that the throughput is not capped
+    by the rate limit of a single token. Every request is sent with the least-loaded credential: the one whose rate
+    limiter lets it go soonest, then the one with fewer requests in flight. Credentials answered with 401 or 429 are
+    left out for a while, as long as another one is available.
+
+    Each credential is paced by the rate limiter shared with every other user of the same key or token. Trello
+    allows 100 requests per 10 seconds per token and 300 per key, so tokens beyond three per key also need more keys.
+    Safe to share between threads.
+    """
+
+    def __init__(self, credentials: Iterable[TrelloCredentials],
+                 rate_limit: bool = True) -> None:
+        self.credentials = [PooledCredential(credential,
+                                             get_rate_limiter(credential.api_key, credential.api_token)
+                                             if rate_limit else None)
+                            for credential in credentials]
+        if not self.credentials:
+            raise ValueError("A credential pool needs at least one credential")
+
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.credentials)
+
+    def acquire(self) -> PooledCredential:
+        """
+        Picks the least-loaded credential that was not dropped, or the one dropped the shortest when all were, and
+        counts a request in flight for it. Must be followed by release().
+
+        :return: (PooledCredential) The credential to send the request with.
+        """
+        now = time.monotonic()
+        with self._lock:
+            available = [credential for credential in self.credentials if credential.dropped_until <= now]
+            if available:
+                credential = min(available, key=lambda candidate: (
+                    candidate.rate_limiter.wait_time() if candidate.rate_limiter is not None else 0.0,
+                    candidate.in_flight, candidate.sent))
+            else:
+                credential = min(self.credentials, key=lambda candidate: candidate.dropped_until)
+            credential.in_flight += 1
+            credential.sent += 1
+            return credential
+
+    def release(self, credential: PooledCredential) -> None:
+        """
+        Counts the request of an acquired credential as done.
+
+        :param credential: (PooledCredential) credential returned by acquire().
+        """
+        with self._lock:
+            credential.in_flight -= 1
+
+    def drop(self, credential: PooledCredential,
+             status_code: int,
+             headers: Mapping[str, str]) -> float:
+        """
+        Leaves a credential out of the pool after Trello rejected it: for the Retry-After time of a 429, pausing its
+        rate limiter too, or for UNAUTHORIZED_COOLDOWN seconds after a 401.
+
+        :param credential: (PooledCredential) the rejected credential.
+        :param status_code: (int) 401 or 429.
+        :param headers: (Mapping) headers of the response.
+
+        :return: (float) Seconds the credential is left out for.
+        """
+        if status_code == 401:
+            seconds = UNAUTHORIZED_COOLDOWN
+        elif credential.rate_limiter is not None:
+            seconds = credential.rate_limiter.backoff(headers)
+        else:
+            seconds = parse_retry_after(headers.get("Retry-After"))
+
+        with self._lock:
+            credential.dropped_until = max(credential.dropped_until, time.monotonic() + seconds)
+        return seconds
+
+    def has_available(self) -> bool:
+        """
+        :return: (bool) Whether any credential is not dropped.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return any(credential.dropped_until <= now for credential in self.credentials)
@@ -0,0 +1,146 @@
+import itertools
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any, Optional, Union
+
+from .bulk import BulkCardCreator, BulkResult, CardSpec
+from .daemon_client import default_socket_path
+from .trello_api import TrelloAPI
+
+# seconds after which the boards resolved by the daemon are fetched again, to pick up renamed lists and labels
+DEFAULT_REFRESH_INTERVAL = 300.0
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answers the jobs sent by DaemonClient: POST /cards with the card spec as JSON, and GET /health.
+    """
+    server: "TrelloDaemon"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        logging.debug("trello_cli daemon: " + format, *args)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return "local"
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        if self.path != "/health":
+            self._reply(404, {"error": f"Unknown path: {self.path}"})
+            return
+        self._reply(200, {"status": "ok", "cards": self.server.cards_created})
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        if self.path != "/cards":
+            self._reply(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            spec = CardSpec.from_dict(json.loads(self.rfile.read(length)))
+        except (KeyError, TypeError, ValueError) as e:
+            self._reply(400, {"error": f"Invalid card spec: {e}"})
+            return
+
+        result = self.server.create(spec)
+        self._reply(200 if result.error is None else 502, json.loads(result.to_json()))
+
+    def _reply(self, status: int, response: dict[str, Any]) -> None:
+        body = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TrelloDaemon(ThreadingMixIn, UnixStreamServer):
+    """
+    Long-running server keeping one warm TrelloAPI, with its pooled connections, and the boards, lists and labels it
+    resolved, so that each card creation job only costs the card and comment POSTs. Jobs are received over a Unix
+    socket only accessible by the current user, and run concurrently.
+
+    Resolved boards are dropped when a job using them fails, and all of them every refresh_interval seconds.
+    """
+    daemon_threads = True
+
+    def __init__(self, trello: TrelloAPI,
+                 socket_path: Optional[Union[str, Path]] = None,
+                 refresh_interval: float = DEFAULT_REFRESH_INTERVAL) -> None:
+        self.trello = trello
+        self.socket_path = Path(socket_path) if socket_path is not None else default_socket_path()
+        self.refresh_interval = refresh_interval
+        self.cards_created = 0
+
+        self._lock = threading.Lock()
+        self._creator = BulkCardCreator(trello)
+        self._jobs = itertools.count(1)
+        self._refreshed = time.monotonic()
+
+        self.socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self._remove_stale_socket()
+        super().__init__(str(self.socket_path), DaemonRequestHandler)
+        os.chmod(self.socket_path, 0o600)
+
+    def _remove_stale_socket(self) -> None:
+        """
+        Removes the socket file left by a daemon that did not exit cleanly.
+
+        :raises OSError: raised when another daemon is still listening on the socket.
+        """
+        if not self.socket_path.exists():
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(self.socket_path))
+            except OSError:
+                self.socket_path.unlink()
+                return
+        raise OSError(f"A trello_cli daemon is already running on {self.socket_path}")
+
+    def _get_creator(self) -> BulkCardCreator:
+        with self._lock:
+            if time.monotonic() - self._refreshed >= self.refresh_interval:
+                self._creator = BulkCardCreator(self.trello)
+                self._refreshed = time.monotonic()
+            return self._creator
+
+    def create(self, spec: CardSpec) -> BulkResult:
+        """
+        Creates the card and comment of one job.
+
+        :param spec: (CardSpec) card to be created.
+
+        :return: (BulkResult) Created card or error.
+        """
+        creator = self._get_creator()
+        result = creator.create(next(self._jobs), spec)
+
+        if result.error is None:
+            with self._lock:
+                self.cards_created += 1
+            return result
+
+        if result.card_id is None:
+            # the resolved IDs may be stale, the next job using this board resolves them again
+            creator.forget(spec.board_url)
+            if self.trello.cache is not None:
+                self.trello.cache.invalidate_board_url(spec.board_url)
+        else:
+            with self._lock:
+                self.cards_created += 1
+        logging.error("trello_cli daemon job failed: {}", result.error)
+        return result
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
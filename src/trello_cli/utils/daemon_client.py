@@ -0,0 +1,85 @@
+import http.client
+import json
+import socket
+from os import environ
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from .exceptions import DaemonUnavailableException
+
+# seconds to wait for the daemon to answer a job
+DEFAULT_TIMEOUT = 60.0
+
+
+def default_socket_path() -> Path:
+    """
+    Returns the default daemon socket location, following the XDG base directory specification.
+
+    :return: (Path) $XDG_RUNTIME_DIR/trello_cli/daemon.sock, or ~/.cache/trello_cli/daemon.sock.
+    """
+    runtime_dir = environ.get("XDG_RUNTIME_DIR") or environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(runtime_dir) / "trello_cli" / "daemon.sock"
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over a Unix socket instead of TCP.
+    """
+
+    def __init__(self, socket_path: Union[str, Path],
+                 timeout: float = DEFAULT_TIMEOUT) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = str(socket_path)
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class DaemonClient:
+    """
+    Sends card creation jobs to a running trello_cli daemon. Only uses the standard library, so that a client process
+    starts without loading requests or the Trello API code.
+    """
+
+    def __init__(self, socket_path: Optional[Union[str, Path]] = None,
+                 timeout: float = DEFAULT_TIMEOUT) -> None:
+        self.socket_path = Path(socket_path) if socket_path is not None else default_socket_path()
+        self.timeout = timeout
+
+    def _request(self, method: str,
+                 path: str,
+                 body: Optional[dict[str, Any]] = None) -> tuple[int, dict[str, Any]]:
+        """
+        :raises DaemonUnavailableException: raised when the daemon could not be reached.
+
+        :return: (tuple[int, dict]) HTTP status and JSON response of the daemon.
+        """
+        connection = UnixHTTPConnection(self.socket_path, self.timeout)
+        try:
+            payload = json.dumps(body).encode() if body is not None else None
+            connection.request(method, path, body=payload, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        except (OSError, http.client.HTTPException) as e:
+            raise DaemonUnavailableException(str(self.socket_path), str(e)) from e
+        finally:
+            connection.close()
+
+    def health(self) -> dict[str, Any]:
+        """
+        :return: (dict) Status of the daemon and number of cards it created.
+        """
+        return self._request("GET", "/health")[1]
+
+    def create_card(self, spec: dict[str, str]) -> dict[str, Any]:
+        """
+        Asks the daemon to create a card and its comment.
+
+        :param spec: (dict) the single card CLI args: board_url, list_name, card_name, card_description, card_comment
+            and label_name.
+
+        :return: (dict) card_id, card_url and retries of the created card, or the error.
+        """
+        return self._request("POST", "/cards", spec)[1]
@@ -31,8 +31,36 @@ class LabelNotFoundException(Exception):
 
 class APIRequestException(Exception):
     """
-    Raised when an API exception occur.
+    Raised when an API exception occur. status_code holds the HTTP status of the response, when one was received.
     """
 
-    def __init__(self, error: str) -> None:
+    def __init__(self, error: str, status_code: int | None = None) -> None:
+        self.status_code = status_code
         super().__init__(f"An error occurred while communicating with Trello's API: {error}.")
+
+
+class DaemonUnavailableException(Exception):
+    """
+    Raised when no trello_cli daemon answers on the given socket.
+    """
+
+    def __init__(self, socket_path: str, error: str) -> None:
+        super().__init__(f"The trello_cli daemon is not running on {socket_path}: {error}.")
+
+
+class DeadlineExceededException(APIRequestException):
+    """
+    Raised when an operation runs out of its deadline before getting a response.
+    """
+
+    def __init__(self, deadline: float) -> None:
+        super().__init__(f"no response within the {deadline:g} seconds deadline of the operation")
+
+
+class RecordingNotFoundException(Exception):
+    """
+    Raised when a ReplayTransport is asked for a request that its recording does not hold.
+    """
+
+    def __init__(self, method: str, route: str) -> None:
+        super().__init__(f"No recording for {method} {route}.")
@@ -0,0 +1,242 @@
+import itertools
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+
+@dataclass
+class FakeBoard:
+    """
+    A board of FakeTrello, with the names of its lists and labels by id.
+    """
+    id: str
+    short_link: str
+    name: str
+    lists: dict[str, str] = field(default_factory=dict)
+    labels: dict[str, str] = field(default_factory=dict)
+
+
+class FakeTrello:
+    """
+    In-memory model of the Trello boards, answering the API routes used by TrelloAPI: boards (by id, shortLink or
+    .json export), lists, labels, cards, comments, attachments, board actions and /1/batch. Attachments only keep
+    the size of their file. Serves the InMemoryTransport and the benchmarks' stand-in server.
+
+    Every change is recorded in the board actions feed, including the ones made with update_card() and add_list(),
+    which stand for the changes made by other Trello users.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self.boards: dict[str, FakeBoard] = {}
+        self.cards: dict[str, dict[str, Any]] = {}
+        self.comments: dict[str, list[dict[str, Any]]] = {}
+        self.attachments: dict[str, list[dict[str, Any]]] = {}
+        self.actions: list[dict[str, Any]] = []
+
+    def new_id(self) -> str:
+        # same layout as Trello ids: creation timestamp followed by a counter
+        return f"{int(time.time()):08x}{next(self._ids):016x}"
+
+    def add_board(self, name: str,
+                  short_link: str,
+                  list_names: tuple[str, ...] = (),
+                  label_names: tuple[str, ...] = ()) -> FakeBoard:
+        board = FakeBoard(id=self.new_id(), short_link=short_link, name=name)
+        board.lists = {self.new_id(): list_name for list_name in list_names}
+        board.labels = {self.new_id(): label_name for label_name in label_names}
+        self.boards[board.id] = board
+        return board
+
+    def find_board(self, board_id: str) -> Optional[FakeBoard]:
+        return self.boards.get(board_id) or next((board for board in self.boards.values()
+                                                  if board.short_link == board_id), None)
+
+    def _board_of_list(self, list_id: Optional[str]) -> Optional[FakeBoard]:
+        return next((board for board in self.boards.values() if list_id in board.lists), None)
+
+    def _record_action(self, board: Optional[FakeBoard],
+                       action_type: str,
+                       data: dict[str, Any]) -> None:
+        if board is not None:
+            self.actions.append({"id": self.new_id(), "idBoard": board.id, "type": action_type,
+                                 "date": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()), "data": data})
+
+    def add_list(self, board: FakeBoard,
+                 name: str) -> str:
+        """
+        Adds a list to the board, as if made by another Trello user.
+
+        :return: (str) ID of the new list.
+        """
+        with self._lock:
+            list_id = self.new_id()
+            board.lists[list_id] = name
+            self._record_action(board, "createList", {"list": {"id": list_id, "name": name}})
+            return list_id
+
+    def update_card(self, card_id: str,
+                    **changes: Any) -> None:
+        """
+        Changes the name, desc, idList, idLabels or closed fields of a card, as if made by another Trello user.
+        """
+        with self._lock:
+            self._update_card(card_id, changes)
+
+    def _update_card(self, card_id: str,
+                     changes: dict[str, Any]) -> None:
+        card = self.cards[card_id]
+        old = {field_name: card[field_name] for field_name in changes}
+        card.update(changes)
+        self._record_action(self._board_of_list(card["idList"]), "updateCard",
+                            {"card": {"id": card_id, **changes}, "old": old})
+
+    def handle(self, method: str,
+               path: str,
+               params: dict[str, str]) -> tuple[int, Any]:
+        """
+        Answers an API request.
+
+        :param method: (str) GET, POST or PUT.
+        :param path: (str) url path, e.g. '/1/boards/<id>/lists'.
+        :param params: (dict) query string and body parameters.
+
+        :return: (tuple[int, Any]) HTTP status and JSON response.
+        """
+        with self._lock:
+            return self._route(method, path, params)
+
+    def _route(self, method: str,  # pylint: disable=too-many-return-statements
+               path: str,
+               params: dict[str, str]) -> tuple[int, Any]:
+        if method == "GET" and path == "/1/batch":
+            responses = []
+            for route in params.get("urls", "").split(","):
+                route_url = urlsplit(unquote(route))
+                status, response = self._route("GET", "/1" + route_url.path, dict(parse_qsl(route_url.query)))
+                responses.append({str(status): response} if status == 200
+                                 else {"statusCode": status, "message": response})
+            return 200, responses
+
+        if match := re.fullmatch(r"/b/(\w+)/[^/]*\.json", path):
+            board = self.find_board(match.group(1))
+            return (200, self._board_json(board, full=True)) if board else (404, "board not found")
+
+        if match := re.fullmatch(r"/1/boards/(\w+)/actions", path):
+            board = self.find_board(match.group(1))
+            if board is None:
+                return 404, "board not found"
+            types = params.get("filter", "all").split(",")
+            actions = [action for action in self.actions
+                       if action["idBoard"] == board.id and action["id"] > params.get("since", "")
+                       and ("all" in types or action["type"] in types)]
+            return 200, actions[::-1][:int(params.get("limit", 50))]
+
+        if match := re.fullmatch(r"/1/boards/(\w+)/cards", path):
+            board = self.find_board(match.group(1))
+            if board is None:
+                return 404, "board not found"
+            card_filter = params.get("filter", "visible")
+            cards = [card for card in self.cards.values()
+                     if card["idList"] in board.lists and params.get("since", "") < card["id"]
+                     and ("before" not in params or card["id"] < params["before"])
+                     and (card_filter == "all" or card["closed"] == (card_filter == "closed"))]
+            cards.sort(key=lambda card: card["id"], reverse=True)
+            return 200, cards[:int(params["limit"])] if "limit" in params else cards
+
+        if match := re.fullmatch(r"/1/boards/(\w+)(/lists|/labels)?", path):
+            board = self.find_board(match.group(1))
+            if board is None:
+                return 404, "board not found"
+            if match.group(2) == "/lists":
+                return 200, self._lists(board)
+            if match.group(2) == "/labels":
+                if method == "POST":
+                    label_id = self.new_id()
+                    board.labels[label_id] = params["name"]
+                    label = {"id": label_id, "name": params["name"], "idBoard": board.id, "color": None}
+                    self._record_action(board, "createLabel", {"label": label})
+                    return 200, label
+                return 200, self._labels(board)
+            return 200, self._board_json(board, lists=params.get("lists") in ("open", "all"),
+                                         labels=params.get("labels") == "all",
+                                         cards=params.get("cards") in ("open", "all"))
+
+        if method == "POST" and path == "/1/cards":
+            card_id = self.new_id()
+            card = {"id": card_id, "url": f"https://trello.com/c/{card_id[-8:]}", "name": params.get("name", ""),
+                    "desc": params.get("desc", ""), "idList": params.get("idList"), "closed": False,
+                    "idLabels": [label_id for label_id in params.get("idLabels", "").split(",") if label_id]}
+            self.cards[card_id] = card
+            board = self._board_of_list(card["idList"])
+            self._record_action(board, "createCard",
+                                {"card": {"id": card_id, "name": card["name"], "shortLink": card_id[-8:]},
+                                 "list": {"id": card["idList"], "name": board.lists[card["idList"]] if board else ""}})
+            return 200, {"id": card["id"], "url": card["url"]}
+
+        if method == "PUT" and (match := re.fullmatch(r"/1/cards/(\w+)", path)):
+            if match.group(1) not in self.cards:
+                return 404, "card not found"
+            changes = {name: params[name] for name in ("name", "desc", "idList") if name in params}
+            if "closed" in params:
+                changes["closed"] = params["closed"] == "true"
+            if "idLabels" in params:
+                changes["idLabels"] = [label_id for label_id in params["idLabels"].split(",") if label_id]
+            self._update_card(match.group(1), changes)
+            return 200, self.cards[match.group(1)]
+
+        if match := re.fullmatch(r"/1/cards/(\w+)/attachments", path):
+            if match.group(1) not in self.cards:
+                return 404, "card not found"
+            attachments = self.attachments.setdefault(match.group(1), [])
+            if method == "POST":
+                attachment_id = self.new_id()
+                attachments.append({"id": attachment_id, "name": params.get("name", ""),
+                                    "bytes": int(params.get("bytes", 0)), "mimeType": params.get("mimeType", ""),
+                                    "url": f"https://trello.com/1/cards/{match.group(1)}/attachments/{attachment_id}"})
+                return 200, attachments[-1]
+            return 200, attachments
+
+        if match := re.fullmatch(r"/1/cards/(\w+)/actions(/comments)?", path):
+            if match.group(1) not in self.cards:
+                return 404, "card not found"
+            comments = self.comments.setdefault(match.group(1), [])
+            if method == "POST":
+                comments.append({"id": self.new_id(), "type": "commentCard", "data": {"text": params["text"]}})
+                return 200, comments[-1]
+            return 200, comments
+
+        if match := re.fullmatch(r"/1/lists/(\w+)/cards", path):
+            return 200, [card for card in self.cards.values() if card["idList"] == match.group(1) and not card["closed"]]
+
+        return 404, "route not found"
+
+    @staticmethod
+    def _lists(board: FakeBoard) -> list[dict[str, Any]]:
+        return [{"id": list_id, "name": name, "closed": False, "idBoard": board.id}
+                for list_id, name in board.lists.items()]
+
+    @staticmethod
+    def _labels(board: FakeBoard) -> list[dict[str, Any]]:
+        return [{"id": label_id, "name": name, "idBoard": board.id, "color": None}
+                for label_id, name in board.labels.items()]
+
+    def _board_json(self, board: FakeBoard,
+                    full: bool = False,
+                    lists: bool = False,
+                    labels: bool = False,
+                    cards: bool = False) -> dict[str, Any]:
+        data: dict[str, Any] = {"id": board.id, "name": board.name}
+        if full:
+            data.update({"desc": "", "url": f"https://trello.com/b/{board.short_link}", "closed": False})
+        if full or cards:
+            data["cards"] = [card for card in self.cards.values() if card["idList"] in board.lists]
+        if full or lists:
+            data["lists"] = self._lists(board)
+        if full or labels:
+            data["labels"] = self._labels(board)
+        return data
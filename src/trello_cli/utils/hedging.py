@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class HedgingPolicy:
+    """
+    When a second, identical GET is sent while the first one is still waiting for its response.
+
+    :param quantile: (float) the second request is sent once the first one is slower than this quantile of the recent
+        GET latencies, e.g. 0.95 hedges the slowest 5%.
+    :param initial_delay: (float) seconds to wait before hedging, until min_samples latencies are observed.
+    :param min_delay: (float) minimum seconds to wait before hedging, so that fast responses are never hedged.
+    :param min_samples: (int) number of latencies needed before following the quantile.
+    :param window: (int) number of recent latencies the quantile is computed from.
+    :param max_workers: (int) maximum number of requests sent at the same time through the hedger.
+    """
+    quantile: float = 0.95
+    initial_delay: float = 1.0
+    min_delay: float = 0.05
+    min_samples: int = 20
+    window: int = 200
+    max_workers: int = 32
+
+
+class LatencyTracker:
+    """
+    Keeps the most recent latencies and answers their quantiles. Safe to share between threads.
+    """
+
+    def __init__(self, window: int) -> None:
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._latencies)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def quantile(self, quantile: float) -> Optional[float]:
+        """
+        :param quantile: (float) quantile between 0 and 1.
+
+        :return: (float or None) The quantile of the recent latencies, None when none was recorded.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(quantile * len(latencies)))]
+
+
+def close_response(future: Future) -> None:
+    """
+    Releases the connection of a response nobody will read.
+    """
+    if not future.cancelled() and future.exception() is None and hasattr(future.result(), "close"):
+        future.result().close()
+
+
+class Hedger:
+    """
+    Sends requests on a thread pool and, when one is slower than the policy threshold, sends it a second time: the
+    first response to arrive wins. The other request is cancelled if it has not started yet, or its response is
+    discarded, and its connection released, when it arrives. A blocking request already on the wire can not be
+    interrupted, so it still uses a worker until it completes or times out.
+
+    Only use it for idempotent requests. Safe to share between threads.
+    """
+
+    def __init__(self, policy: HedgingPolicy) -> None:
+        self.policy = policy
+        self.latencies = LatencyTracker(policy.window)
+        # requests sent a second time, and how many of those second requests won
+        self.hedged = 0
+        self.hedges_won = 0
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=policy.max_workers, thread_name_prefix="trello-hedge")
+
+    def threshold(self) -> float:
+        """
+        :return: (float) Seconds after which a request is sent a second time.
+        """
+        if len(self.latencies) < self.policy.min_samples:
+            return self.policy.initial_delay
+        return max(self.policy.min_delay, self.latencies.quantile(self.policy.quantile))
+
+    def send(self, request: Callable[[], T],
+             can_hedge: Callable[[], bool] = lambda: True) -> T:
+        """
+        Runs the request, running it a second time if it is slower than threshold() and can_hedge() allows it.
+
+        :param request: (Callable) sends the request and returns its response.
+        :param can_hedge: (Callable) called before hedging, returns whether a second request may be sent now.
+
+        :return: The first response received, or the error of the last request to fail.
+        """
+        started = time.monotonic()
+        first = self._executor.submit(request)
+        done, pending = wait({first}, timeout=self.threshold())
+
+        hedge = None
+        if not done and can_hedge():
+            hedge = self._executor.submit(request)
+            pending.add(hedge)
+            with self._lock:
+                self.hedged += 1
+
+        finished: list[Future] = []
+        while True:
+            if not done:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            finished.extend(done)
+            done = set()
+            succeeded = [future for future in finished if future.exception() is None]
+            if succeeded or not pending:
+                break
+
+        # both requests may complete together: a response wins over an error
+        winner = succeeded[0] if succeeded else finished[-1]
+        for loser in succeeded[1:]:
+            close_response(loser)
+        for loser in pending:
+            if not loser.cancel():
+                loser.add_done_callback(close_response)
+
+        if winner.exception() is None:
+            self.latencies.record(time.monotonic() - started)
+            if winner is hedge:
+                with self._lock:
+                    self.hedges_won += 1
+        return winner.result()
+
+    def close(self) -> None:
+        """
+        Stops the thread pool, without waiting for the discarded requests.
+        """
+        self._executor.shutdown(wait=False)
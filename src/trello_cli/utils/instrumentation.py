@@ -0,0 +1,251 @@
+import bisect
+import functools
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TextIO, TypeVar, Union
+
+T = TypeVar("T")
+
+# upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf"))
+
+
+@dataclass
+class OperationEvent:
+    """
+    Timing of one logical TrelloAPI operation (get_board_data, create_card...), which may have made several requests.
+    """
+    operation: str
+    duration: float = 0.0
+    requests: int = 0
+    retries: int = 0
+    bytes_received: int = 0
+    decode_time: float = 0.0
+    status_codes: list[int] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class MetricsSink(ABC):
+    """
+    Receives the event of every finished operation.
+    """
+
+    @abstractmethod
+    def record(self, event: OperationEvent) -> None:
+        """
+        :param event: (OperationEvent) finished operation.
+        """
+
+    def close(self) -> None:
+        """
+        Called once no more events will be recorded.
+        """
+
+
+@dataclass
+class OperationStats:
+    """
+    Aggregated events of one operation.
+    """
+    count: int = 0
+    errors: int = 0
+    retries: int = 0
+    total_duration: float = 0.0
+    bytes_received: int = 0
+    decode_time: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a latency quantile from the histogram, as the upper bound of the bucket holding it.
+
+        :param q: (float) quantile between 0 and 1.
+
+        :return: (float) Estimated latency, in seconds.
+        """
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return LATENCY_BUCKETS[-1]
+
+
+class HistogramSink(MetricsSink):
+    """
+    In-memory aggregation of the events in a latency histogram per operation.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.stats: dict[str, OperationStats] = {}
+
+    def record(self, event: OperationEvent) -> None:
+        with self._lock:
+            stats = self.stats.setdefault(event.operation, OperationStats())
+            stats.count += 1
+            stats.errors += event.error is not None
+            stats.retries += event.retries
+            stats.total_duration += event.duration
+            stats.bytes_received += event.bytes_received
+            stats.decode_time += event.decode_time
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS, event.duration)] += 1
+
+    def report(self) -> str:
+        """
+        :return: (str) Table with the count, errors, retries, mean and estimated p95 latency, bytes received and JSON
+            decode time of each operation.
+        """
+        lines = [f"{'operation':<24}{'calls':>7}{'errors':>8}{'retries':>9}{'mean ms':>10}{'p95 ms':>9}"
+                 f"{'bytes':>11}{'decode ms':>11}"]
+        with self._lock:
+            for operation, stats in sorted(self.stats.items()):
+                lines.append(f"{operation:<24}{stats.count:>7}{stats.errors:>8}{stats.retries:>9}"
+                             f"{stats.total_duration / stats.count * 1000:>10.1f}{stats.quantile(0.95) * 1000:>9.0f}"
+                             f"{stats.bytes_received:>11}{stats.decode_time * 1000:>11.2f}")
+        return "\n".join(lines)
+
+
+class PrometheusTextfileSink(HistogramSink):
+    """
+    Aggregates the events like HistogramSink and writes them, on close, to a file in Prometheus' text exposition
+    format, e.g. for node_exporter's textfile collector.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        super().__init__()
+        self.path = Path(path)
+
+    def render(self) -> str:
+        """
+        :return: (str) Metrics in Prometheus' text exposition format.
+        """
+        lines = ["# HELP trello_cli_operation_seconds Latency of the TrelloAPI operations.",
+                 "# TYPE trello_cli_operation_seconds histogram"]
+        with self._lock:
+            for operation, stats in sorted(self.stats.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(LATENCY_BUCKETS, stats.buckets):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'trello_cli_operation_seconds_bucket{{operation="{operation}",le="{le}"}} '
+                                 f'{cumulative}')
+                lines.append(f'trello_cli_operation_seconds_sum{{operation="{operation}"}} {stats.total_duration}')
+                lines.append(f'trello_cli_operation_seconds_count{{operation="{operation}"}} {stats.count}')
+            for metric, attribute in (("errors_total", "errors"),
+                                      ("retries_total", "retries"),
+                                      ("received_bytes_total", "bytes_received"),
+                                      ("decode_seconds_total", "decode_time")):
+                lines.append(f"# TYPE trello_cli_operation_{metric} counter")
+                for operation, stats in sorted(self.stats.items()):
+                    lines.append(f'trello_cli_operation_{metric}{{operation="{operation}"}} '
+                                 f'{getattr(stats, attribute)}')
+        return "\n".join(lines) + "\n"
+
+    def close(self) -> None:
+        # written to a temporary file first, so the collector never reads a partial file
+        temporary_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        temporary_path.write_text(self.render(), encoding="utf-8")
+        temporary_path.replace(self.path)
+
+
+class JsonLogSink(MetricsSink):
+    """
+    Writes every event as a JSON line.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def record(self, event: OperationEvent) -> None:
+        line = json.dumps(asdict(event))
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+class Instrumentation:
+    """
+    Collects the timing of each TrelloAPI operation made by every thread and sends it to the sinks once it finishes.
+    Operations started while another one is running in the same thread are accounted to the outer one.
+    """
+
+    def __init__(self, sinks: list[MetricsSink]) -> None:
+        self.sinks = sinks
+        self._local = threading.local()
+
+    @property
+    def current(self) -> Optional[OperationEvent]:
+        """
+        :return: (OperationEvent or None) Operation running in the current thread.
+        """
+        return getattr(self._local, "event", None)
+
+    @contextmanager
+    def operation(self, name: str) -> Iterator[Optional[OperationEvent]]:
+        """
+        Times the operation running inside the block and records it on the sinks.
+
+        :param name: (str) operation name.
+        """
+        if self.current is not None:
+            yield self.current
+            return
+
+        event = self._local.event = OperationEvent(operation=name)
+        started = time.perf_counter()
+        try:
+            yield event
+        except Exception as e:
+            event.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            event.duration = time.perf_counter() - started
+            self._local.event = None
+            for sink in self.sinks:
+                sink.record(event)
+
+    def record_response(self, status_code: int,
+                        bytes_received: int) -> None:
+        event = self.current
+        if event is not None:
+            event.requests += 1
+            event.status_codes.append(status_code)
+            event.bytes_received += bytes_received
+
+    def record_decode(self, seconds: float) -> None:
+        event = self.current
+        if event is not None:
+            event.decode_time += seconds
+
+    def record_retries(self, retries: int) -> None:
+        event = self.current
+        if event is not None:
+            event.retries += retries
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+
+def instrumented(method: Callable[..., T]) -> Callable[..., T]:
+    """
+    Decorator recording a TrelloAPI method as an operation, named after the method, when the instance has an
+    Instrumentation. Without one, the method is called directly.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs) -> T:
+        if self.instrumentation is None:
+            return method(self, *args, **kwargs)
+        with self.instrumentation.operation(method.__name__):
+            return method(self, *args, **kwargs)
+
+    return wrapper
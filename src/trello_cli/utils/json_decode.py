@@ -0,0 +1,23 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+# name of the JSON parser in use: orjson when installed (pip install trello_cli[fast]), else the standard library
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(content: Union[bytes, str]) -> Any:
+    """
+    Parses a JSON document with the fastest backend installed.
+
+    :param content: (bytes or str) JSON document, e.g. the body of a response.
+
+    :return: (Any) The parsed document.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
@@ -0,0 +1,198 @@
+import json
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from .exceptions import LabelNotFoundException, ListNotFoundException
+
+# the models below are slotted, and frozen unless updated in place, so that large numbers of them stay compact. Their
+# from_dict only reads the fields they need, so that they can be built straight from the parsed responses
+
+
+@dataclass(slots=True)
+class CardInfo:
+    id: str
+    url: str
+    # number of retries needed to create the card
+    retries: int = field(default=0, compare=False)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str]) -> "CardInfo":
+        return cls(id=data["id"],
+                   url=data["url"])
+
+
+@dataclass(frozen=True, slots=True)
+class BoardInfo:
+    id: str
+    name: str
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str]) -> "BoardInfo":
+        return cls(id=data["id"],
+                   name=data["name"])
+
+
+@dataclass(frozen=True, slots=True)
+class ListInfo:
+    id: str
+    name: str
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str]) -> "ListInfo":
+        return cls(id=data["id"],
+                   name=data["name"])
+
+
+@dataclass(frozen=True, slots=True)
+class LabelInfo:
+    id: str
+    name: str
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str]) -> "LabelInfo":
+        return cls(id=data["id"],
+                   name=data["name"])
+
+
+@dataclass(frozen=True, slots=True)
+class AttachmentInfo:
+    id: str
+    name: str
+    bytes: int
+    url: str
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AttachmentInfo":
+        return cls(id=data["id"],
+                   name=data["name"],
+                   bytes=data["bytes"],
+                   url=data["url"])
+
+
+@dataclass(frozen=True, slots=True)
+class CardRecord:
+    """
+    A card read back from a board, with the fields needed for reporting. The list and label ids, shared by many cards,
+    are interned so that each is only stored once.
+    """
+    id: str
+    name: str
+    desc: str
+    list_id: str
+    label_ids: tuple[str, ...]
+    url: str
+    closed: bool
+    last_activity: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CardRecord":
+        return cls(id=data["id"],
+                   name=data["name"],
+                   desc=data.get("desc", ""),
+                   list_id=sys.intern(data["idList"]),
+                   label_ids=tuple(sys.intern(label_id) for label_id in data.get("idLabels", ())),
+                   url=data["url"],
+                   closed=data.get("closed", False),
+                   last_activity=data.get("dateLastActivity"))
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+
+@dataclass
+class BoardSnapshot:
+    """
+    Lists and labels of a board fetched at once, indexed by name to answer any number of lookups without new requests.
+
+    When normalize is True, names are matched ignoring case and surrounding or repeated whitespace.
+    """
+    board: BoardInfo
+    list_ids: dict[str, str]
+    labels: dict[str, LabelInfo]
+    normalize: bool = False
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        return " ".join(name.split()).casefold()
+
+    def _key(self, name: str) -> str:
+        return self.normalize_name(name) if self.normalize else name
+
+    @classmethod
+    def from_dict(cls, data: dict, normalize: bool = False) -> "BoardSnapshot":
+        snapshot = cls(board=BoardInfo.from_dict(data), list_ids={}, labels={}, normalize=normalize)
+        # the first list or label with a given name wins, as in the linear lookups
+        for board_list in data.get("lists", []):
+            snapshot.list_ids.setdefault(snapshot._key(board_list["name"]), board_list["id"])
+        for board_label in data.get("labels", []):
+            snapshot.labels.setdefault(snapshot._key(board_label["name"]), LabelInfo.from_dict(board_label))
+        return snapshot
+
+    def get_list_id(self, list_name: str) -> str:
+        """
+        :raises ListNotFoundException: raised when the requested list is not in the board.
+
+        :param list_name: (str) desired list's name
+
+        :return: (str) ID of the found list.
+        """
+        try:
+            return self.list_ids[self._key(list_name)]
+        except KeyError as e:
+            raise ListNotFoundException(list_name) from e
+
+    def get_label(self, label_name: str) -> LabelInfo:
+        """
+        :raises LabelNotFoundException: raised when the requested label is not in the board.
+
+        :param label_name: (str) name of the label to be searched for.
+
+        :return: (LabelInfo) Dataclass of the found label
+        """
+        try:
+            return self.labels[self._key(label_name)]
+        except KeyError as e:
+            raise LabelNotFoundException(label_name) from e
+
+    def add_label(self, label: LabelInfo) -> None:
+        """
+        Adds a label created after the snapshot was fetched.
+
+        :param label: (LabelInfo) the new label.
+        """
+        self.labels.setdefault(self._key(label.name), label)
+
+
+def find_list_id(board_lists: list[ListInfo],
+                 list_name: str) -> str:
+    """
+    :raises ListNotFoundException: raised when the requested list is not in board_lists.
+
+    :param board_lists: (list[ListInfo]) lists of a board.
+    :param list_name: (str) desired list's name
+
+    :return: (str) ID of the first list with the given name.
+    """
+    for current_list in board_lists:
+        if current_list.name == list_name:
+            return current_list.id
+
+    raise ListNotFoundException(list_name)
+
+
+def find_label(labels: list[LabelInfo],
+               label_name: str) -> LabelInfo:
+    """
+    :raises LabelNotFoundException: raised when the requested label is not in labels.
+
+    :param labels: (list[LabelInfo]) labels of a board.
+    :param label_name: (str) name of the label to be searched for.
+
+    :return: (LabelInfo) Dataclass of the first label with the given name.
+    """
+    for board_label in labels:
+        if board_label.name == label_name:
+            return board_label
+
+    raise LabelNotFoundException(label_name)
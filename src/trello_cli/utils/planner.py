@@ -0,0 +1,222 @@
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, Optional, TextIO
+
+from .bulk import BulkCardCreator, CardSpec
+from .exceptions import APIRequestException, LabelNotFoundException, ListNotFoundException
+from .rate_limit import DEFAULT_BURST_RATIO, KEY_LIMIT, LIMIT_INTERVAL, TOKEN_LIMIT
+from .trello_api import BoardSnapshot, TrelloAPI, parse_board_short_link
+
+
+@dataclass
+class PlannedCall:
+    """
+    One request of a CallPlan. row is the input row of card and comment creations.
+    """
+    method: str
+    route: str
+    description: str
+    row: Optional[int] = None
+
+    def to_json(self) -> str:
+        return json.dumps({key: value for key, value in asdict(self).items() if value is not None})
+
+
+@dataclass
+class CallPlan:
+    """
+    Requests needed to create the cards of a batch of specs, once their boards are resolved: the missing labels are
+    created first, each once, then every card and its comment. Rows that can not succeed (unreadable, unknown board or
+    list) are listed with their error and make no request.
+
+    boards holds one snapshot, or the error raised resolving it, per board, by shortLink, or by id for urls without
+    one. board_keys gives the key of each board url of the specs, so that several urls of a board share its snapshot.
+    """
+    specs: list[CardSpec | Exception]
+    boards: dict[str, BoardSnapshot | Exception]
+    resolve_requests: int
+    board_keys: dict[str, str] = field(default_factory=dict)
+    calls: list[PlannedCall] = field(default_factory=list)
+    errors: dict[int, str] = field(default_factory=dict)
+
+    @property
+    def request_count(self) -> int:
+        """
+        :return: (int) Number of requests made by BatchPlanner.execute().
+        """
+        return len(self.calls)
+
+    def estimated_seconds(self, tokens: int = 1,
+                          keys: int = 1) -> float:
+        """
+        :param tokens: (int) number of Trello tokens the requests are spread across.
+        :param keys: (int) number of distinct Trello API keys of those tokens.
+
+        :return: (float) Least time needed to send the planned requests without exceeding Trello's rate limits.
+        """
+        return rate_limited_seconds(self.request_count, tokens, keys)
+
+    def summary(self, tokens: int = 1,
+                keys: int = 1) -> str:
+        """
+        :return: (str) Human readable description of the plan.
+        """
+        labels = [call for call in self.calls if call.row is None]
+        cards = sum(1 for call in self.calls if call.route == "/cards")
+        lines = [f"Plan for {len(self.specs)} rows:",
+                 f"  {len(self.boards)} board(s) resolved with {self.resolve_requests} request(s)",
+                 f"  {len(labels)} label(s) to create" + "".join(f"\n    {call.description}" for call in labels),
+                 f"  {cards} card(s) to create, each with its comment",
+                 f"  {len(self.errors)} row(s) that will fail"
+                 + "".join(f"\n    row {row}: {error}" for row, error in sorted(self.errors.items())),
+                 f"  {self.request_count} request(s) to run, at least {self.estimated_seconds(tokens, keys):.1f} seconds "
+                 f"under the rate limits of {tokens} token(s)"]
+        return "\n".join(lines)
+
+    def write_calls(self, output: TextIO) -> None:
+        """
+        Writes every planned request as a NDJSON line.
+
+        :param output: (TextIO) stream to write the calls to.
+        """
+        for call in self.calls:
+            output.write(call.to_json() + "\n")
+
+
+def rate_limited_seconds(requests: int,
+                         tokens: int = 1,
+                         keys: int = 1) -> float:
+    """
+    Least time needed to send the given number of requests, starting with full rate limit buckets, following the
+    pacing of the RateLimiter.
+
+    :param requests: (int) number of requests.
+    :param tokens: (int) number of Trello tokens the requests are spread across.
+    :param keys: (int) number of distinct Trello API keys of those tokens.
+
+    :return: (float) Seconds.
+    """
+    limit = min(TOKEN_LIMIT * tokens, KEY_LIMIT * keys)
+    burst = limit * DEFAULT_BURST_RATIO
+    return max(0.0, requests - burst) * LIMIT_INTERVAL / (limit - burst)
+
+
+class BatchPlanner:
+    """
+    Plans the creation of a batch of cards with the least requests: every distinct board is read once, with its lists
+    and labels, every list and label name is resolved against it, and each missing label is only created once, before
+    the cards needing it. Planning only reads from Trello.
+
+    Unlike BulkCardCreator.run(), which streams its input, the whole batch is held in memory.
+    """
+
+    def __init__(self, trello: TrelloAPI) -> None:
+        self.trello = trello
+
+    def _resolve_board(self, plan: CallPlan, board_url: str) -> BoardSnapshot | Exception:
+        """
+        Resolves the board of a url, reading its snapshot only if no other url of the plan already did.
+
+        :return: (BoardSnapshot or Exception) Snapshot of the board, or the error raised resolving it.
+        """
+        if board_url in plan.board_keys:
+            return plan.boards[plan.board_keys[board_url]]
+
+        key = parse_board_short_link(board_url)
+        try:
+            if key is None:
+                plan.resolve_requests += 1
+                key = self.trello.get_board_data(board_url).id
+            if key not in plan.boards:
+                plan.resolve_requests += 1
+                plan.boards[key] = self.trello.get_board_snapshot(key)
+        except APIRequestException as e:
+            key = key or board_url
+            plan.boards[key] = e
+
+        plan.board_keys[board_url] = key
+        return plan.boards[key]
+
+    def plan(self, specs: Iterable[CardSpec | Exception]) -> CallPlan:
+        """
+        Resolves the boards of the specs and lists the requests needed to create their cards.
+
+        :param specs: (Iterable) card specs, or exceptions for rows that could not be parsed.
+
+        :return: (CallPlan) The plan.
+        """
+        plan = CallPlan(specs=list(specs), boards={}, resolve_requests=0)
+        label_calls: dict[tuple[str, str], PlannedCall] = {}
+        card_calls = []
+
+        for row, spec in enumerate(plan.specs, start=1):
+            if isinstance(spec, Exception):
+                plan.errors[row] = str(spec)
+                continue
+
+            snapshot = self._resolve_board(plan, spec.board_url)
+            if isinstance(snapshot, Exception):
+                plan.errors[row] = str(snapshot)
+                continue
+
+            try:
+                snapshot.get_list_id(spec.list_name)
+            except ListNotFoundException as e:
+                plan.errors[row] = str(e)
+                continue
+
+            try:
+                snapshot.get_label(spec.label_name)
+            except LabelNotFoundException:
+                if (snapshot.board.id, spec.label_name) not in label_calls:
+                    label_calls[(snapshot.board.id, spec.label_name)] = PlannedCall(
+                        "POST", f"/boards/{snapshot.board.id}/labels",
+                        f"Create label {spec.label_name} on board {snapshot.board.name}")
+
+            card_calls += [PlannedCall("POST", "/cards", f"Create card {spec.card_name}", row),
+                           PlannedCall("POST", "/cards/{id}/actions/comments", f"Comment card {spec.card_name}", row)]
+
+        # labels first, so that no card waits for one
+        plan.calls = [*label_calls.values(), *card_calls]
+        return plan
+
+    def execute(self, plan: CallPlan,
+                output: Optional[TextIO] = None,
+                concurrency: int = 8) -> tuple[int, int]:
+        """
+        Runs a plan: creates its labels, each once per board, then its cards and comments through a BulkCardCreator
+        seeded with the resolved boards, so that no lookup is made again. Results are written as NDJSON lines to output,
+        as in bulk mode.
+
+        :param plan: (CallPlan) plan returned by plan().
+        :param output: (TextIO) stream to write the results to.
+        :param concurrency: (int) number of cards created at the same time.
+
+        :return: (tuple[int, int]) Number of created cards and number of failed rows.
+        """
+        creator = BulkCardCreator(self.trello, concurrency=concurrency)
+        for board_url, key in plan.board_keys.items():
+            creator.seed(board_url, plan.boards[key])
+
+        created_labels: set[tuple[str, str]] = set()
+        for row, spec in enumerate(plan.specs, start=1):
+            if row in plan.errors:
+                continue
+            snapshot = plan.boards[plan.board_keys[spec.board_url]]
+            if (snapshot.board.id, spec.label_name) in created_labels:
+                continue
+            try:
+                snapshot.get_label(spec.label_name)
+            except LabelNotFoundException:
+                created_labels.add((snapshot.board.id, spec.label_name))
+                try:
+                    label, _ = self.trello.get_or_create_label(snapshot.board.id, spec.label_name, missing=True)
+                except APIRequestException:
+                    # the rows needing the label fail when trying to create it again
+                    continue
+                # a board read under both its shortLink and its id has two snapshots
+                for board in plan.boards.values():
+                    if isinstance(board, BoardSnapshot) and board.board.id == snapshot.board.id:
+                        board.add_label(label)
+
+        return creator.run(plan.specs, output)
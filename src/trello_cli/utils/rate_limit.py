@@ -0,0 +1,172 @@
+import threading
+import time
+from collections.abc import Mapping
+from typing import Optional
+
+# Trello's documented limits: 300 requests per 10 seconds per API key and 100 per 10 seconds per token.
+# See: https://developer.atlassian.com/cloud/trello/guides/rest-api/rate-limits/
+KEY_LIMIT = 300
+TOKEN_LIMIT = 100
+LIMIT_INTERVAL = 10.0
+
+# fraction of each limit that can be spent as an instant burst, the rest is refilled evenly over the interval
+DEFAULT_BURST_RATIO = 0.1
+
+# seconds to wait after a 429 response that has no Retry-After header
+DEFAULT_RETRY_AFTER = 1.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket sized to never exceed limit requests in any window of interval seconds.
+
+    The bucket holds at most burst tokens and refills at (limit - burst) / interval tokens per second, so the worst case
+    in a window is the full burst plus the refill of that window, which is exactly the limit.
+    """
+
+    def __init__(self, limit: int,
+                 interval: float,
+                 burst_ratio: float = DEFAULT_BURST_RATIO) -> None:
+        self.limit = limit
+        self.interval = interval
+        self.burst = max(1.0, limit * burst_ratio)
+        self.rate = (limit - self.burst) / interval
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Takes one token, going into debt if none is available.
+
+        :return: (float) Seconds the caller must wait before sending its request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def wait_time(self) -> float:
+        """
+        :return: (float) Seconds a request reserved now would wait, without taking a token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def limit_remaining(self, remaining: int) -> None:
+        """
+        Lowers the available tokens to the remaining requests reported by Trello, when it has seen requests that this
+        bucket did not account for, e.g. from other processes using the same credentials.
+
+        :param remaining: (int) requests left in Trello's current window.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, remaining)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stops handing out tokens for the given time and drops the saved burst.
+
+        :param seconds: (float) seconds to pause for.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._paused_until = max(self._paused_until, now + seconds)
+
+
+class RateLimiter:
+    """
+    Paces the requests made with one API key and token to stay under both of Trello's limits.
+    """
+
+    def __init__(self, key_bucket: TokenBucket,
+                 token_bucket: TokenBucket) -> None:
+        self.key_bucket = key_bucket
+        self.token_bucket = token_bucket
+
+    def acquire(self) -> None:
+        """
+        Blocks until a request can be sent without exceeding the key or token limits.
+        """
+        wait = max(self.key_bucket.reserve(), self.token_bucket.reserve())
+        if wait > 0:
+            time.sleep(wait)
+
+    def wait_time(self) -> float:
+        """
+        :return: (float) Seconds a request sent now would wait for the key or token limits.
+        """
+        return max(self.key_bucket.wait_time(), self.token_bucket.wait_time())
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Adjusts the pace to the x-rate-limit-*-remaining headers of a Trello response.
+
+        :param headers: (Mapping) response headers.
+        """
+        for header, bucket in (("x-rate-limit-api-key-remaining", self.key_bucket),
+                               ("x-rate-limit-api-token-remaining", self.token_bucket)):
+            remaining = headers.get(header)
+            if remaining is not None and str(remaining).isdigit():
+                bucket.limit_remaining(int(remaining))
+
+    def backoff(self, headers: Mapping[str, str]) -> float:
+        """
+        Pauses every request using these credentials after a 429 response, for the time asked in its Retry-After
+        header.
+
+        :param headers: (Mapping) headers of the 429 response.
+
+        :return: (float) Seconds paused for.
+        """
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        self.key_bucket.pause(retry_after)
+        self.token_bucket.pause(retry_after)
+        return retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> float:
+    """
+    :param value: (str) Retry-After header value, in seconds.
+
+    :return: (float) Seconds to wait, or DEFAULT_RETRY_AFTER if the value is missing or not a number.
+    """
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+_registry_lock = threading.Lock()
+_key_buckets: dict[str, TokenBucket] = {}
+_token_buckets: dict[str, TokenBucket] = {}
+
+
+def get_rate_limiter(api_key: str, api_token: str) -> RateLimiter:
+    """
+    Returns a RateLimiter sharing its buckets with every other one created for the same key or token in this process,
+    so that all threads and TrelloAPI instances using the same credentials share the same budget.
+
+    :param api_key: (str) Trello API key.
+    :param api_token: (str) Trello API token.
+
+    :return: (RateLimiter) Rate limiter for the credentials.
+    """
+    with _registry_lock:
+        key_bucket = _key_buckets.setdefault(api_key, TokenBucket(KEY_LIMIT, LIMIT_INTERVAL))
+        token_bucket = _token_buckets.setdefault(api_token, TokenBucket(TOKEN_LIMIT, LIMIT_INTERVAL))
+    return RateLimiter(key_bucket, token_bucket)
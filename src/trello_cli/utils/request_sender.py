@@ -0,0 +1,161 @@
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from .attachments import MultipartUpload
+from .credential_pool import CredentialPool
+from .exceptions import DeadlineExceededException
+from .hedging import Hedger
+from .instrumentation import Instrumentation
+from .json_decode import loads
+from .retry import DeadlineScope
+from .transport import Transport, TransportResponse
+
+if TYPE_CHECKING:
+    import requests
+
+    from .rate_limit import RateLimiter
+    from .trello_api import RequestType
+
+
+class RequestSender:
+    """
+    Sends single requests of a TrelloAPI through its transport, each with the least-loaded credential of the pool.
+    Requests are paced by the rate limiter shared by every caller using the same credentials, and 429 responses are
+    retried after their Retry-After time. When the pool has other credentials, requests rejected with 401 or 429 are
+    sent again with another one. With a hedger, slow GETs are sent a second time.
+
+    Inside a deadline of the DeadlineScope, waiting for the rate limiter or for a Retry-After time that would end after
+    it raises a DeadlineExceededException right away, and each request only waits for the time left. Safe to share
+    between threads.
+    """
+
+    def __init__(self, transport: Transport,
+                 credential_pool: CredentialPool,
+                 deadlines: DeadlineScope,
+                 *,
+                 max_rate_limit_retries: int = 3,
+                 hedger: Optional[Hedger] = None,
+                 instrumentation: Optional[Instrumentation] = None) -> None:
+        self.transport = transport
+        self.credential_pool = credential_pool
+        self.deadlines = deadlines
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.hedger = hedger
+        self.instrumentation = instrumentation
+
+    def send(self, request_type: "RequestType",
+             endpoint: str,
+             payload: Optional[Union[dict[str, str], str, MultipartUpload]],
+             timeout: Optional[float] = None) -> dict[str, str] | list[dict[str, str]] | None:
+        """
+        Makes a single call to the Trello API.
+
+        :raises APIRequestException: raised when no response could be received, or the response is an error.
+        :raises DeadlineExceededException: raised when the running deadline expires before the response.
+
+        :param request_type: (RequestType) Type of Request. Supported Values - GET, POST, PUT
+        :param endpoint: (str) API Endpoint.
+        :param payload: (dict, str or MultipartUpload) API Request Parameters, Query String or multipart form.
+        :param timeout: (float or None) maximum seconds to wait for the response.
+
+        :return: (dict, list[dict] or None) Response.
+        """
+        deadline = self.deadlines.current()
+        rate_limit_retries = 0
+        credential_switches = 0
+        while True:
+            credential = self.credential_pool.acquire()
+            rate_limiter = credential.rate_limiter
+            request_payload = payload
+            if isinstance(payload, dict):
+                request_payload = credential.apply(payload)
+            elif isinstance(payload, MultipartUpload):
+                request_payload = payload.with_fields(credential.apply(payload.fields))
+
+            if deadline is not None:
+                timeout = deadline.remaining()
+                waiting = rate_limiter.wait_time() if rate_limiter is not None else 0.0
+                if timeout <= 0 or waiting >= timeout:
+                    self.credential_pool.release(credential)
+                    raise DeadlineExceededException(deadline.seconds)
+
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+
+            try:
+                response = self._send(request_type, endpoint, request_payload, timeout, rate_limiter)
+            finally:
+                self.credential_pool.release(credential)
+            if self.instrumentation is not None:
+                self.instrumentation.record_response(response.status_code, len(response.content))
+
+            # credential rejected: leave it out of the pool for a while and try again with another one
+            if response.status_code in (401, 429) and len(self.credential_pool) > 1 \
+                    and credential_switches < len(self.credential_pool):
+                credential_switches += 1
+                dropped_for = self.credential_pool.drop(credential, response.status_code, response.headers)
+                if self.credential_pool.has_available():
+                    logging.warning("Trello answered {}. Leaving the credential out for {:.1f} seconds.",
+                                    response.status_code, dropped_for)
+                    continue
+
+            if rate_limiter is None:
+                break
+
+            # rate limited: pause every caller sharing these credentials for the asked time and try again
+            if response.status_code == 429 and rate_limit_retries < self.max_rate_limit_retries:
+                rate_limit_retries += 1
+                retry_after = rate_limiter.backoff(response.headers)
+                if deadline is not None and retry_after >= deadline.remaining():
+                    raise DeadlineExceededException(deadline.seconds)
+                logging.warning("Trello rate limit reached. Retrying in {:.1f} seconds.", retry_after)
+                continue
+
+            rate_limiter.update_from_headers(response.headers)
+            break
+
+        if response.status_code in (200, 201):
+            if self.instrumentation is None:
+                return self._decode(response)
+
+            decode_started = time.perf_counter()
+            data = self._decode(response)
+            self.instrumentation.record_decode(time.perf_counter() - decode_started)
+            return data
+
+        self.transport.raise_for_status(response)
+
+        return None
+
+    @staticmethod
+    def _decode(response: Union["requests.Response", TransportResponse]) -> Any:
+        """
+        Parses the body of a response with the fastest JSON backend installed. Responses without their raw body, such as
+        test doubles, are parsed by their own json().
+        """
+        if isinstance(response.content, (bytes, bytearray, str)):
+            return loads(response.content)
+        return response.json()
+
+    def _send(self, request_type: "RequestType",
+              endpoint: str,
+              payload: Optional[Union[dict[str, str], str, MultipartUpload]],
+              timeout: Optional[float],
+              rate_limiter: Optional["RateLimiter"]) -> Union["requests.Response", TransportResponse]:
+        """
+        Sends a request through the transport. With a hedger, GETs are sent through it, and a second request is only
+        sent when the rate limiter has room for it right away. POSTs and PUTs are never sent twice.
+        """
+        if self.hedger is None or request_type.value != "GET":
+            return self.transport.send(request_type, endpoint, payload, timeout)
+
+        def can_hedge() -> bool:
+            if rate_limiter is None:
+                return True
+            if rate_limiter.wait_time() > 0:
+                return False
+            rate_limiter.acquire()
+            return True
+
+        return self.hedger.send(lambda: self.transport.send(request_type, endpoint, payload, timeout), can_hedge)
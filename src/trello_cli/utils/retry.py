@@ -0,0 +1,215 @@
+import contextlib
+import functools
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, TypeVar
+
+from .exceptions import APIRequestException, DeadlineExceededException
+
+if TYPE_CHECKING:
+    from .instrumentation import Instrumentation
+
+T = TypeVar("T")
+
+# statuses worth retrying: Trello's transient server errors
+RETRYABLE_STATUSES = (500, 502, 503, 504)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How a failed call is retried: exponential backoff with optional full jitter, bounded by a number of attempts and
+    a total deadline.
+
+    :param max_attempts: (int) total attempts, including the first one. 1 disables retries.
+    :param backoff_base: (float) seconds to wait before the first retry, doubled on every following one.
+    :param backoff_max: (float) maximum seconds to wait between two attempts.
+    :param jitter: (bool) wait a random time between 0 and the backoff, to spread retries from many callers.
+    :param deadline: (float or None) maximum seconds since the first attempt for starting a new one.
+    """
+    max_attempts: int = 4
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    jitter: bool = True
+    deadline: Optional[float] = 30.0
+
+    @staticmethod
+    def is_retryable(error: APIRequestException) -> bool:
+        """
+        :param error: (APIRequestException) error raised by the failed attempt.
+
+        :return: (bool) True for connection errors, timeouts and transient server errors.
+        """
+        return error.status_code is None or error.status_code in RETRYABLE_STATUSES
+
+    def next_delay(self, attempt: int,
+                   elapsed: float,
+                   error: APIRequestException) -> Optional[float]:
+        """
+        :param attempt: (int) number of the attempt that just failed, starting at 1.
+        :param elapsed: (float) seconds since the first attempt started.
+        :param error: (APIRequestException) error raised by the failed attempt.
+
+        :return: (float or None) Seconds to wait before the next attempt, or None if it should not be retried.
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+
+        return delay
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """
+    Instant, on the time.monotonic() clock, by which an operation must be done.
+
+    :param seconds: (float) length of the deadline, from its start.
+    :param expires_at: (float) time.monotonic() value at which it expires.
+    """
+    seconds: float
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(seconds, time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """
+        :return: (float) Seconds left before the deadline, 0 once expired.
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+
+class DeadlineScope:
+    """
+    Deadline running in each thread, set with bound(). Safe to share between threads.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def current(self) -> Optional[Deadline]:
+        """
+        :return: (Deadline or None) Deadline running in the current thread, if any.
+        """
+        return getattr(self._local, "deadline", None)
+
+    @contextlib.contextmanager
+    def bound(self, seconds: float) -> Iterator[Deadline]:
+        """
+        Context manager running a deadline in the current thread. A deadline set inside another one can only shorten
+        it.
+
+        :param seconds: (float) seconds from now.
+        """
+        outer = self.current()
+        deadline = Deadline.after(seconds)
+        if outer is not None and outer.expires_at < deadline.expires_at:
+            deadline = outer
+        self._local.deadline = deadline
+        try:
+            yield deadline
+        finally:
+            self._local.deadline = outer
+
+
+class Retrier:
+    """
+    Runs calls again after their transient failures, following a RetryPolicy and bounded by the deadline running in
+    the DeadlineScope, if any. The number of retries of the last call made by each thread is in last_retries. Safe to
+    share between threads.
+    """
+
+    def __init__(self, deadlines: DeadlineScope,
+                 instrumentation: Optional["Instrumentation"] = None) -> None:
+        self.deadlines = deadlines
+        self.instrumentation = instrumentation
+        self._local = threading.local()
+
+    @property
+    def last_retries(self) -> int:
+        """
+        :return: (int) Number of retries made by the last call of the current thread.
+        """
+        return getattr(self._local, "retries", 0)
+
+    def call(self, policy: RetryPolicy,
+             attempt: Callable[[Optional[float]], T],
+             find_existing: Optional[Callable[[], Optional[T]]] = None) -> T:
+        """
+        Calls attempt until it succeeds or the policy gives up. Inside a deadline, each attempt is given the seconds
+        left as its timeout, and no attempt is started once it has expired.
+
+        :raises APIRequestException: raised with the error of the last attempt when it is not retried.
+        :raises DeadlineExceededException: raised when the deadline expires before an attempt succeeds.
+
+        :param policy: (RetryPolicy) how the failed attempts are retried.
+        :param attempt: (Callable) makes one attempt, given its timeout in seconds, or None without deadline.
+        :param find_existing: (Callable) called before every new attempt, returns the result of a failed attempt that
+            took effect anyway, or None.
+
+        :return: The result of the successful attempt, or the one found by find_existing.
+        """
+        deadline = self.deadlines.current()
+        started = time.monotonic()
+        attempts = 1
+        self._local.retries = 0
+        while True:
+            timeout = None
+            if deadline is not None:
+                timeout = deadline.remaining()
+                if timeout <= 0:
+                    raise DeadlineExceededException(deadline.seconds)
+
+            try:
+                return attempt(timeout)
+            except DeadlineExceededException:
+                raise
+            except APIRequestException as e:
+                delay = policy.next_delay(attempts, time.monotonic() - started, e)
+                if delay is None:
+                    raise
+                if deadline is not None and delay >= deadline.remaining():
+                    raise DeadlineExceededException(deadline.seconds) from e
+
+            logging.warning("Trello request failed (attempt {}). Retrying in {:.1f} seconds.", attempts, delay)
+            time.sleep(delay)
+            attempts += 1
+            if self.instrumentation is not None:
+                self.instrumentation.record_retries(1)
+
+            # find_existing may make calls of its own, which reset the count of the current thread
+            existing = find_existing() if find_existing is not None else None
+            self._local.retries = attempts - 1
+            if existing is not None:
+                return existing
+
+
+def deadline_bound(method: Callable[..., T]) -> Callable[..., T]:
+    """
+    Decorator bounding a TrelloAPI method, with every request and retry it makes, by the operation_deadline of the
+    instance. A method called while a deadline is already running, by TrelloAPI.deadline() or by another bound
+    method, shares that deadline. Without operation_deadline, the method is called directly.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs) -> T:
+        if self.operation_deadline is None or self.deadlines.current() is not None:
+            return method(self, *args, **kwargs)
+        with self.deadlines.bound(self.operation_deadline):
+            return method(self, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,95 @@
+import hashlib
+import threading
+from concurrent.futures import Future
+from os import environ
+from pathlib import Path
+from typing import BinaryIO, Callable, Hashable, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+
+def default_lock_dir() -> Path:
+    """
+    Returns the default directory of the lock files shared by trello_cli processes, following the XDG base directory
+    specification.
+
+    :return: (Path) $XDG_RUNTIME_DIR/trello_cli/locks, or ~/.cache/trello_cli/locks.
+    """
+    runtime_dir = environ.get("XDG_RUNTIME_DIR") or environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(runtime_dir) / "trello_cli" / "locks"
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the function, and the callers arriving while it
+    runs wait for it and get the same result, or the same exception raised. Once done, the next call for the key runs
+    the function again. Safe to share between threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, function: Callable[[], T]) -> T:
+        """
+        :param key: (Hashable) identifier of the operation.
+        :param function: (Callable) the operation, only run by the first caller of the key.
+
+        :return: Result of the operation.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+
+        if owner:
+            try:
+                future.set_result(function())
+            except Exception as e:  # pylint: disable=broad-except
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._in_flight[key]
+
+        return future.result()
+
+
+class FileLock:
+    """
+    Exclusive advisory lock on a local file, held between processes for the duration of a with block. The file is
+    created if needed and never removed, so that every process locks the same inode.
+
+    Only available on POSIX systems. fcntl is imported when the lock is taken, so that importing this module, and
+    TrelloAPI with it, works everywhere.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._file: Optional[BinaryIO] = None
+
+    @classmethod
+    def for_key(cls, lock_dir: Union[str, Path], *key: str) -> "FileLock":
+        """
+        :param lock_dir: (str or Path) directory of the lock files.
+        :param key: (str) parts identifying the locked operation.
+
+        :return: (FileLock) Lock of the operation, in a file named after a hash of the key.
+        """
+        digest = hashlib.sha256("\0".join(key).encode()).hexdigest()[:32]
+        return cls(Path(lock_dir) / f"{digest}.lock")
+
+    def __enter__(self) -> "FileLock":
+        import fcntl  # pylint: disable=import-outside-toplevel
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a+b")  # pylint: disable=consider-using-with
+        fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        import fcntl  # pylint: disable=import-outside-toplevel
+
+        fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
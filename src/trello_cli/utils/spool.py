@@ -0,0 +1,204 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from os import environ
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+# fields of a spooled card, the same ones accepted by the trello_cli arguments
+SPOOL_FIELDS = ("board_url", "list_name", "card_name", "card_description", "card_comment", "label_name")
+
+
+def default_spool_path() -> Path:
+    """
+    Returns the default spool file location, following the XDG base directory specification.
+
+    :return: (Path) $XDG_DATA_HOME/trello_cli/spool.sqlite, or ~/.local/share/trello_cli/spool.sqlite.
+    """
+    data_home = environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(data_home) / "trello_cli" / "spool.sqlite"
+
+
+@dataclass
+class SpoolJob:
+    """
+    A spooled card creation. card_id is set once the card is created, so that a resumed job only creates the
+    comment. first_attempt_at is the time the job was first claimed by a flusher.
+    """
+    id: int
+    spec: dict[str, str]
+    attempts: int
+    first_attempt_at: float
+    card_id: Optional[str] = None
+    card_url: Optional[str] = None
+
+
+class CardSpool:
+    """
+    Durable queue of card creations stored in SQLite, in write-ahead-log mode. Enqueueing is a local insert, so
+    producers never wait on Trello, and the queue survives crashes and restarts. A SpoolFlusher drains it.
+
+    Jobs are pending until claimed by the flusher, then in progress until done (removed from the spool), scheduled
+    for a later attempt, or failed (kept with their error). Safe to share between threads and processes.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        self.path = Path(path) if path is not None else default_spool_path()
+
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=30)
+        # committed jobs survive a crash of the process, without waiting for a disk sync on every insert
+        self._connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, spec TEXT NOT NULL, state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL DEFAULT 0,
+                first_attempt_at REAL, card_id TEXT, card_url TEXT, error TEXT, enqueued_at REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, next_attempt_at);
+        """)
+
+    def close(self) -> None:
+        """
+        Closes the spool database.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def enqueue(self, spec: dict[str, str]) -> int:
+        """
+        Adds a card creation to the spool.
+
+        :raises ValueError: raised when a field is missing.
+
+        :param spec: (dict) the single card fields: board_url, list_name, card_name, card_description, card_comment and
+            label_name.
+
+        :return: (int) ID of the job.
+        """
+        return self.enqueue_many([spec])[-1]
+
+    def enqueue_many(self, specs: Iterable[dict[str, str]]) -> list[int]:
+        """
+        Adds many card creations to the spool in a single transaction.
+
+        :raises ValueError: raised when a field is missing, in which case no job is added.
+
+        :param specs: (Iterable[dict]) card fields, see enqueue().
+
+        :return: (list[int]) IDs of the jobs.
+        """
+        rows = []
+        for spec in specs:
+            missing = [name for name in SPOOL_FIELDS if spec.get(name) is None]
+            if missing:
+                raise ValueError(f"Card spec missing fields: {', '.join(missing)}")
+            rows.append(json.dumps({name: spec[name] for name in SPOOL_FIELDS}))
+
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                ids = [self._connection.execute("INSERT INTO jobs (spec, enqueued_at) VALUES (?, ?)",
+                                                (row, now)).lastrowid for row in rows]
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        return ids
+
+    def claim(self, limit: int) -> list[SpoolJob]:
+        """
+        Marks up to limit pending jobs, due for an attempt, as in progress.
+
+        :param limit: (int) maximum number of jobs.
+
+        :return: (list[SpoolJob]) Claimed jobs, oldest first.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._connection.execute(
+                    "SELECT id, spec, attempts, first_attempt_at, card_id, card_url FROM jobs "
+                    "WHERE state = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT ?", (now, limit)).fetchall()
+                self._connection.executemany(
+                    "UPDATE jobs SET state = 'in_progress', attempts = attempts + 1, "
+                    "first_attempt_at = COALESCE(first_attempt_at, ?) WHERE id = ?", [(now, row[0]) for row in rows])
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+        return [SpoolJob(id=row[0], spec=json.loads(row[1]), attempts=row[2] + 1,
+                         first_attempt_at=row[3] if row[3] is not None else now, card_id=row[4], card_url=row[5])
+                for row in rows]
+
+    def _execute(self, query: str, params: tuple) -> None:
+        with self._lock:
+            self._connection.execute(query, params)
+
+    def mark_card_created(self, job_id: int, card_id: str, card_url: str) -> None:
+        """
+        Records the card created by a job, before its comment is created.
+        """
+        self._execute("UPDATE jobs SET card_id = ?, card_url = ? WHERE id = ?", (card_id, card_url, job_id))
+
+    def mark_done(self, job_id: int) -> None:
+        """
+        Removes a finished job from the spool.
+        """
+        self._execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def retry_later(self, job_id: int, delay: float, error: str) -> None:
+        """
+        Puts a job back in the queue, to be claimed again after delay seconds.
+        """
+        self._execute("UPDATE jobs SET state = 'pending', next_attempt_at = ?, error = ? WHERE id = ?",
+                      (time.time() + delay, error, job_id))
+
+    def mark_failed(self, job_id: int, error: str) -> None:
+        """
+        Keeps a job that will not be attempted again, with its error.
+        """
+        self._execute("UPDATE jobs SET state = 'failed', error = ? WHERE id = ?", (error, job_id))
+
+    def recover(self) -> int:
+        """
+        Puts back in the queue the jobs left in progress by a flusher that stopped before finishing them. Must only be
+        called when no other flusher is running on the spool.
+
+        :return: (int) Number of recovered jobs.
+        """
+        with self._lock:
+            return self._connection.execute("UPDATE jobs SET state = 'pending' WHERE state = 'in_progress'").rowcount
+
+    def counts(self) -> dict[str, int]:
+        """
+        :return: (dict[str, int]) Number of jobs by state: pending, in_progress and failed.
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {"pending": 0, "in_progress": 0, "failed": 0, **dict(rows)}
+
+    def next_attempt_in(self) -> Optional[float]:
+        """
+        :return: (float or None) Seconds until the next pending job is due, 0 if one is due now, or None when there
+            is no pending job.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT MIN(next_attempt_at) FROM jobs WHERE state = 'pending'").fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def failed_jobs(self) -> list[tuple[int, dict[str, str], str]]:
+        """
+        :return: (list[tuple[int, dict, str]]) ID, card fields and error of every failed job.
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT id, spec, error FROM jobs WHERE state = 'failed' ORDER BY id")
+            return [(row[0], json.loads(row[1]), row[2]) for row in rows.fetchall()]
@@ -0,0 +1,134 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .bulk import BulkCardCreator, CardSpec
+from .exceptions import APIRequestException, ListNotFoundException
+from .retry import RetryPolicy
+from .spool import CardSpool, SpoolJob
+from .trello_api import TrelloAPI
+
+# Trello may be unreachable for a long time, so spooled jobs are retried for about an hour instead of seconds
+SPOOL_RETRY_POLICY = RetryPolicy(max_attempts=12, backoff_base=2.0, backoff_max=600.0, deadline=float("inf"))
+
+
+class SpoolFlusher:
+    """
+    Drains a CardSpool to Trello. Due jobs are claimed in batches and run on a worker pool, resolving their boards,
+    lists and labels once through a shared BulkCardCreator.
+
+    Progress is recorded in the spool after each step, so that nothing is lost or duplicated after a crash: jobs left
+    in progress are claimed again, jobs whose card was recorded only create their comment, and a card or comment that
+    was created but not recorded is found on Trello instead of being created twice. Failed jobs are scheduled again
+    following the retry policy, or kept as failed when the error is not transient or the attempts are exhausted.
+
+    Only one flusher must run on a spool at a time.
+    """
+
+    def __init__(self, spool: CardSpool,
+                 trello: TrelloAPI,
+                 concurrency: int = 8,
+                 batch_size: int = 50,
+                 retry_policy: RetryPolicy = SPOOL_RETRY_POLICY,
+                 poll_interval: float = 1.0) -> None:
+        self.spool = spool
+        self.trello = trello
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.retry_policy = retry_policy
+        self.poll_interval = poll_interval
+
+        self.created = 0
+        self.failed = 0
+
+        self._creator = BulkCardCreator(trello, concurrency=concurrency)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def process(self, job: SpoolJob) -> bool:
+        """
+        Creates the card and comment of one claimed job, recording its progress in the spool.
+
+        :param job: (SpoolJob) claimed job.
+
+        :return: (bool) Whether the job is done.
+        """
+        spec = CardSpec.from_dict(job.spec)
+        # a card recorded by an earlier attempt may already have its comment
+        comment_since = job.first_attempt_at if job.card_id is not None else None
+        try:
+            if job.card_id is None:
+                list_id, label = self._creator.resolve(spec)
+                card = self.trello.create_card(list_id, label.id, spec.card_name, spec.card_description,
+                                               since=job.first_attempt_at if job.attempts > 1 else None)
+                self.spool.mark_card_created(job.id, card.id, card.url)
+                job.card_id, job.card_url = card.id, card.url
+
+            self.trello.create_card_comment(job.card_id, spec.card_comment, since=comment_since)
+
+        except (APIRequestException, ListNotFoundException) as e:
+            # the resolved IDs may be stale, the next job using this board resolves them again
+            self._creator.forget(spec.board_url)
+
+            delay = self.retry_policy.next_delay(job.attempts, 0.0, e) if isinstance(e, APIRequestException) else None
+            if delay is None:
+                logging.error("Spooled card {} failed: {}", job.id, e)
+                self.spool.mark_failed(job.id, str(e))
+                with self._lock:
+                    self.failed += 1
+            else:
+                logging.warning("Spooled card {} failed (attempt {}). Retrying in {:.0f} seconds.", job.id, job.attempts,
+                                delay)
+                self.spool.retry_later(job.id, delay, str(e))
+            return False
+
+        self.spool.mark_done(job.id)
+        with self._lock:
+            self.created += 1
+        return True
+
+    def run(self, follow: bool = False) -> tuple[int, int]:
+        """
+        Processes the due jobs of the spool until none is left, or, when following, until stop() is called.
+
+        :param follow: (bool) keep waiting for new and scheduled jobs instead of returning.
+
+        :return: (tuple[int, int]) Number of created cards and of failed jobs, since the flusher was created.
+        """
+        recovered = self.spool.recover()
+        if recovered:
+            logging.info("Resuming {} spooled cards left in progress.", recovered)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while not self._stop.is_set():
+                jobs = self.spool.claim(self.batch_size)
+                if jobs:
+                    list(executor.map(self.process, jobs))
+                    continue
+                if not follow:
+                    break
+
+                next_attempt_in = self.spool.next_attempt_in()
+                self._stop.wait(self.poll_interval if next_attempt_in is None
+                                else min(next_attempt_in, self.poll_interval))
+
+        return self.created, self.failed
+
+    def start(self) -> None:
+        """
+        Runs the flusher in a background thread, following the spool until stop() is called.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, kwargs={"follow": True}, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the flusher, after the jobs being processed are finished.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,90 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class Task:
+    """
+    A step of a TaskGraph. fn is called with the results of its dependencies, in the order they are listed.
+    """
+    name: str
+    fn: Callable[..., Any]
+    depends_on: tuple[str, ...] = ()
+    on_done: Optional[Callable[[Any], None]] = None
+
+
+class TaskGraph:
+    """
+    Runs a small graph of dependent steps, starting each one in a thread pool as soon as all its dependencies are done,
+    so that independent steps run at the same time.
+
+    The on_done callbacks always run in the order the tasks were added, each one only after all the previous tasks are
+    done, so their output is stable whatever the completion order. The first exception raised by a task is raised by
+    run(), after the tasks already started are finished, and the tasks depending on it are never started.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max_workers
+        self.tasks: dict[str, Task] = {}
+        # result of each task done by the last run(), by name, also kept when it failed
+        self.results: dict[str, Any] = {}
+
+    def add(self, name: str,
+            fn: Callable[..., Any],
+            depends_on: tuple[str, ...] = (),
+            on_done: Optional[Callable[[Any], None]] = None) -> None:
+        """
+        Adds a task to the graph. Dependencies must be added before the tasks depending on them, which also keeps the
+        graph free of cycles.
+
+        :raises ValueError: raised when the name is already used or a dependency is unknown.
+
+        :param name: (str) unique task name.
+        :param fn: (Callable) function called with the results of the dependencies.
+        :param depends_on: (tuple[str]) names of the tasks whose results are needed.
+        :param on_done: (Callable) called with the task result, in the order the tasks were added.
+        """
+        if name in self.tasks:
+            raise ValueError(f"Task already added: {name}")
+        unknown = [dependency for dependency in depends_on if dependency not in self.tasks]
+        if unknown:
+            raise ValueError(f"Unknown dependencies for task {name}: {', '.join(unknown)}")
+
+        self.tasks[name] = Task(name, fn, tuple(depends_on), on_done)
+
+    def run(self) -> dict[str, Any]:
+        """
+        Runs every task of the graph.
+
+        :return: (dict) Result of each task, by name.
+        """
+        results = self.results = {}
+        running: dict[Future, str] = {}
+        order = list(self.tasks)
+        next_callback = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def submit_ready() -> None:
+                started = set(running.values())
+                for task in self.tasks.values():
+                    if task.name not in results and task.name not in started \
+                            and all(dependency in results for dependency in task.depends_on):
+                        future = executor.submit(task.fn, *(results[dependency] for dependency in task.depends_on))
+                        running[future] = task.name
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+
+                while next_callback < len(order) and order[next_callback] in results:
+                    task = self.tasks[order[next_callback]]
+                    if task.on_done is not None:
+                        task.on_done(results[task.name])
+                    next_callback += 1
+
+                submit_ready()
+
+        return results
@@ -0,0 +1,288 @@
+import json
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Union
+from urllib.parse import parse_qsl, urlsplit
+
+from .attachments import MultipartUpload
+from .exceptions import APIRequestException, RecordingNotFoundException
+
+if TYPE_CHECKING:
+    import requests
+
+    from .fake_trello import FakeTrello
+    from .trello_api import ConnectionPoolConfig, RequestType
+
+# query parameters never written to a recording
+CREDENTIAL_PARAMS = ("key", "token")
+
+
+class Headers(dict):
+    """
+    Response headers looked up case-insensitively, like the headers of requests.Response.
+    """
+
+    def __init__(self, headers: Optional[dict[str, str]] = None) -> None:
+        super().__init__({key.lower(): value for key, value in (headers or {}).items()})
+
+    def __getitem__(self, key: str) -> str:
+        return super().__getitem__(key.lower())
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and super().__contains__(key.lower())
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return super().get(key.lower(), default)
+
+
+@dataclass
+class TransportResponse:
+    """
+    Response of a transport not backed by requests. Has the same attributes and methods used from requests.Response.
+    """
+    status_code: int
+    content: bytes = b""
+    url: str = ""
+    headers: Headers = field(default_factory=Headers)
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class Transport(ABC):
+    """
+    Sends the requests of a TrelloAPI. Implementations build the request from the endpoint and payload, and map every
+    failure to an APIRequestException, so that TrelloAPI only deals with responses and APIRequestException.
+    """
+
+    @abstractmethod
+    def send(self, request_type: "RequestType",
+             endpoint: str,
+             payload: Optional[Union[dict[str, str], str, MultipartUpload]],
+             timeout: Optional[float] = None) -> Union["requests.Response", TransportResponse]:
+        """
+        Sends a single request.
+
+        :raises APIRequestException: raised when no response could be received.
+
+        :param request_type: (RequestType) Type of Request. Supported Values - GET, POST, PUT
+        :param endpoint: (str) API Endpoint.
+        :param payload: (dict, str or MultipartUpload) API Request Parameters, Query String, or multipart form with a
+            file, streamed from disk.
+        :param timeout: (float or None) maximum seconds to wait for the connection and for the response, on top of
+            the default timeouts of the transport.
+
+        :return: (requests.Response or TransportResponse) Response, whatever its status.
+        """
+
+    def raise_for_status(self, response: Union["requests.Response", TransportResponse]) -> None:
+        """
+        :raises APIRequestException: raised, with the status code, when the response is an error.
+
+        :param response: (requests.Response or TransportResponse) response returned by send().
+        """
+        if response.status_code >= 400:
+            raise APIRequestException(f"{response.status_code} Error for url: {response.url}", response.status_code)
+
+    def close(self) -> None:
+        """
+        Releases the resources held by the transport.
+        """
+
+
+class HTTPTransport(Transport):
+    """
+    Sends the requests to Trello through a pooled keep-alive requests session. The session is never mutated after
+    being created, so its connection pool can be used by many threads at the same time.
+
+    requests is only imported when the first HTTPTransport is created, so that the CLI starts without it.
+    """
+
+    def __init__(self, pool_config: "ConnectionPoolConfig",
+                 headers: dict[str, str]) -> None:
+        # pylint: disable=import-outside-toplevel
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.exceptions = requests.exceptions
+        self.pool_config = pool_config
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_config.pool_connections,
+                              pool_maxsize=pool_config.pool_maxsize,
+                              pool_block=pool_config.pool_block)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.session.headers.update(headers)
+        if not pool_config.keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def send(self, request_type: "RequestType",
+             endpoint: str,
+             payload: Optional[Union[dict[str, str], str, MultipartUpload]],
+             timeout: Optional[float] = None) -> "requests.Response":
+        timeouts = self.pool_config.timeout
+        if timeout is not None:
+            timeouts = tuple(min(default, timeout) for default in timeouts)
+
+        try:
+            if request_type.value == "GET":
+                return self.session.get(endpoint,
+                                        timeout=timeouts,
+                                        params=payload)
+
+            if request_type.value == "PUT":
+                return self.session.put(endpoint,
+                                        timeout=timeouts,
+                                        json=payload)
+
+            if isinstance(payload, MultipartUpload):
+                with payload.open() as body:
+                    return self.session.post(endpoint,
+                                             timeout=timeouts,
+                                             data=body,
+                                             headers={"Content-Type": payload.content_type})
+
+            return self.session.post(endpoint,
+                                     timeout=timeouts,
+                                     json=payload)
+
+        except self.exceptions.ConnectionError as errc:
+            raise APIRequestException(errc) from errc
+        except self.exceptions.Timeout as errt:
+            raise APIRequestException(errt) from errt
+        except self.exceptions.RequestException as err:
+            raise APIRequestException(err) from err
+
+    def raise_for_status(self, response: "requests.Response") -> None:
+        try:
+            response.raise_for_status()
+        except self.exceptions.HTTPError as errh:
+            raise APIRequestException(errh, errh.response.status_code if errh.response is not None else None) from errh
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class InMemoryTransport(Transport):
+    """
+    Answers the requests from a FakeTrello in the same process, without any socket, so that the whole TrelloAPI stack
+    runs at CPU speed in tests and load tests:
+
+        transport = InMemoryTransport()
+        transport.trello.add_board("Board", "bOaRd", list_names=("TO DO",))
+        trello = TrelloAPI(rate_limit=False, transport=transport)
+    """
+
+    def __init__(self, trello: Optional["FakeTrello"] = None) -> None:
+        # the test double is only imported by the in-memory transport, never by the production code paths
+        from .fake_trello import FakeTrello  # pylint: disable=import-outside-toplevel
+
+        self.trello = trello or FakeTrello()
+
+    def send(self, request_type: "RequestType",
+             endpoint: str,
+             payload: Optional[Union[dict[str, str], str, MultipartUpload]],
+             timeout: Optional[float] = None) -> TransportResponse:
+        url = urlsplit(endpoint)
+        if isinstance(payload, MultipartUpload):
+            # the body is read as it would be sent, while the fake only keeps the size of the file
+            with payload.open() as body:
+                for _ in body:
+                    pass
+            params = {**payload.fields, "bytes": str(payload.attachment.size)}
+        elif isinstance(payload, str):
+            params = dict(parse_qsl(payload))
+        else:
+            params = {key: str(value) for key, value in (payload or {}).items()}
+
+        status_code, response = self.trello.handle(request_type.value, url.path, params)
+
+        return TransportResponse(status_code=status_code, content=json.dumps(response).encode(), url=endpoint)
+
+
+def recording_key(method: str,
+                  endpoint: str,
+                  payload: Optional[Union[dict[str, str], str, MultipartUpload]]) -> str:
+    """
+    :return: (str) Key identifying a request in a recording, without the credentials. Uploads are identified by their
+        form fields and file name, not by their content.
+    """
+    if isinstance(payload, MultipartUpload):
+        params = {**payload.fields, "file": payload.attachment.name}
+    elif isinstance(payload, str):
+        params = dict(parse_qsl(payload))
+    else:
+        params = dict(payload or {})
+    params = {key: str(value) for key, value in params.items() if key not in CREDENTIAL_PARAMS}
+    return f"{method} {endpoint} {json.dumps(params, sort_keys=True)}"
+
+
+class RecordingTransport(Transport):
+    """
+    Sends the requests through another transport and appends every exchange, without the credentials, as a JSON line
+    to a file that a ReplayTransport can serve later.
+    """
+
+    def __init__(self, transport: Transport,
+                 path: Union[str, Path]) -> None:
+        self.transport = transport
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def send(self, request_type: "RequestType",
+             endpoint: str,
+             payload: Optional[Union[dict[str, str], str, MultipartUpload]],
+             timeout: Optional[float] = None) -> Union["requests.Response", TransportResponse]:
+        response = self.transport.send(request_type, endpoint, payload, timeout)
+
+        exchange = {"key": recording_key(request_type.value, endpoint, payload),
+                    "status_code": response.status_code,
+                    "headers": dict(response.headers),
+                    "content": response.content.decode()}
+        with self._lock, self.path.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(exchange) + "\n")
+
+        return response
+
+    def raise_for_status(self, response: Union["requests.Response", TransportResponse]) -> None:
+        self.transport.raise_for_status(response)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Answers the requests with the responses captured by a RecordingTransport. Identical requests get their recorded
+    responses in the order they were captured, and the last one is repeated once they are exhausted. A request that
+    was never recorded raises a RecordingNotFoundException.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self._lock = threading.Lock()
+        self._exchanges: dict[str, deque] = defaultdict(deque)
+        with Path(path).open(encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    exchange = json.loads(line)
+                    self._exchanges[exchange["key"]].append(exchange)
+
+    def send(self, request_type: "RequestType",
+             endpoint: str,
+             payload: Optional[Union[dict[str, str], str, MultipartUpload]],
+             timeout: Optional[float] = None) -> TransportResponse:
+        key = recording_key(request_type.value, endpoint, payload)
+        with self._lock:
+            exchanges = self._exchanges.get(key)
+            if not exchanges:
+                raise RecordingNotFoundException(request_type.value, urlsplit(endpoint).path)
+            exchange = exchanges.popleft() if len(exchanges) > 1 else exchanges[0]
+
+        return TransportResponse(status_code=exchange["status_code"],
+                                 content=exchange["content"].encode(),
+                                 url=endpoint,
+                                 headers=Headers(exchange["headers"]))
@@ -1,132 +1,394 @@
+import contextlib
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, Union
 
-import requests
+from .attachments import Attachment, MultipartUpload, ProgressCallback
+from .authentication import TrelloCredentials, require_credentials_from_env
+from .credential_pool import CredentialPool
+from .exceptions import LabelNotFoundException
+from .hedging import Hedger, HedgingPolicy
+from .instrumentation import Instrumentation, instrumented
+from .models import (AttachmentInfo, BoardInfo, BoardSnapshot, CardInfo, CardRecord, LabelInfo, ListInfo, find_label,
+                     find_list_id)
+from .request_sender import RequestSender
+from .retry import NO_RETRY, DeadlineScope, Retrier, RetryPolicy, deadline_bound
+from .single_flight import FileLock, SingleFlight
+from .transport import HTTPTransport, Transport
 
-from .authentication import TrelloAuthenticationFromEnv
-from .exceptions import APIRequestException, ListNotFoundException, LabelNotFoundException
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import requests
+
+    from .batch import TrelloBatch
+    from .board_cache import BoardCache
+    from .board_mirror import BoardMirror
+    from .card_index import CardIndex
+    from .rate_limit import RateLimiter
 
 
 class RequestType(Enum):
     """
-    Enum class for RequestType containing 2 values - GET, POST
+    Enum class for RequestType containing 3 values - GET, POST, PUT
     """
     GET = "GET"
     POST = "POST"
+    PUT = "PUT"
 
 
-@dataclass
-class CardInfo:
-    id: str
-    url: str
+# base url of Trello's RestAPI
+TRELLO_API_URL = "https://api.trello.com/1"
 
-    @classmethod
-    def from_dict(cls, data: dict[str, str]) -> "CardInfo":
-        return cls(id=data["id"],
-                   url=data["url"])
+# only the fields used by the dataclasses are requested, to keep responses small
+BOARD_FIELDS = "id,name"
+LIST_FIELDS = "id,name"
+LABEL_FIELDS = "id,name"
+CARD_FIELDS = "id,url"
+CARD_RECORD_FIELDS = "id,name,desc,idList,idLabels,url,closed,dateLastActivity"
+ATTACHMENT_FIELDS = "id,name,bytes,url"
 
+# attachments uploaded at the same time by add_attachments()
+DEFAULT_UPLOAD_CONCURRENCY = 4
 
-@dataclass
-class BoardInfo:
-    id: str
-    name: str
+# most cards returned by one request to the board cards route, the maximum accepted by Trello
+CARDS_PAGE_LIMIT = 1000
+
+# default retry policies: GETs and PUTs are always safe to retry, POSTs are only retried when a duplicate can be
+# detected
+DEFAULT_RETRY_POLICIES = {RequestType.GET: RetryPolicy(),
+                          RequestType.POST: RetryPolicy(max_attempts=3, deadline=60.0),
+                          RequestType.PUT: RetryPolicy()}
+
+# seconds of clock difference with Trello tolerated when matching objects created by a failed attempt
+CLOCK_SKEW = 30.0
 
-    @classmethod
-    def from_dict(cls, data: dict[str, str]) -> "BoardInfo":
-        return cls(id=data["id"],
-                   name=data["name"])
+BOARD_SHORT_LINK_PATTERN = re.compile(r"trello\.com/b/(?P<short_link>[A-Za-z0-9]+)")
+
+
+def object_created_at(object_id: str) -> float:
+    """
+    Trello ids start with the creation unix timestamp in hexadecimal, as MongoDB ObjectIds.
+
+    :param object_id: (str) id of a Trello card, action, label...
+
+    :return: (float) Creation time of the object, in seconds since the epoch.
+    """
+    return float(int(object_id[:8], 16))
+
+
+def parse_board_short_link(board_url: str) -> Optional[str]:
+    """
+    Extracts the board shortLink from a board url, e.g. 'zQFa6vj2' from 'https://trello.com/b/zQFa6vj2/canonicaltest'.
+
+    :param board_url: (str) the board url
+
+    :return: (str or None) The board shortLink, or None if the url is not a Trello board url.
+    """
+    match = BOARD_SHORT_LINK_PATTERN.search(board_url)
+    return match.group("short_link") if match else None
 
 
 @dataclass
-class LabelInfo:
-    id: str
-    name: str
+class ConnectionPoolConfig:
+    """
+    Settings for the pooled HTTP connections shared by every TrelloAPI call.
+
+    :param pool_connections: (int) number of per-host connection pools to keep.
+    :param pool_maxsize: (int) maximum number of connections kept open per host.
+    :param pool_block: (bool) block when the per-host pool is exhausted instead of opening extra connections.
+    :param keep_alive: (bool) reuse connections between calls. When False, every call closes its connection.
+    :param connect_timeout: (float) seconds to wait for the connection to be established.
+    :param read_timeout: (float) seconds to wait for the server to send a response.
+    """
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    keep_alive: bool = True
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
 
-    @classmethod
-    def from_dict(cls, data: dict[str, str]) -> "LabelInfo":
-        return cls(id=data["id"],
-                   name=data["name"])
+    @property
+    def timeout(self) -> tuple[float, float]:
+        return self.connect_timeout, self.read_timeout
 
 
 class TrelloAPI:
     """
     Add a card to a Trello board with label and comment.
+
+    All calls share a single pooled HTTP session, so only the first request to Trello pays for the TCP and TLS
+    handshakes. The session is safe to share between threads and is released with close(), or by using the
+    instance as a context manager. Another Transport can be provided instead, e.g. an InMemoryTransport or a
+    ReplayTransport to run without network.
+
+    Requests are paced to stay under Trello's rate limits, with the budget shared by every instance and thread using
+    the same credentials. Disable it with rate_limit=False. The credentials, given or found in the environment (see
+    load_credentials_from_env()), are held by a CredentialPool: every request is sent with the least-loaded one, so
+    that the throughput grows with the number of tokens.
+
+    Connection errors, timeouts and 5xx responses are retried following the retry policy of each request type. POSTs
+    are only retried after checking that the failed attempt did not create the object anyway, so a retried creation
+    never produces duplicates. The number of retries of the last call made by the current thread is in last_retries.
+
+    When an Instrumentation is provided, each public method is recorded as an operation with its latency, requests,
+    status codes, bytes received, JSON decode time and retries.
+
+    When a BoardCache is provided, board, list and label lookups are answered from it and refreshed from Trello only
+    when the cached entry is missing or expired.
+
+    Boards registered with mirror_board() answer list, label and snapshot lookups from a local BoardMirror, kept up
+    to date from the board actions feed.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, pool_config: Optional[ConnectionPoolConfig] = None,
+                 *,
+                 cache: Optional["BoardCache"] = None,
+                 rate_limit: bool = True,
+                 max_rate_limit_retries: int = 3,
+                 retry_policies: Optional[dict[RequestType, RetryPolicy]] = None,
+                 instrumentation: Optional[Instrumentation] = None,
+                 api_url: str = TRELLO_API_URL,
+                 transport: Optional[Transport] = None,
+                 credentials: Optional[Union[CredentialPool, list[TrelloCredentials]]] = None,
+                 hedging: Optional[HedgingPolicy] = None,
+                 operation_deadline: Optional[float] = None) -> None:
+        # the credentials, given or found in the environment, are spread by a pool, even when there is only one
+        if credentials is None:
+            credentials = require_credentials_from_env()
+        if isinstance(credentials, list):
+            credentials = CredentialPool(credentials, rate_limit=rate_limit)
+
         # get authentication
-        authentication = TrelloAuthenticationFromEnv()
-        self.query = {"key": authentication.API_KEY,
-                      "token": authentication.API_TOKEN}
+        first = credentials.credentials[0].credentials
+        self.query = {"key": first.api_key,
+                      "token": first.api_token}
 
         self.headers = {"Accept": "application/json"}
 
-        # default urls to be used
-        self.boards_list_url = "https://api.trello.com/1/boards/{}/lists"
-        self.board_labels = "https://api.trello.com/1/boards/{}/labels"
-        self.cards_url = "https://api.trello.com/1/cards"
-        self.create_label_url = "https://api.trello.com/1/boards/{}/labels"
-        self.add_comment_url = "https://api.trello.com/1/cards/{}/actions/comments"
+        # pooled keep-alive session used by every call, unless another transport is provided
+        self.pool_config = pool_config or ConnectionPoolConfig()
+
+        # seconds given to each public operation, with all its requests and retries, instead of the timeouts of each
+        # request
+        self.operation_deadline = operation_deadline
+        self.deadlines = DeadlineScope()
+
+        # each request is sent with a credential of the pool, paced by its rate limiter. GETs slower than the recent
+        # ones are sent a second time with a hedging policy, and the first response is used. Per operation timing is
+        # only collected when an Instrumentation is provided
+        self.sender = RequestSender(transport or HTTPTransport(self.pool_config, self.headers),
+                                    credentials,
+                                    self.deadlines,
+                                    max_rate_limit_retries=max_rate_limit_retries,
+                                    hedger=Hedger(hedging) if hedging is not None else None,
+                                    instrumentation=instrumentation)
+
+        # failed calls are retried following the retry policy of their request type
+        self.retry_policies = {**DEFAULT_RETRY_POLICIES, **(retry_policies or {})}
+        self.retrier = Retrier(self.deadlines, instrumentation)
+
+        self.cache = cache
+
+        # local mirrors of the boards registered with mirror_board(), by board id and shortLink
+        self.mirrors: dict[str, "BoardMirror"] = {}
+
+        # card indexes used by upsert_card(), by list and key function
+        self._card_indexes: dict[tuple[str, Optional[Callable]], "CardIndex"] = {}
+        self._card_indexes_lock = threading.Lock()
+
+        # ids of the cards already returned by create_card(), never matched again as the card of a failed attempt
+        self._returned_cards: set[str] = set()
+        self._returned_cards_lock = threading.Lock()
+
+        # concurrent get_or_create_label() calls for the same label share one lookup and creation. When a directory is
+        # set, a lock file in it also serializes them with the other processes using the same directory
+        self._label_flights = SingleFlight()
+        self.label_lock_dir: Optional[Union[str, "Path"]] = None
+
+        # default urls to be used, relative to api_url so that a local stand-in server can be used instead of Trello
+        self.board_url = api_url + "/boards/{}"
+        self.boards_list_url = api_url + "/boards/{}/lists"
+        self.board_labels = api_url + "/boards/{}/labels"
+        self.board_actions_url = api_url + "/boards/{}/actions"
+        self.cards_url = api_url + "/cards"
+        self.card_url = api_url + "/cards/{}"
+        self.create_label_url = api_url + "/boards/{}/labels"
+        self.add_comment_url = api_url + "/cards/{}/actions/comments"
+        self.list_cards_url = api_url + "/lists/{}/cards"
+        self.board_cards_url = api_url + "/boards/{}/cards"
+        self.card_actions_url = api_url + "/cards/{}/actions"
+        self.card_attachments_url = api_url + "/cards/{}/attachments"
+        self.batch_url = api_url + "/batch"
+
+    @property
+    def transport(self) -> Transport:
+        """
+        :return: (Transport) Transport the requests are sent through.
+        """
+        return self.sender.transport
+
+    @property
+    def session(self) -> "requests.Session":
+        """
+        :return: (requests.Session) Pooled session of the HTTPTransport.
+        """
+        return self.transport.session
+
+    @property
+    def credential_pool(self) -> CredentialPool:
+        """
+        :return: (CredentialPool) Credentials the requests are spread across.
+        """
+        return self.sender.credential_pool
+
+    @property
+    def instrumentation(self) -> Optional[Instrumentation]:
+        """
+        :return: (Instrumentation or None) Instrumentation recording the operations, if provided.
+        """
+        return self.sender.instrumentation
+
+    @property
+    def last_retries(self) -> int:
+        """
+        :return: (int) Number of retries made by the last call of the current thread.
+        """
+        return self.retrier.last_retries
+
+    def batch(self, window: Optional[float] = None) -> "TrelloBatch":
+        """
+        Returns a TrelloBatch collecting GET lookups to be sent together through Trello's /1/batch endpoint. Use it
+        as a context manager to send the pending lookups when leaving the block:
+
+            with trello.batch() as batch:
+                list_ids = [batch.get_desired_list_id(board_id, "TO DO") for board_id in board_ids]
+            print([list_id.result() for list_id in list_ids])
+
+        :param window: (float) if provided, pending lookups are also sent this many seconds after the first one.
+
+        :return: (TrelloBatch) New batch.
+        """
+        from .batch import TrelloBatch  # pylint: disable=import-outside-toplevel
+
+        return TrelloBatch(self, window=window)
+
+    def mirror_board(self, board_id: str,
+                     path: Optional[Union[str, "Path"]] = None,
+                     max_staleness: Optional[float] = None) -> "BoardMirror":
+        """
+        Keeps a local mirror of the board, answering its list, label and snapshot lookups with data at most
+        max_staleness seconds old. The mirror is synced before returning.
+
+        :param board_id: (str) id or shortLink of the board.
+        :param path: (str or Path) mirror database, default_mirror_path() if not provided.
+        :param max_staleness: (float) maximum age, in seconds, of the mirrored data, DEFAULT_MAX_STALENESS if not
+            provided.
+
+        :return: (BoardMirror) The board mirror.
+        """
+        from .board_mirror import DEFAULT_MAX_STALENESS, BoardMirror  # pylint: disable=import-outside-toplevel
+
+        mirror = BoardMirror(self, board_id, path,
+                             max_staleness=DEFAULT_MAX_STALENESS if max_staleness is None else max_staleness)
+        mirror.ensure_fresh()
+        self.mirrors[board_id] = self.mirrors[mirror.board.id] = mirror
+        return mirror
+
+    def __enter__(self) -> "TrelloAPI":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes every pooled connection held by this instance.
+        """
+        if self.sender.hedger is not None:
+            self.sender.hedger.close()
+        self.transport.close()
+
+    @contextlib.contextmanager
+    def deadline(self, seconds: float) -> Iterator[None]:
+        """
+        Context manager bounding every operation of the current thread inside it, with all their requests and retries,
+        by a deadline. Requests still running out of it raise a DeadlineExceededException. A deadline set inside
+        another one can only shorten it.
+
+        :param seconds: (float) seconds from now.
+        """
+        with self.deadlines.bound(seconds):
+            yield
 
     def call_api(self, request_type: RequestType,
                  endpoint: str,
-                 payload: Optional[Union[dict[str, str], str]]) -> dict[str, str] | list[dict[str, str]] | None:
+                 payload: Optional[Union[dict[str, str], str]],
+                 find_existing: Optional[Callable[[], Optional[dict]]] = None) -> dict[str, str] | list[dict[str, str]] | None:
         """
-        Function to call the Trello API via the Requests Library
+        Function to call the Trello API through the transport, retrying transient failures following the
+        retry policy of the request type.
 
-        :param request_type: (RequestType) Type of Request. Supported Values - GET, POST
+        POSTs are not idempotent, so they are only retried when find_existing is provided. It is called before every
+        new attempt and, if the failed attempt did create the object, its result is returned instead of posting again.
+
+        Inside a deadline, each attempt only waits for the time left, and no attempt is started once it has expired.
+
+        :param request_type: (RequestType) Type of Request. Supported Values - GET, POST, PUT
         :param endpoint: (str) API Endpoint.
-        :param payload: (dict or str) API Request Parameters or Query String.
+        :param payload: (dict, str or MultipartUpload) API Request Parameters, Query String or multipart form.
+        :param find_existing: (Callable) for POSTs, returns the object created by a previous attempt, or None.
 
         :return: (dict, list[dict] or None) Response.
         """
-        try:
-            response = {}
-            if request_type == RequestType.GET:
-                response = requests.get(endpoint,
-                                        timeout=30,
-                                        headers=self.headers,
-                                        params=payload)
-            elif request_type == RequestType.POST:
-                response = requests.post(endpoint,
-                                         headers=self.headers,
-                                         timeout=30,
-                                         json=payload)
-
-            if response.status_code in (200, 201):
-                return response.json()
-
-            response.raise_for_status()
-
-            return None
-
-        except requests.exceptions.HTTPError as errh:
-            raise APIRequestException(errh) from errh
-        except requests.exceptions.ConnectionError as errc:
-            raise APIRequestException(errc) from errc
-        except requests.exceptions.Timeout as errt:
-            raise APIRequestException(errt) from errt
-        except requests.exceptions.RequestException as err:
-            raise APIRequestException(err) from err
+        policy = self.retry_policies[request_type]
+        if request_type == RequestType.POST and find_existing is None:
+            policy = NO_RETRY
+
+        return self.retrier.call(policy,
+                                 lambda timeout: self.sender.send(request_type, endpoint, payload, timeout),
+                                 find_existing)
 
+    @instrumented
+    @deadline_bound
     def get_board_data(self, board_url: str) -> BoardInfo:
         """
         Gets from Trello's API general data from the provided board url and returns the board's ID and Name in a dict.
-        The Trello's API documentation doesn't explain about this route, but using the URL for the board and adding
-        '.json' at the end of it, will return the desired outcome.
+        The board is requested by the shortLink found in the url, asking only for the needed fields. For urls without
+        a shortLink, the full board export is requested by adding '.json' at the end of the url.
+
+        See: https://developer.atlassian.com/cloud/trello/rest/api-group-boards/#api-boards-id-get
 
         :param board_url: (str) the board url
 
         :return: (BoardInfo) Found board dataclass.
         """
-
-        response = self.call_api(RequestType.GET, f"{board_url}.json", self.query)
+        if self.cache is not None:
+            cached_board = self.cache.get_board(board_url)
+            if cached_board is not None:
+                return cached_board
+
+        short_link = parse_board_short_link(board_url)
+        if short_link is not None:
+            response = self.call_api(RequestType.GET,
+                                     self.board_url.format(short_link),
+                                     {**self.query, "fields": BOARD_FIELDS})
+        else:
+            response = self.call_api(RequestType.GET, f"{board_url}.json", self.query)
 
         board_data = BoardInfo.from_dict(response)
 
+        if self.cache is not None:
+            self.cache.set_board(board_url, board_data)
+
         return board_data
 
+    @instrumented
+    @deadline_bound
     def get_desired_list_id(self, board_id: str,
                             list_name: str) -> str:
         """
@@ -141,14 +403,26 @@ class TrelloAPI:
 
         :return: (str) ID of the found list.
         """
-        board_lists = self.call_api(RequestType.GET, self.boards_list_url.format(board_id), self.query)
+        if board_id in self.mirrors:
+            return self.mirrors[board_id].get_list_id(list_name)
+
+        if self.cache is not None:
+            cached_list_id = self.cache.get_list_id(board_id, list_name)
+            if cached_list_id is not None:
+                return cached_list_id
+
+        response = self.call_api(RequestType.GET,
+                                 self.boards_list_url.format(board_id),
+                                 {**self.query, "fields": LIST_FIELDS})
+        board_lists = [ListInfo.from_dict(board_list) for board_list in response]
 
-        for current_list in board_lists:
-            if current_list['name'] == list_name:
-                return current_list['id']
+        if self.cache is not None:
+            self.cache.set_list_ids(board_id, {current_list.name: current_list.id for current_list in board_lists})
 
-        raise ListNotFoundException(list_name)
+        return find_list_id(board_lists, list_name)
 
+    @instrumented
+    @deadline_bound
     def get_label_from_board(self, board_id: str,
                              label_name: str) -> LabelInfo:
         """
@@ -163,16 +437,188 @@ class TrelloAPI:
 
         :return: (LabelInfo) Dataclass of the found label
         """
+        if board_id in self.mirrors:
+            return self.mirrors[board_id].get_label(label_name)
+
+        if self.cache is not None:
+            cached_label = self.cache.get_label(board_id, label_name)
+            if cached_label is not None:
+                return cached_label
+
+        response = self.call_api(RequestType.GET,
+                                 self.board_labels.format(board_id),
+                                 {**self.query, "fields": LABEL_FIELDS})
+        labels = [LabelInfo.from_dict(board_label) for board_label in response]
+
+        if self.cache is not None:
+            self.cache.set_labels(board_id, labels)
+
+        return find_label(labels, label_name)
+
+    @instrumented
+    @deadline_bound
+    def get_board_snapshot(self, board_id: str,
+                           normalize: bool = False) -> BoardSnapshot:
+        """
+        Gets from Trello's API, in a single request, the board with its open lists and all its labels.
+
+        See: https://developer.atlassian.com/cloud/trello/rest/api-group-boards/#api-boards-id-get
+
+        :param board_id: (str) id or shortLink of the board.
+        :param normalize: (bool) match list and label names ignoring case and extra whitespace.
+
+        :return: (BoardSnapshot) Snapshot of the board lists and labels.
+        """
+        if board_id in self.mirrors:
+            return self.mirrors[board_id].snapshot(normalize)
+
+        additional_params = {"fields": BOARD_FIELDS,
+                             "lists": "open",
+                             "list_fields": LIST_FIELDS,
+                             "labels": "all",
+                             "label_fields": LABEL_FIELDS,
+                             "labels_limit": "1000"}
+
+        response = self.call_api(RequestType.GET,
+                                 self.board_url.format(board_id),
+                                 {**self.query, **additional_params})
+
+        snapshot = BoardSnapshot.from_dict(response, normalize)
+
+        if self.cache is not None:
+            self.cache.set_list_ids(snapshot.board.id, {board_list["name"]: board_list["id"]
+                                                        for board_list in response.get("lists", [])})
+            self.cache.set_labels(snapshot.board.id, [LabelInfo.from_dict(label) for label in response.get("labels", [])])
+
+        return snapshot
+
+    @instrumented
+    @deadline_bound
+    def get_cards_page(self, board_id: str,
+                       before: Optional[str] = None,
+                       since: Optional[str] = None,
+                       limit: int = CARDS_PAGE_LIMIT,
+                       card_filter: str = "all") -> list[CardRecord]:
+        """
+        Gets from Trello's API one page of the cards of a board, the newest first.
+
+        See: https://developer.atlassian.com/cloud/trello/rest/api-group-boards/#api-boards-id-cards-filter-get
+
+        :param board_id: (str) id or shortLink of the board.
+        :param before: (str) only return the cards created before the card with this ID.
+        :param since: (str) only return the cards created after the card with this ID, or after this date.
+        :param limit: (int) maximum number of cards, up to CARDS_PAGE_LIMIT.
+        :param card_filter: (str) cards to return: all, open, closed or visible.
+
+        :return: (list[CardRecord]) The cards of the page.
+        """
+        additional_params = {"fields": CARD_RECORD_FIELDS,
+                             "filter": card_filter,
+                             "limit": str(limit)}
+        if before is not None:
+            additional_params["before"] = before
+        if since is not None:
+            additional_params["since"] = since
+
+        cards = self.call_api(RequestType.GET,
+                              self.board_cards_url.format(board_id),
+                              {**self.query, **additional_params})
+
+        return [CardRecord.from_dict(card) for card in cards]
+
+    def iter_cards(self, board_id: str,
+                   since: Optional[str] = None,
+                   page_size: int = CARDS_PAGE_LIMIT,
+                   card_filter: str = "all") -> Iterator[CardRecord]:
+        """
+        Streams the cards of a board one at a time, the newest first, paging through them with before cursors. The
+        next page is fetched in the background while the current one is consumed, and at most two pages are held in
+        memory, whatever the size of the board.
+
+        :param board_id: (str) id or shortLink of the board.
+        :param since: (str) only return the cards created after the card with this ID, or after this date.
+        :param page_size: (int) cards requested per page, up to CARDS_PAGE_LIMIT.
+        :param card_filter: (str) cards to return: all, open, closed or visible.
+
+        :return: (Iterator[CardRecord]) The cards of the board.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = self.get_cards_page(board_id, since=since, limit=page_size, card_filter=card_filter)
+            while page:
+                next_page: Optional[Future] = None
+                # a short page is the last one
+                if len(page) >= page_size:
+                    next_page = executor.submit(self.get_cards_page, board_id, min(card.id for card in page),
+                                                since, page_size, card_filter)
+                yield from page
+                page = next_page.result() if next_page is not None else []
+
+    def _find_label(self, board_id: str,
+                    label_name: str) -> Optional[dict[str, str]]:
+        """
+        Looks for a label created by a failed attempt of create_label.
+
+        :return: (dict or None) The label, if it exists.
+        """
+        labels = self.call_api(RequestType.GET,
+                               self.board_labels.format(board_id),
+                               {**self.query, "fields": LABEL_FIELDS})
+
+        return next((label for label in labels if label["name"] == label_name), None)
+
+    def _find_created_card(self, board_list_id: str,
+                           card_name: str,
+                           card_description: str,
+                           since: float) -> Optional[dict[str, str]]:
+        """
+        Looks for a card created by a failed attempt of create_card: a card of the list with the same name and
+        description, created after the first attempt started, and not already returned by create_card to another
+        caller, such as a concurrent row with the same fields. The card found is claimed, so that it is returned once.
+
+        :return: (dict or None) The card, if it exists.
+        """
+        cards = self.call_api(RequestType.GET,
+                              self.list_cards_url.format(board_list_id),
+                              {**self.query, "fields": "id,url,name,desc"})
+
+        # ids only hold the creation time in whole seconds
+        candidates = [card for card in cards
+                      if card["name"] == card_name and card["desc"] == card_description
+                      and object_created_at(card["id"]) >= int(since)]
+
+        return next((card for card in candidates if self._claim_card(card["id"])), None)
+
+    def _claim_card(self, card_id: str) -> bool:
+        """
+        Records a card as returned by create_card.
 
-        labels = self.call_api(RequestType.GET, self.board_labels.format(board_id), self.query)
+        :return: (bool) Whether it was not returned before.
+        """
+        with self._returned_cards_lock:
+            if card_id in self._returned_cards:
+                return False
+            self._returned_cards.add(card_id)
+            return True
+
+    def _find_created_comment(self, card_id: str,
+                              comment: str,
+                              since: float) -> Optional[dict[str, str]]:
+        """
+        Looks for a comment created by a failed attempt of create_card_comment: a comment of the card with the same
+        text, created after the first attempt started.
 
-        for board_label in labels:
-            if board_label["name"] == label_name:
-                found_label = {'id': board_label['id'], 'name': board_label['name']}
-                return LabelInfo.from_dict(found_label)
+        :return: (dict or None) The comment action, if it exists.
+        """
+        actions = self.call_api(RequestType.GET,
+                                self.card_actions_url.format(card_id),
+                                {**self.query, "filter": "commentCard", "fields": "data"})
 
-        raise LabelNotFoundException(label_name)
+        return next((action for action in actions
+                     if action["data"].get("text") == comment
+                     and object_created_at(action["id"]) >= since - CLOCK_SKEW), None)
 
+    @instrumented
+    @deadline_bound
     def create_label(self, board_id: str,
                      label_name: str) -> LabelInfo:
         """
@@ -191,16 +637,75 @@ class TrelloAPI:
 
         response = self.call_api(RequestType.POST,
                                  self.create_label_url.format(board_id),
-                                 {**self.query, **additional_params})
+                                 {**self.query, **additional_params},
+                                 find_existing=lambda: self._find_label(board_id, label_name))
 
         new_label = LabelInfo.from_dict(response)
+        self._remember_label(board_id, new_label)
 
         return new_label
 
+    def _remember_label(self, board_id: str,
+                        label: LabelInfo) -> None:
+        """
+        Adds a label missing from the cache and the board mirror, so that the next lookups find it.
+        """
+        if self.cache is not None:
+            self.cache.set_labels(board_id, [label])
+
+        if board_id in self.mirrors:
+            self.mirrors[board_id].add_label(label)
+
+    @deadline_bound
+    def get_or_create_label(self, board_id: str,
+                            label_name: str,
+                            missing: bool = False) -> tuple[LabelInfo, bool]:
+        """
+        Gets the label from the board, creating it if it does not exist. Concurrent calls for the same board and label
+        are coalesced: only the first one makes requests, the others wait for and share its result. When
+        label_lock_dir is set, the creation also holds a lock file there and looks for the label again first, so that
+        processes sharing the directory do not create the same label twice.
+
+        :raises APIRequestException: raised when any call to Trello fails.
+
+        :param board_id: (str) id of the board to search the label or create the new one
+        :param label_name: (str) name of the label.
+        :param missing: (bool) the caller already found the label missing, e.g. in a BoardSnapshot, so it is not
+            looked up before creating it, other than under the lock file.
+
+        :return: (tuple[LabelInfo, bool]) The label and whether it was created.
+        """
+        return self._label_flights.do((board_id, label_name),
+                                      lambda: self._get_or_create_label(board_id, label_name, missing))
+
+    def _get_or_create_label(self, board_id: str,
+                             label_name: str,
+                             missing: bool) -> tuple[LabelInfo, bool]:
+        if not missing:
+            try:
+                return self.get_label_from_board(board_id, label_name), False
+            except LabelNotFoundException:
+                pass
+
+        if self.label_lock_dir is None:
+            return self.create_label(board_id, label_name), True
+
+        with FileLock.for_key(self.label_lock_dir, "label", board_id, label_name):
+            # another process may have created it while waiting for the lock
+            existing = self._find_label(board_id, label_name)
+            if existing is not None:
+                label = LabelInfo.from_dict(existing)
+                self._remember_label(board_id, label)
+                return label, False
+            return self.create_label(board_id, label_name), True
+
+    @instrumented
+    @deadline_bound
     def create_card(self, board_list_id: str,
                     label_id: str,
                     card_name: str,
-                    card_description: str) -> CardInfo:
+                    card_description: str,
+                    since: Optional[float] = None) -> CardInfo:
         """
         Creates a new card in the list id provided with name and description and applies the given label to it.
 
@@ -210,24 +715,128 @@ class TrelloAPI:
         :param label_id: (str) ID of the label to be applied to the card
         :param card_name: (str) Card's title.
         :param card_description: (str) Card's description
+        :param since: (float) when resuming a creation that may have succeeded in an earlier process, the time its
+            first attempt started. A matching card created since then is returned instead of creating a new one.
 
         :return: (CardInfo) New card dataclass.
         """
+        if since is not None:
+            existing = self._find_created_card(board_list_id, card_name, card_description, since)
+            if existing is not None:
+                return CardInfo.from_dict(existing)
+
         additional_params = {"idList": board_list_id,
                              "name": card_name,
                              "idLabels": label_id,
-                             "desc": card_description}
+                             "desc": card_description,
+                             "fields": CARD_FIELDS}
 
+        started = time.time()
         response = self.call_api(RequestType.POST,
                                  self.cards_url,
-                                 {**self.query, **additional_params})
+                                 {**self.query, **additional_params},
+                                 find_existing=lambda: self._find_created_card(board_list_id, card_name,
+                                                                               card_description, started))
 
         new_card = CardInfo.from_dict(response)
+        new_card.retries = self.last_retries
+        self._claim_card(new_card.id)
 
         return new_card
 
+    @instrumented
+    @deadline_bound
+    def update_card(self, card_id: str,
+                    changes: dict[str, str]) -> CardInfo:
+        """
+        Updates the given fields of a card.
+
+        See: https://developer.atlassian.com/cloud/trello/rest/api-group-cards/#api-cards-id-put
+
+        :param card_id: (str) ID of the card.
+        :param changes: (dict) new values by Trello field name, e.g. {"desc": "New description"}.
+
+        :return: (CardInfo) Updated card dataclass.
+        """
+        response = self.call_api(RequestType.PUT,
+                                 self.card_url.format(card_id),
+                                 {**self.query, **changes, "fields": CARD_FIELDS})
+
+        return CardInfo.from_dict(response)
+
+    def card_index(self, board_list_id: str,
+                   key: Optional[Callable[[dict], str]] = None) -> "CardIndex":
+        """
+        Returns the index of the cards of a list used by upsert_card(), shared by every call with the same list and key.
+
+        :param board_list_id: (str) ID of the list.
+        :param key: (Callable) function computing the key of a card from its fields, its name if not provided.
+
+        :return: (CardIndex) The card index.
+        """
+        from .card_index import CardIndex, card_name_key  # pylint: disable=import-outside-toplevel
+
+        with self._card_indexes_lock:
+            index = self._card_indexes.get((board_list_id, key))
+            if index is None:
+                index = self._card_indexes[(board_list_id, key)] = CardIndex(self, board_list_id, key or card_name_key)
+            return index
+
+    @deadline_bound
+    def upsert_card(self, board_list_id: str,
+                    label_id: str,
+                    card_name: str,
+                    card_description: str,
+                    on_match: str = "skip",
+                    key: Optional[Callable[[dict], str]] = None) -> tuple[CardInfo, str]:
+        """
+        Creates the card unless the list already has a card with the same key, in which case it is skipped or, with
+        on_match='update', its description and label are updated when they differ. The cards of the list are fetched
+        once, in a single request, for every upsert on the same list and key.
+
+        :param board_list_id: (str) ID of the list that the card will be created on.
+        :param label_id: (str) ID of the label to be applied to the card
+        :param card_name: (str) Card's title.
+        :param card_description: (str) Card's description
+        :param on_match: (str) 'skip' or 'update' the existing card.
+        :param key: (Callable) function computing the key of a card from its name and desc fields, its name if not
+            provided.
+
+        :return: (tuple[CardInfo, str]) The card and what was done: 'created', 'updated' or 'unchanged'.
+        """
+        if on_match not in ("skip", "update"):
+            raise ValueError(f"Unsupported on_match: {on_match}")
+
+        index = self.card_index(board_list_id, key)
+        card_key = index.key({"name": card_name, "desc": card_description})
+
+        with index.lock(card_key):
+            existing = index.get(card_key)
+            if existing is None:
+                card = self.create_card(board_list_id, label_id, card_name, card_description)
+                index.add({"id": card.id, "url": card.url, "name": card_name, "desc": card_description,
+                           "idLabels": [label_id] if label_id else []})
+                return card, "created"
+
+            changes = {}
+            if on_match == "update":
+                if existing["desc"] != card_description:
+                    changes["desc"] = card_description
+                if label_id and label_id not in existing["idLabels"]:
+                    changes["idLabels"] = ",".join([*existing["idLabels"], label_id])
+            if not changes:
+                return CardInfo.from_dict(existing), "unchanged"
+
+            card = self.update_card(existing["id"], changes)
+            index.add({**existing, "desc": card_description,
+                       "idLabels": changes["idLabels"].split(",") if "idLabels" in changes else existing["idLabels"]})
+            return card, "updated"
+
+    @instrumented
+    @deadline_bound
     def create_card_comment(self, card_id: str,
-                            comment: str) -> str:
+                            comment: str,
+                            since: Optional[float] = None) -> str:
         """
         Creates a new comment in the provided card_id.
 
@@ -235,14 +844,96 @@ class TrelloAPI:
 
         :param card_id: (str) ID of the card to create the comment on.
         :param comment: (str) text of the comment to be created
+        :param since: (float) when resuming a creation that may have succeeded in an earlier process, the time its
+            first attempt started. A matching comment created since then is returned instead of creating a new one.
 
         :return: (str) New comment's ID
         """
+        if since is not None:
+            existing = self._find_created_comment(card_id, comment, since)
+            if existing is not None:
+                return existing["id"]
 
         additional_params = {'text': comment}
 
+        started = time.time()
         response = self.call_api(RequestType.POST,
                                  self.add_comment_url.format(card_id),
-                                 {**self.query, **additional_params})
+                                 {**self.query, **additional_params},
+                                 find_existing=lambda: self._find_created_comment(card_id, comment, started))
 
         return response['id']
+
+    def _find_created_attachment(self, card_id: str,
+                                 attachment: Attachment,
+                                 since: float) -> Optional[dict]:
+        """
+        Looks for an attachment uploaded by a failed attempt of add_attachment: an attachment of the card with the same
+        name and size, created after the first attempt started.
+
+        :return: (dict or None) The attachment, if it exists.
+        """
+        attachments = self.call_api(RequestType.GET,
+                                    self.card_attachments_url.format(card_id),
+                                    {**self.query, "fields": ATTACHMENT_FIELDS})
+
+        return next((existing for existing in attachments
+                     if existing["name"] == attachment.name and existing["bytes"] == attachment.size
+                     and object_created_at(existing["id"]) >= since - CLOCK_SKEW), None)
+
+    @instrumented
+    @deadline_bound
+    def add_attachment(self, card_id: str,
+                       attachment: Union[Attachment, str, "Path"],
+                       progress: Optional[ProgressCallback] = None) -> AttachmentInfo:
+        """
+        Uploads a file as an attachment of the card. The multipart body is streamed from disk a chunk at a time, so
+        memory use does not depend on the size of the file.
+
+        See: https://developer.atlassian.com/cloud/trello/rest/api-group-cards/#api-cards-id-attachments-post
+
+        :param card_id: (str) ID of the card to attach the file to.
+        :param attachment: (Attachment, str or Path) the file, or its path.
+        :param progress: (Callable) called with the attachment and the number of its bytes sent after each chunk.
+
+        :return: (AttachmentInfo) New attachment dataclass.
+        """
+        if not isinstance(attachment, Attachment):
+            attachment = Attachment.from_path(attachment)
+
+        upload = MultipartUpload({**self.query, "name": attachment.name, "mimeType": attachment.mime_type},
+                                 attachment, progress)
+
+        started = time.time()
+        response = self.call_api(RequestType.POST,
+                                 self.card_attachments_url.format(card_id),
+                                 upload,
+                                 find_existing=lambda: self._find_created_attachment(card_id, attachment, started))
+
+        return AttachmentInfo.from_dict(response)
+
+    def add_attachments(self, card_id: str,
+                        attachments: list[Union[Attachment, str, "Path"]],
+                        concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+                        progress: Optional[ProgressCallback] = None) -> list[AttachmentInfo]:
+        """
+        Uploads several files to the card at the same time, with add_attachment(). Each upload has its own
+        operation_deadline.
+
+        :raises APIRequestException: raised, once every upload is done, with the first error.
+
+        :param card_id: (str) ID of the card to attach the files to.
+        :param attachments: (list) the files, or their paths.
+        :param concurrency: (int) number of files uploaded at the same time.
+        :param progress: (Callable) called with the attachment and the number of its bytes sent after each chunk.
+
+        :return: (list[AttachmentInfo]) New attachments, in the same order.
+        """
+        if len(attachments) <= 1 or concurrency <= 1:
+            return [self.add_attachment(card_id, attachment, progress) for attachment in attachments]
+
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(attachments)),
+                                thread_name_prefix="trello-upload") as executor:
+            futures = [executor.submit(self.add_attachment, card_id, attachment, progress)
+                       for attachment in attachments]
+        return [future.result() for future in futures]
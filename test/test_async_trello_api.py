@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from trello_cli.utils.async_trello_api import AsyncTrelloAPI
+from trello_cli.utils.trello_api import BoardInfo, LabelInfo, CardInfo, RequestType
+from trello_cli.utils.exceptions import *
+
+
+@pytest.fixture()
+def async_trello_api():
+    """Create AsyncTrelloAPI object"""
+    return AsyncTrelloAPI()
+
+
+def test_mock_async_get_board_data(mocker, async_trello_api) -> None:
+    """
+    Mocked test for the coroutine get_board_data from the AsyncTrelloAPI.
+    """
+    mocked_call_api_value = {'id': '423142342hbu3h421',
+                             'name': 'Canonical_test'}
+    mocker.patch('trello_cli.utils.async_trello_api.AsyncTrelloAPI.call_api',
+                 return_value=mocked_call_api_value)
+
+    actual_mock_response = asyncio.run(async_trello_api.get_board_data('https://trello.com/b/zQFa6vj2/canonicaltest'))
+
+    assert BoardInfo.from_dict(mocked_call_api_value) == actual_mock_response
+
+
+def test_mock_async_lookups(mocker, async_trello_api) -> None:
+    """
+    Mocked test for the coroutines get_desired_list_id and get_label_from_board from the AsyncTrelloAPI.
+    """
+    mocked_call_api_value = [{'id': '423142342hbu3h421', 'name': 'Column 1'},
+                             {'id': '34234h2ihbj4hu2n3', 'name': 'Custom Label'}]
+    mocker.patch('trello_cli.utils.async_trello_api.AsyncTrelloAPI.call_api',
+                 return_value=mocked_call_api_value)
+
+    assert '423142342hbu3h421' == asyncio.run(async_trello_api.get_desired_list_id('f542hb5564h5jn', 'Column 1'))
+    assert LabelInfo('34234h2ihbj4hu2n3', 'Custom Label') == asyncio.run(
+        async_trello_api.get_label_from_board('f542hb5564h5jn', 'Custom Label'))
+
+    with pytest.raises(ListNotFoundException):
+        asyncio.run(async_trello_api.get_desired_list_id('f542hb5564h5jn', 'Column 3'))
+    with pytest.raises(LabelNotFoundException):
+        asyncio.run(async_trello_api.get_label_from_board('f542hb5564h5jn', 'Custom Label 3'))
+
+
+def test_mock_async_create_card(mocker, async_trello_api) -> None:
+    """
+    Mocked test for the coroutines create_card and create_card_comment from the AsyncTrelloAPI.
+    """
+    mocked_call_api_value = {'id': '423142342hbu3h421',
+                             'url': 'https://trello.com/c/fasdfadf/new-card'}
+    mocker.patch('trello_cli.utils.async_trello_api.AsyncTrelloAPI.call_api',
+                 return_value=mocked_call_api_value)
+
+    async def create():
+        card = await async_trello_api.create_card('f43bn5j34b65j2k3', '7j5nbj6km4b64', 'New Card', 'Description')
+        comment_id = await async_trello_api.create_card_comment(card.id, 'This is a comment for the new card')
+        return card, comment_id
+
+    card, comment_id = asyncio.run(create())
+
+    assert CardInfo.from_dict(mocked_call_api_value) == card
+    assert '423142342hbu3h421' == comment_id
+
+
+def test_async_call_api_connection_error(async_trello_api) -> None:
+    """
+    Test that connection failures are raised as APIRequestException.
+    """
+    async def call():
+        async with async_trello_api:
+            await async_trello_api.call_api(RequestType.GET, 'http://127.0.0.1:9/1/boards/id', async_trello_api.query)
+
+    with pytest.raises(APIRequestException):
+        asyncio.run(call())
@@ -0,0 +1,146 @@
+import os
+import tracemalloc
+
+import pytest
+
+from benchmarks.stand_in_server import TrelloStandInServer, parse_multipart
+from trello_cli.trello_cli import main
+from trello_cli.utils.attachments import Attachment, MultipartUpload, UploadProgress
+from trello_cli.utils.exceptions import APIRequestException
+from trello_cli.utils.trello_api import RequestType, TrelloAPI
+from trello_cli.utils.transport import InMemoryTransport
+
+
+@pytest.fixture
+def transport():
+    """Create an InMemoryTransport with a single board and card"""
+    transport = InMemoryTransport()
+    board = transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",), label_names=("Bug",))
+    transport.trello.handle("POST", "/1/cards", {"idList": next(iter(board.lists)), "name": "Card"})
+    return transport
+
+
+def card_id(transport: InMemoryTransport) -> str:
+    return next(iter(transport.trello.cards))
+
+
+def test_multipart_upload_encoding(tmp_path) -> None:
+    """
+    Test that the streamed body is a valid multipart form with the fields and the file, of the announced length.
+    """
+    path = tmp_path / "build.txt"
+    path.write_bytes(os.urandom(1000) + b"\r\n--")
+    upload = MultipartUpload({"name": "build.txt", "mimeType": "text/plain"}, Attachment.from_path(path))
+
+    with upload.open() as body:
+        chunks = list(body)
+        assert sum(map(len, chunks)) == len(body)
+
+    assert parse_multipart(upload.content_type, b"".join(chunks)) == {"name": "build.txt", "mimeType": "text/plain",
+                                                                       "bytes": "1004"}
+    assert Attachment.from_path(path).mime_type == "text/plain"
+
+
+def test_add_attachment_memory_stays_flat(tmp_path, transport) -> None:
+    """
+    Test that uploading a large file does not load it in memory, and that the progress reaches its size.
+    """
+    path = tmp_path / "artifact.bin"
+    with path.open("wb") as file:
+        file.truncate(32 * 1024 * 1024)
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    progress = []
+
+    tracemalloc.start()
+    try:
+        attachment = trello.add_attachment(card_id(transport), path, progress=lambda _, sent: progress.append(sent))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 4 * 1024 * 1024
+    assert (attachment.name, attachment.bytes) == ("artifact.bin", 32 * 1024 * 1024)
+    assert progress[-1] == 32 * 1024 * 1024
+
+
+def test_add_attachments_concurrently(tmp_path, transport) -> None:
+    """
+    Test that several files are uploaded, returned in order, with their progress reported.
+    """
+    paths = []
+    for index in range(3):
+        paths.append(tmp_path / f"file{index}.txt")
+        paths[-1].write_bytes(b"x" * 1000 * (index + 1))
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    output = []
+
+    class Stream:
+        write = output.append
+
+    attachments = trello.add_attachments(card_id(transport), paths, progress=UploadProgress(Stream()))
+
+    assert [(attachment.name, attachment.bytes) for attachment in attachments] \
+        == [("file0.txt", 1000), ("file1.txt", 2000), ("file2.txt", 3000)]
+    assert len(transport.trello.attachments[card_id(transport)]) == 3
+    assert sorted(output) == [f"[UPLOAD] file{index}.txt: 100% of {1000 * (index + 1)} bytes\n" for index in range(3)]
+
+
+def test_add_attachment_retry_does_not_duplicate(mocker, tmp_path, transport) -> None:
+    """
+    Test that an upload whose response was lost finds the attachment it created instead of uploading it again.
+    """
+    path = tmp_path / "build.log"
+    path.write_bytes(b"log")
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    original_send = transport.send
+
+    def lost_response(request_type, endpoint, payload, timeout=None):
+        response = original_send(request_type, endpoint, payload, timeout)
+        if request_type == RequestType.POST:
+            raise APIRequestException("connection reset")
+        return response
+
+    mocker.patch.object(transport, "send", side_effect=lost_response)
+    mocker.patch("trello_cli.utils.retry.random.uniform", return_value=0)
+
+    attachment = trello.add_attachment(card_id(transport), path)
+    assert attachment.name == "build.log"
+    assert len(transport.trello.attachments[card_id(transport)]) == 1
+
+
+def test_add_attachment_over_http(tmp_path) -> None:
+    """
+    Test that the HTTP transport streams the multipart body to a server.
+    """
+    path = tmp_path / "artifact.bin"
+    path.write_bytes(os.urandom(3 * 1024 * 1024 + 7))
+
+    with TrelloStandInServer() as server:
+        board = server.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",))
+        server.trello.handle("POST", "/1/cards", {"idList": next(iter(board.lists)), "name": "Card"})
+        with TrelloAPI(rate_limit=False, api_url=server.api_url) as trello:
+            attachment = trello.add_attachment(next(iter(server.trello.cards)), path)
+
+    assert attachment.bytes == 3 * 1024 * 1024 + 7
+
+
+def test_trello_cli_attach(mocker, tmp_path, transport, capsys) -> None:
+    """
+    Test that the cli attaches the --attach files to the new card, and checks them before creating anything.
+    """
+    mocker.patch('trello_cli.utils.trello_api.TrelloAPI',
+                 side_effect=lambda **kwargs: TrelloAPI(rate_limit=False, transport=transport))
+    paths = [tmp_path / "a.log", tmp_path / "b.log"]
+    for path in paths:
+        path.write_text("log")
+    args = ["--board_url", "https://trello.com/b/bOaRd123/test-board", "--list_name", "TO DO", "--card_name", "New",
+            "--card_description", "Description", "--card_comment", "Comment", "--label_name", "Bug", "--no_cache"]
+
+    with pytest.raises(SystemExit):
+        main([*args, "--attach", str(tmp_path / "missing.log")])
+    assert len(transport.trello.cards) == 1
+
+    main([*args, "--attach", str(paths[0]), "--attach", str(paths[1])])
+    new_card = list(transport.trello.cards)[-1]
+    assert sorted(attachment["name"] for attachment in transport.trello.attachments[new_card]) == ["a.log", "b.log"]
+    assert "[FINISH] 2 file(s) attached." in capsys.readouterr().out
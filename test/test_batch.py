@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from trello_cli.utils.trello_api import LabelInfo, RequestType
+from trello_cli.utils.exceptions import *
+
+BOARD_LISTS = [{'id': '423142342hbu3h421', 'name': 'Column 1'}]
+BOARD_LABELS = [{'id': '7j5nbj6km4b64', 'name': 'Custom Label'}]
+
+
+def mocked_batch_api(mocker, trello_api):
+    """Mocks call_api answering each batched route with its board lists, labels or a not found error"""
+
+    def call_api(request_type, endpoint, payload):
+        assert request_type == RequestType.GET and endpoint == trello_api.batch_url
+        responses = []
+        for route in payload['urls'].split(','):
+            if route.startswith('/boards/missing'):
+                responses.append({'name': 'NotFound', 'message': 'The requested resource was not found.',
+                                  'statusCode': 404})
+            else:
+                responses.append({'200': BOARD_LISTS if '/lists' in route else BOARD_LABELS})
+        return responses
+
+    return mocker.patch('trello_cli.utils.trello_api.TrelloAPI.call_api', side_effect=call_api)
+
+
+def test_mock_batch_lookups(mocker, trello_api) -> None:
+    """
+    Test that lookups made in a batch block are sent in a single request and fanned out to their futures.
+    """
+    mocked_call_api = mocked_batch_api(mocker, trello_api)
+
+    with trello_api.batch() as batch:
+        list_id = batch.get_desired_list_id('f542hb5564h5jn', 'Column 1')
+        label = batch.get_label_from_board('f542hb5564h5jn', 'Custom Label')
+        missing_label = batch.get_label_from_board('f542hb5564h5jn', 'Custom Label 2')
+        missing_board = batch.get_desired_list_id('missing', 'Column 1')
+        assert mocked_call_api.call_count == 0
+
+    assert mocked_call_api.call_count == 1
+    assert mocked_call_api.call_args[0][2]['urls'] == ('/boards/f542hb5564h5jn/lists?fields=id%2Cname,'
+                                                       '/boards/f542hb5564h5jn/labels?fields=id%2Cname,'
+                                                       '/boards/missing/lists?fields=id%2Cname')
+    assert list_id.result() == '423142342hbu3h421'
+    assert label.result() == LabelInfo('7j5nbj6km4b64', 'Custom Label')
+    with pytest.raises(LabelNotFoundException):
+        missing_label.result()
+    with pytest.raises(APIRequestException) as error:
+        missing_board.result()
+    assert error.value.status_code == 404
+
+
+def test_mock_batch_size_and_window(mocker, trello_api) -> None:
+    """
+    Test that batches are sent every 10 routes and after the window when one is given.
+    """
+    mocked_call_api = mocked_batch_api(mocker, trello_api)
+
+    batch = trello_api.batch(window=0.05)
+    futures = [batch.get_desired_list_id(f'board{index}', 'Column 1') for index in range(11)]
+    assert mocked_call_api.call_count == 1
+
+    deadline = time.monotonic() + 2
+    while not futures[-1].done() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert mocked_call_api.call_count == 2
+    assert all(future.result() == '423142342hbu3h421' for future in futures)
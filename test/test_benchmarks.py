@@ -0,0 +1,46 @@
+from benchmarks import decode
+from benchmarks.run_benchmarks import BOARD_SHORT_LINK, bulk_scenario, compare, single_card_scenario
+from benchmarks.stand_in_server import TrelloStandInServer
+
+
+def test_benchmark_scenarios_run_against_stand_in(monkeypatch) -> None:
+    """
+    Test that the single card and bulk scenarios create their cards and comments on the stand-in server, without any
+    credentials in the environment.
+    """
+    monkeypatch.delenv("TRELLO_API_KEY", raising=False)
+    monkeypatch.delenv("TRELLO_API_TOKEN", raising=False)
+    with TrelloStandInServer() as server:
+        server.trello.add_board("Benchmark", BOARD_SHORT_LINK, list_names=("TO DO",), label_names=("Benchmark",))
+
+        single = single_card_scenario(server, 2)
+        bulk = bulk_scenario(server, 5, concurrency=2)
+
+    assert (single.cards, single.errors) == (2, 0)
+    assert (bulk.scenario, bulk.cards, bulk.errors) == ("bulk_c2", 5, 0)
+    assert len(server.trello.cards) == 7
+    assert all(len(comments) == 1 for comments in server.trello.comments.values())
+
+
+def test_compare_reports_regressions() -> None:
+    """
+    Test that a throughput below the baseline, beyond the tolerance, is reported as a regression.
+    """
+    with TrelloStandInServer() as server:
+        server.trello.add_board("Benchmark", BOARD_SHORT_LINK, list_names=("TO DO",), label_names=("Benchmark",))
+        result = bulk_scenario(server, 2, concurrency=1)
+
+    baseline = {result.scenario: {"cards_per_second": result.cards_per_second * 2, "p95_ms": result.p95_ms}}
+
+    assert compare([result], baseline, 0.1) == [f"{result.scenario}: {result.cards_per_second} cards/s, baseline "
+                                                f"{result.cards_per_second * 2}"]
+
+
+def test_decode_benchmark_models_are_smaller() -> None:
+    """
+    Test that the compact models hold less memory than the generic dicts decoded from the same cards.
+    """
+    results = {result.path: result for result in decode.run(200, runs=1)}
+
+    assert results["models (json)"].retained_kb < results["dicts (json)"].retained_kb
+    assert all(result.cards == 200 for result in results.values())
@@ -0,0 +1,71 @@
+import pytest
+
+from trello_cli.utils.board_cache import BoardCache, default_cache_path
+from trello_cli.utils.trello_api import BoardInfo, LabelInfo, TrelloAPI
+from trello_cli.utils.exceptions import *
+
+
+@pytest.fixture()
+def board_cache(tmp_path):
+    """Create a BoardCache stored in a temporary directory"""
+    board_cache = BoardCache(tmp_path / "board_cache.sqlite")
+    yield board_cache
+    board_cache.close()
+
+
+def test_default_cache_path(monkeypatch, tmp_path) -> None:
+    """
+    Test that the default cache file is placed under XDG_CACHE_HOME.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert default_cache_path() == tmp_path / "trello_cli" / "board_cache.sqlite"
+
+
+def test_board_cache_entries(board_cache) -> None:
+    """
+    Test storing, expiring and invalidating the cached board, list and label entries.
+    """
+    board_cache.set_board('https://trello.com/b/zQFa6vj2/canonicaltest', BoardInfo('f542hb5564h5jn', 'Canonical_test'))
+    board_cache.set_list_ids('f542hb5564h5jn', {'Column 1': '423142342hbu3h421'})
+    board_cache.set_labels('f542hb5564h5jn', [LabelInfo('7j5nbj6km4b64', 'Custom Label')])
+
+    assert board_cache.get_board('https://trello.com/b/zQFa6vj2/canonicaltest') == BoardInfo('f542hb5564h5jn',
+                                                                                             'Canonical_test')
+    assert board_cache.get_list_id('f542hb5564h5jn', 'Column 1') == '423142342hbu3h421'
+    assert board_cache.get_list_id('f542hb5564h5jn', 'Column 2') is None
+    assert board_cache.get_label('f542hb5564h5jn', 'Custom Label') == LabelInfo('7j5nbj6km4b64', 'Custom Label')
+
+    # expired entries are ignored
+    board_cache.ttl = -1
+    assert board_cache.get_list_id('f542hb5564h5jn', 'Column 1') is None
+    board_cache.ttl = 60
+
+    board_cache.invalidate_board_url('https://trello.com/b/zQFa6vj2/canonicaltest')
+    assert board_cache.get_board('https://trello.com/b/zQFa6vj2/canonicaltest') is None
+    assert board_cache.get_list_id('f542hb5564h5jn', 'Column 1') is None
+    assert board_cache.get_label('f542hb5564h5jn', 'Custom Label') is None
+
+
+def test_mock_trello_api_with_cache(mocker, board_cache) -> None:
+    """
+    Mocked test checking that TrelloAPI lookups are served from the cache once resolved, that a missing name refreshes
+    the cached entries and that created labels are written back to the cache.
+    """
+    trello_api = TrelloAPI(cache=board_cache)
+    mocked_call_api = mocker.patch('trello_cli.utils.trello_api.TrelloAPI.call_api',
+                                   return_value=[{'id': '423142342hbu3h421', 'name': 'Column 1'}])
+
+    assert trello_api.get_desired_list_id('f542hb5564h5jn', 'Column 1') == '423142342hbu3h421'
+    assert trello_api.get_desired_list_id('f542hb5564h5jn', 'Column 1') == '423142342hbu3h421'
+    assert mocked_call_api.call_count == 1
+
+    with pytest.raises(ListNotFoundException):
+        trello_api.get_desired_list_id('f542hb5564h5jn', 'Column 2')
+    assert mocked_call_api.call_count == 2
+
+    mocked_call_api.return_value = {'id': '7j5nbj6km4b64', 'name': 'Custom Label'}
+    trello_api.create_label('f542hb5564h5jn', 'Custom Label')
+    assert trello_api.get_label_from_board('f542hb5564h5jn', 'Custom Label') == LabelInfo('7j5nbj6km4b64',
+                                                                                          'Custom Label')
+    assert mocked_call_api.call_count == 3
@@ -0,0 +1,126 @@
+import pytest
+
+from trello_cli.utils.board_mirror import ACTIONS_PAGE_LIMIT, BoardMirror
+from trello_cli.utils.trello_api import TrelloAPI
+from trello_cli.utils.transport import InMemoryTransport
+from trello_cli.utils.exceptions import *
+
+
+@pytest.fixture
+def transport():
+    """Create an InMemoryTransport with a single board"""
+    transport = InMemoryTransport()
+    transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO", "DONE"), label_names=("Bug",))
+    return transport
+
+
+@pytest.fixture
+def board(transport):
+    """The board of the transport"""
+    return next(iter(transport.trello.boards.values()))
+
+
+def test_full_sync(tmp_path, transport, board) -> None:
+    """
+    Test that the first sync mirrors the lists, labels and cards of the board.
+    """
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    to_do, done = board.lists
+    card = trello.create_card(to_do, "", "Card", "Description")
+
+    mirror = BoardMirror(trello, "bOaRd123", tmp_path / "mirror.sqlite")
+    assert mirror.sync() == -1
+
+    assert mirror.board.id == board.id
+    assert mirror.get_list_id("DONE") == done
+    assert mirror.get_label("Bug").name == "Bug"
+    assert [(mirrored.id, mirrored.name, mirrored.desc) for mirrored in mirror.get_cards(to_do)] \
+        == [(card.id, "Card", "Description")]
+    assert mirror.get_cards(done) == []
+    with pytest.raises(ListNotFoundException):
+        mirror.get_list_id("DOING")
+
+
+def test_incremental_sync(mocker, tmp_path, transport, board) -> None:
+    """
+    Test that later syncs apply the board actions with a single request, whatever the size of the board.
+    """
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    to_do, done = board.lists
+    for index in range(20):
+        trello.create_card(to_do, "", f"Card {index}", "")
+    mirror = BoardMirror(trello, "bOaRd123", tmp_path / "mirror.sqlite")
+    mirror.sync()
+
+    new_card = trello.create_card(done, "", "New card", "")
+    transport.trello.update_card(new_card.id, name="Renamed card")
+    transport.trello.update_card(next(iter(transport.trello.cards)), idList=done, closed=True)
+    doing = transport.trello.add_list(board, "DOING")
+    trello.create_label(board.id, "Feature")
+
+    send = mocker.spy(transport, "send")
+    assert mirror.sync() == 5
+    assert send.call_count == 1
+
+    assert [card.name for card in mirror.get_cards(done)] == ["Renamed card"]
+    assert [card.name for card in mirror.get_cards(done, include_closed=True)] == ["Card 0", "Renamed card"]
+    assert len(mirror.get_cards(to_do)) == 19
+    assert mirror.get_list_id("DOING") == doing
+    assert mirror.get_label("Feature").name == "Feature"
+
+    assert mirror.sync() == 0
+
+
+def test_full_page_falls_back_to_full_sync(mocker, tmp_path, transport, board) -> None:
+    """
+    Test that a sync receiving a full page of actions downloads the board again instead of missing changes.
+    """
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    mirror = BoardMirror(trello, "bOaRd123", tmp_path / "mirror.sqlite")
+    mirror.sync()
+
+    mocker.patch("trello_cli.utils.board_mirror.ACTIONS_PAGE_LIMIT", 2)
+    for index in range(3):
+        trello.create_card(next(iter(board.lists)), "", f"Card {index}", "")
+    assert ACTIONS_PAGE_LIMIT == 1000
+    assert mirror.sync() == -1
+    assert len(mirror.get_cards()) == 3
+
+
+def test_mirror_persists(mocker, tmp_path, transport, board) -> None:
+    """
+    Test that a reopened mirror serves its data without requests until it is stale, then only fetches the new actions.
+    """
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    BoardMirror(trello, "bOaRd123", tmp_path / "mirror.sqlite").sync()
+    transport.trello.add_list(board, "DOING")
+
+    send = mocker.spy(transport, "send")
+    reopened = BoardMirror(trello, "bOaRd123", tmp_path / "mirror.sqlite")
+    assert reopened.get_list_id("TO DO") == next(iter(board.lists))
+    assert send.call_count == 0
+    with pytest.raises(ListNotFoundException):
+        reopened.get_list_id("DOING")
+
+    reopened.max_staleness = 0
+    assert reopened.get_list_id("DOING")
+    assert send.call_count == 1
+
+
+def test_trello_api_uses_mirror(mocker, tmp_path, transport, board) -> None:
+    """
+    Test that the lookups of a mirrored board are answered by the mirror, and that new labels are added to it.
+    """
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    mirror = trello.mirror_board("bOaRd123", tmp_path / "mirror.sqlite")
+    assert trello.mirrors == {"bOaRd123": mirror, board.id: mirror}
+
+    send = mocker.spy(transport, "send")
+    assert trello.get_desired_list_id(board.id, "TO DO") == next(iter(board.lists))
+    assert trello.get_label_from_board(board.id, "Bug").name == "Bug"
+    assert trello.get_board_snapshot("bOaRd123", normalize=True).get_list_id("done") == list(board.lists)[1]
+    assert send.call_count == 0
+
+    label = trello.create_label(board.id, "Feature")
+    assert trello.get_label_from_board(board.id, "Feature") == label
+    assert send.call_count == 1
@@ -0,0 +1,105 @@
+import io
+import json
+
+from trello_cli.utils.bulk import BulkCardCreator, CardSpec, read_card_specs
+from trello_cli.utils.exceptions import APIRequestException
+from trello_cli.utils.trello_api import BoardInfo, BoardSnapshot, CardInfo, LabelInfo
+
+CSV_INPUT = """board_url,list_name,card_name,card_description,card_comment,label_name
+https://trello.com/b/zQFa6vj2/canonicaltest,Column 1,Card 1,Description 1,Comment 1,Custom Label
+https://trello.com/b/zQFa6vj2/canonicaltest,Column 1,Card 2,Description 2,Comment 2,Custom Label
+https://trello.com/b/zQFa6vj2/canonicaltest,Column 3,Card 3,Description 3,Comment 3,Custom Label
+"""
+
+
+def mocked_trello(mocker):
+    """Creates a mocked TrelloAPI where only the list 'Column 1' exists and no label exists"""
+    trello = mocker.Mock()
+    trello.get_board_data.return_value = BoardInfo('f542hb5564h5jn', 'Canonical_test')
+    trello.get_board_snapshot.return_value = BoardSnapshot.from_dict({'id': 'f542hb5564h5jn',
+                                                                      'name': 'Canonical_test',
+                                                                      'lists': [{'id': 'f43bn5j34b65j2k3',
+                                                                                 'name': 'Column 1'}],
+                                                                      'labels': []})
+    trello.get_or_create_label.return_value = (LabelInfo('7j5nbj6km4b64', 'Custom Label'), True)
+    trello.create_card.side_effect = lambda list_id, label_id, name, desc: CardInfo(name, f'https://trello.com/c/{name}')
+    trello.create_card_comment.return_value = '423142342hbu3h421'
+    trello.last_retries = 0
+    return trello
+
+
+def test_read_card_specs() -> None:
+    """
+    Test that CSV and JSON Lines inputs are streamed as CardSpec, and that invalid rows are yielded as errors.
+    """
+    csv_specs = list(read_card_specs(io.StringIO(CSV_INPUT), 'csv'))
+    assert len(csv_specs) == 3
+    assert csv_specs[0] == CardSpec('https://trello.com/b/zQFa6vj2/canonicaltest', 'Column 1', 'Card 1',
+                                    'Description 1', 'Comment 1', 'Custom Label')
+
+    jsonl_input = json.dumps({'board_url': 'https://trello.com/b/zQFa6vj2/canonicaltest', 'list_name': 'Column 1',
+                              'card_name': 'Card 1', 'card_description': 'Description 1',
+                              'card_comment': 'Comment 1', 'label_name': 'Custom Label'}) + '\n\n{"card_name": "x"}\n'
+    jsonl_specs = list(read_card_specs(io.StringIO(jsonl_input + '{"card_name": \n[1, 2]\n' + jsonl_input), 'jsonl'))
+    assert len(jsonl_specs) == 6
+    assert jsonl_specs[0] == jsonl_specs[4] == csv_specs[0]
+    assert all(isinstance(spec, ValueError) for spec in jsonl_specs[1:4] + jsonl_specs[5:])
+
+
+def test_mock_bulk_card_creator(mocker) -> None:
+    """
+    Mocked test for the BulkCardCreator, checking that lookups are made once per distinct value and that a result
+    is written for each row.
+    """
+    trello = mocked_trello(mocker)
+    output = io.StringIO()
+
+    created, failed = BulkCardCreator(trello, concurrency=4).run(read_card_specs(io.StringIO(CSV_INPUT), 'csv'),
+                                                                  output)
+
+    assert (created, failed) == (2, 1)
+    trello.get_board_data.assert_called_once()
+    trello.get_board_snapshot.assert_called_once_with('f542hb5564h5jn')
+    trello.get_or_create_label.assert_called_once_with('f542hb5564h5jn', 'Custom Label', missing=True)
+    assert trello.create_card_comment.call_count == 2
+
+    results = sorted((json.loads(line) for line in output.getvalue().splitlines()), key=lambda r: r['row'])
+    assert results[0] == {'row': 1, 'card_id': 'Card 1', 'card_url': 'https://trello.com/c/Card 1', 'retries': 0}
+    assert results[2]['row'] == 3
+    assert 'Column 3' in results[2]['error']
+
+
+def test_bulk_card_creator_retries_transient_lookups(mocker) -> None:
+    """
+    Test that a transient failure resolving a board only fails its row, while a board not found is looked up once.
+    """
+    trello = mocked_trello(mocker)
+    board = trello.get_board_data.return_value
+    trello.get_board_data.side_effect = [APIRequestException('connection reset'), board]
+    creator = BulkCardCreator(trello, concurrency=1)
+    specs = list(read_card_specs(io.StringIO(CSV_INPUT), 'csv'))
+
+    assert creator.create(1, specs[0]).error is not None
+    assert creator.create(2, specs[1]).card_id == 'Card 2'
+    assert trello.get_board_data.call_count == 2
+
+    trello.get_board_data.side_effect = APIRequestException('not found', status_code=404)
+    missing = CardSpec('https://trello.com/b/missing/board', 'Column 1', 'Card', 'Description', 'Comment', 'Label')
+    assert creator.create(3, missing).error is not None
+    assert creator.create(4, missing).error is not None
+    assert trello.get_board_data.call_count == 3
+
+
+def test_bulk_card_creator_keeps_card_when_comment_fails(mocker) -> None:
+    """
+    Test that a row whose comment fails after its card was created reports both the card and the error.
+    """
+    trello = mocked_trello(mocker)
+    trello.create_card_comment.side_effect = APIRequestException('connection reset')
+    spec = next(read_card_specs(io.StringIO(CSV_INPUT), 'csv'))
+
+    result = BulkCardCreator(trello, concurrency=1).create(1, spec)
+
+    assert result.card_url == 'https://trello.com/c/Card 1'
+    assert 'connection reset' in result.error
+    trello.create_card.assert_called_once()
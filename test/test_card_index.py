@@ -0,0 +1,118 @@
+import io
+import json
+
+import pytest
+
+from trello_cli.trello_cli import main
+from trello_cli.utils.bulk import BulkCardCreator, read_card_specs
+from trello_cli.utils.trello_api import TrelloAPI
+from trello_cli.utils.transport import InMemoryTransport
+
+CARD_ARGS = ["--board_url", "https://trello.com/b/bOaRd123/test-board", "--list_name", "TO DO", "--card_name", "Card",
+             "--card_description", "Description", "--card_comment", "Comment", "--label_name", "Bug"]
+
+
+@pytest.fixture
+def transport():
+    """Create an InMemoryTransport with a single board"""
+    transport = InMemoryTransport()
+    transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",), label_names=("Bug", "Feature"))
+    return transport
+
+
+@pytest.fixture
+def board(transport):
+    """The board of the transport"""
+    return next(iter(transport.trello.boards.values()))
+
+
+def test_upsert_card(mocker, transport, board) -> None:
+    """
+    Test that upserts create missing cards, skip or update existing ones, and fetch each list only once.
+    """
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    list_id = next(iter(board.lists))
+    bug, feature = board.labels
+    existing = trello.create_card(list_id, bug, "Existing", "Old description")
+
+    send = mocker.spy(transport, "send")
+    assert trello.upsert_card(list_id, bug, "Existing", "New description")[1] == "unchanged"
+    card, action = trello.upsert_card(list_id, bug, "New", "Description")
+    assert action == "created"
+    assert trello.upsert_card(list_id, bug, "New", "Description") == (card, "unchanged")
+    assert send.call_count == 2
+
+    assert trello.upsert_card(list_id, feature, "Existing", "New description", on_match="update") \
+        == (existing, "updated")
+    assert transport.trello.cards[existing.id]["desc"] == "New description"
+    assert transport.trello.cards[existing.id]["idLabels"] == [bug, feature]
+    assert trello.upsert_card(list_id, feature, "Existing", "New description", on_match="update")[1] == "unchanged"
+    assert send.call_count == 3
+
+    with pytest.raises(ValueError):
+        trello.upsert_card(list_id, bug, "Existing", "", on_match="replace")
+
+
+def test_upsert_card_key(transport, board) -> None:
+    """
+    Test that a caller-defined key decides which cards are the same.
+    """
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    list_id = next(iter(board.lists))
+
+    def key(card):
+        return f"{card['name']}|{card['desc']}"
+
+    assert trello.upsert_card(list_id, "", "Card", "First", key=key)[1] == "created"
+    assert trello.upsert_card(list_id, "", "Card", "Second", key=key)[1] == "created"
+    assert trello.upsert_card(list_id, "", "Card", "Second", key=key)[1] == "unchanged"
+    assert trello.upsert_card(list_id, "", "Card", "Third")[1] == "unchanged"
+
+
+def test_bulk_upsert_rerun(mocker, transport) -> None:
+    """
+    Test that running the same bulk input again in upsert mode creates no card nor comment, with a few requests.
+    """
+    rows = "".join(json.dumps({"board_url": "https://trello.com/b/bOaRd123/test-board", "list_name": "TO DO",
+                               "card_name": f"Card {index % 40}", "card_description": "Description",
+                               "card_comment": "Comment", "label_name": "Bug"}) + "\n" for index in range(100))
+
+    with TrelloAPI(rate_limit=False, transport=transport) as trello:
+        assert BulkCardCreator(trello, upsert="skip").run(read_card_specs(io.StringIO(rows), "jsonl")) == (100, 0)
+    assert len(transport.trello.cards) == 40
+    assert sum(len(comments) for comments in transport.trello.comments.values()) == 40
+
+    send = mocker.spy(transport, "send")
+    output = io.StringIO()
+    with TrelloAPI(rate_limit=False, transport=transport) as trello:
+        BulkCardCreator(trello, upsert="skip").run(read_card_specs(io.StringIO(rows), "jsonl"), output)
+    assert len(transport.trello.cards) == 40
+    assert send.call_count == 3
+    assert {json.loads(line)["action"] for line in output.getvalue().splitlines()} == {"unchanged"}
+
+
+def test_trello_cli_upsert(mocker, transport, capsys) -> None:
+    """
+    Test that the single card cli does not create the card again with --upsert.
+    """
+    mocker.patch('trello_cli.utils.trello_api.TrelloAPI',
+                 side_effect=lambda **kwargs: TrelloAPI(rate_limit=False, transport=transport))
+
+    main(CARD_ARGS + ["--upsert", "--no_cache"])
+    assert "[FINISH] Comment created." in capsys.readouterr().out
+
+    main(CARD_ARGS + ["--upsert", "--no_cache"])
+    output = capsys.readouterr().out
+    assert "[CHECKPOINT] Card unchanged." in output
+    assert "[FINISH] Card already exists, comment not created." in output
+    assert len(transport.trello.cards) == 1
+
+
+def test_trello_cli_upsert_rejects_spool_and_serve(tmp_path) -> None:
+    """
+    Test that --upsert is refused with the modes that always create new cards, instead of being ignored.
+    """
+    for mode in (["--spool", "--spool_path", str(tmp_path / "spool.sqlite")], ["--flush"], ["--serve"]):
+        with pytest.raises(SystemExit):
+            main(CARD_ARGS + ["--upsert", *mode])
+    assert not (tmp_path / "spool.sqlite").exists()
@@ -0,0 +1,127 @@
+import json
+from collections import Counter
+
+import pytest
+
+from trello_cli.utils.authentication import TrelloCredentials, load_credentials_from_env
+from trello_cli.utils.credential_pool import CredentialPool
+from trello_cli.utils.rate_limit import RateLimiter, TokenBucket
+from trello_cli.utils.trello_api import TrelloAPI
+from trello_cli.utils.transport import InMemoryTransport, TransportResponse
+from trello_cli.utils.exceptions import *
+
+CREDENTIALS = [TrelloCredentials("key", f"token-{index}") for index in range(3)]
+
+
+class RejectingTransport(InMemoryTransport):
+    """InMemoryTransport answering with the given status the requests made with the rejected tokens"""
+
+    def __init__(self, rejected: dict[str, int]) -> None:
+        super().__init__()
+        self.rejected = rejected
+        self.tokens = Counter()
+
+    def send(self, request_type, endpoint, payload, timeout=None):
+        self.tokens[payload["token"]] += 1
+        if payload["token"] in self.rejected:
+            return TransportResponse(status_code=self.rejected[payload["token"]], url=endpoint)
+        return super().send(request_type, endpoint, payload, timeout)
+
+
+def test_load_credentials_from_env(monkeypatch, tmp_path) -> None:
+    """
+    Test reading the base, numbered and file credentials, without duplicates.
+    """
+    credentials_file = tmp_path / "credentials.json"
+    credentials_file.write_text(json.dumps([{"key": "file-key", "token": "file-token"},
+                                            {"key": "base-key", "token": "base-token"}]))
+    monkeypatch.setenv("TRELLO_API_KEY", "base-key")
+    monkeypatch.setenv("TRELLO_API_TOKEN", "base-token")
+    monkeypatch.setenv("TRELLO_API_TOKEN_2", "second-token")
+    monkeypatch.setenv("TRELLO_API_TOKEN_10", "tenth-token")
+    monkeypatch.setenv("TRELLO_API_KEY_10", "tenth-key")
+    monkeypatch.setenv("TRELLO_CREDENTIALS_FILE", str(credentials_file))
+
+    assert load_credentials_from_env() == [TrelloCredentials("base-key", "base-token"),
+                                           TrelloCredentials("base-key", "second-token"),
+                                           TrelloCredentials("tenth-key", "tenth-token"),
+                                           TrelloCredentials("file-key", "file-token")]
+
+    monkeypatch.delenv("TRELLO_API_KEY")
+    with pytest.raises(EnvVarException):
+        load_credentials_from_env()
+
+
+def test_trello_api_spreads_requests() -> None:
+    """
+    Test that the requests are spread evenly across the credentials of the pool.
+    """
+    transport = RejectingTransport({})
+    transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",))
+    trello = TrelloAPI(rate_limit=False, transport=transport, credentials=CREDENTIALS)
+
+    for _ in range(30):
+        trello.get_desired_list_id("bOaRd123", "TO DO")
+
+    assert transport.tokens == {"token-0": 10, "token-1": 10, "token-2": 10}
+
+
+def test_trello_api_drops_rejected_credentials() -> None:
+    """
+    Test that a request rejected with 401 or 429 is sent again with another credential, and that the rejected
+    credentials are left out of the next requests.
+    """
+    transport = RejectingTransport({"token-0": 401, "token-1": 429})
+    transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",))
+    trello = TrelloAPI(rate_limit=False, transport=transport, credentials=CREDENTIALS)
+
+    for _ in range(5):
+        trello.get_desired_list_id("bOaRd123", "TO DO")
+
+    assert transport.tokens == {"token-0": 1, "token-1": 1, "token-2": 5}
+
+    transport.rejected["token-2"] = 401
+    with pytest.raises(APIRequestException) as error:
+        trello.get_desired_list_id("bOaRd123", "TO DO")
+    assert error.value.status_code == 401
+
+
+def test_pool_prefers_credentials_with_budget() -> None:
+    """
+    Test that the pool picks the credential whose rate limiter lets it go first.
+    """
+    pool = CredentialPool(CREDENTIALS[:2])
+    for credential in pool.credentials:
+        credential.rate_limiter = RateLimiter(TokenBucket(300, 10.0), TokenBucket(100, 10.0))
+    pool.credentials[0].rate_limiter.token_bucket.pause(5.0)
+
+    first = pool.acquire()
+    second = pool.acquire()
+    assert first is second is pool.credentials[1]
+    assert first.in_flight == 2
+
+    pool.release(first)
+    pool.release(second)
+    assert first.in_flight == 0
+    assert len(pool) == 2
+
+
+def test_trello_api_pool_from_env(monkeypatch, capsys) -> None:
+    """
+    Test that TrelloAPI pools the credentials found in the environment, even a single one, and reports invalid ones
+    with the authentication error.
+    """
+    monkeypatch.setenv("TRELLO_API_KEY", "base-key")
+    monkeypatch.setenv("TRELLO_API_TOKEN", "base-token")
+    trello = TrelloAPI(transport=InMemoryTransport())
+    assert [credential.credentials for credential in trello.credential_pool.credentials] == [
+        TrelloCredentials("base-key", "base-token")]
+    assert trello.query == {"key": "base-key", "token": "base-token"}
+
+    monkeypatch.setenv("TRELLO_API_TOKEN_2", "second-token")
+    assert len(TrelloAPI(transport=InMemoryTransport()).credential_pool) == 2
+
+    monkeypatch.delenv("TRELLO_API_KEY")
+    with pytest.raises(SystemExit):
+        TrelloAPI(transport=InMemoryTransport())
+    assert "[AUTHENTICATION ERROR]" in capsys.readouterr().out
@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from trello_cli.trello_client import main as client_main
+from trello_cli.utils.daemon import TrelloDaemon
+from trello_cli.utils.daemon_client import DaemonClient
+from trello_cli.utils.exceptions import APIRequestException
+from trello_cli.utils.trello_api import TrelloAPI
+from trello_cli.utils.transport import InMemoryTransport
+
+CARD_SPEC = {"board_url": "https://trello.com/b/bOaRd123/test-board",
+             "list_name": "TO DO",
+             "card_name": "Card",
+             "card_description": "Description",
+             "card_comment": "Comment",
+             "label_name": "Bug"}
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Run a TrelloDaemon on a temporary socket, answering from an in-memory board"""
+    transport = InMemoryTransport()
+    transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",))
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+
+    daemon = TrelloDaemon(trello, tmp_path / "daemon.sock")
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.shutdown()
+    daemon.server_close()
+
+
+def test_daemon_reuses_resolved_ids(mocker, daemon) -> None:
+    """
+    Test that the daemon resolves the board once and then only sends the card and comment POSTs for each job.
+    """
+    client = DaemonClient(daemon.socket_path)
+    send = mocker.spy(daemon.trello.transport, "send")
+
+    first = client.create_card(CARD_SPEC)
+    requests_first = send.call_count
+    second = client.create_card({**CARD_SPEC, "card_name": "Second card"})
+
+    assert first["card_url"] != second["card_url"]
+    assert send.call_count - requests_first == 2
+    assert client.health() == {"status": "ok", "cards": 2}
+
+
+def test_daemon_reports_errors(daemon) -> None:
+    """
+    Test that invalid specs and failed jobs are answered with their error.
+    """
+    client = DaemonClient(daemon.socket_path)
+
+    assert "DONE" in client.create_card({**CARD_SPEC, "list_name": "DONE"})["error"]
+    assert client.create_card({"card_name": "Card"})["error"].startswith("Invalid card spec")
+
+
+def test_daemon_keeps_card_when_comment_fails(mocker, daemon) -> None:
+    """
+    Test that a job whose comment fails is answered with its card, and that the board is not resolved again.
+    """
+    client = DaemonClient(daemon.socket_path)
+    client.create_card(CARD_SPEC)
+    mocker.patch.object(daemon.trello, "create_card_comment", side_effect=APIRequestException("connection reset"))
+    get_board = mocker.spy(daemon.trello, "get_board_data")
+
+    result = client.create_card({**CARD_SPEC, "card_name": "Second card"})
+
+    assert result["card_url"] and "connection reset" in result["error"]
+    get_board.assert_not_called()
+    assert client.health() == {"status": "ok", "cards": 2}
+
+
+def test_daemon_refuses_running_socket(daemon) -> None:
+    """
+    Test that a second daemon does not take over the socket of a running one.
+    """
+    with pytest.raises(OSError):
+        TrelloDaemon(daemon.trello, daemon.socket_path)
+
+
+def test_client_main(daemon, tmp_path, capsys) -> None:
+    """
+    Test the thin client, with the daemon running and without it.
+    """
+    args = [item for name, value in CARD_SPEC.items() for item in (f"--{name}", value)]
+
+    client_main(args + ["--socket", str(daemon.socket_path)])
+    assert "[FINISH] Comment created." in capsys.readouterr().out
+
+    with pytest.raises(SystemExit):
+        client_main(args + ["--socket", str(tmp_path / "missing.sock")])
@@ -0,0 +1,190 @@
+import threading
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED
+
+import pytest
+
+from trello_cli.utils import hedging
+from trello_cli.utils.exceptions import APIRequestException, DeadlineExceededException
+from trello_cli.utils.hedging import Hedger, HedgingPolicy
+from trello_cli.utils.trello_api import RequestType, TrelloAPI
+from trello_cli.utils.transport import InMemoryTransport
+
+
+class SlowFirstTransport(InMemoryTransport):
+    """InMemoryTransport where the first request of each route hangs for a while"""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def send(self, request_type, endpoint, payload, timeout=None):
+        with self._lock:
+            first = (request_type, endpoint) not in [call[:2] for call in self.calls]
+            self.calls.append((request_type, endpoint, timeout))
+        if first:
+            time.sleep(self.delay)
+        return super().send(request_type, endpoint, payload, timeout)
+
+
+class Response:
+    """Response that records whether its connection was released"""
+
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def slow_first(first, second):
+    """Creates a request answering first, after a short delay, then second once it is sent again"""
+    calls = []
+
+    def request():
+        calls.append(1)
+        if len(calls) > 1:
+            return second
+        time.sleep(0.05)
+        if isinstance(first, Exception):
+            raise first
+        return first
+
+    return request
+
+
+def test_hedger_threshold() -> None:
+    """
+    Test that the hedging delay starts at the initial delay, then follows the quantile of the observed latencies.
+    """
+    hedger = Hedger(HedgingPolicy(quantile=0.9, initial_delay=2.0, min_delay=0.01, min_samples=10))
+    assert hedger.threshold() == 2.0
+
+    for latency in range(1, 11):
+        hedger.latencies.record(latency / 100)
+    assert hedger.threshold() == pytest.approx(0.10)
+
+    hedger.latencies.record(0.0)
+    assert hedger.threshold() >= 0.01
+    hedger.close()
+
+
+def test_hedger_first_response_wins() -> None:
+    """
+    Test that a slow request is sent a second time, that the fastest response is used, and that a failed request
+    waits for the other one.
+    """
+    hedger = Hedger(HedgingPolicy(initial_delay=0.05))
+    calls = []
+
+    def request() -> str:
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.5)
+            return "slow"
+        return "fast"
+
+    started = time.monotonic()
+    assert hedger.send(request) == "fast"
+    assert time.monotonic() - started < 0.4
+    assert (hedger.hedged, hedger.hedges_won) == (1, 1)
+
+    # no second request when not allowed
+    calls.clear()
+    assert hedger.send(request, can_hedge=lambda: False) == "slow"
+    assert len(calls) == 1
+
+    def failing_first() -> str:
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.1)
+            raise APIRequestException("reset")
+        time.sleep(0.2)
+        return "second"
+
+    calls.clear()
+    assert hedger.send(failing_first) == "second"
+    hedger.close()
+
+
+def test_hedger_prefers_response_completed_with_error(mocker) -> None:
+    """
+    Test that when both requests complete together, a response wins over the error of the other request, and that
+    an unused response is closed.
+    """
+    real_wait = hedging.wait
+
+    def wait_for_both(futures, timeout=None, return_when=ALL_COMPLETED):
+        if return_when == FIRST_COMPLETED:
+            # let both requests complete before reporting the first one
+            real_wait(futures)
+        return real_wait(futures, timeout=timeout, return_when=return_when)
+
+    mocker.patch("trello_cli.utils.hedging.wait", side_effect=wait_for_both)
+    hedger = Hedger(HedgingPolicy(initial_delay=0.01))
+
+    for _ in range(10):
+        responses = [Response(), Response()]
+        assert hedger.send(slow_first(APIRequestException("reset"), responses[1])) is responses[1]
+        assert not responses[1].closed
+
+        winner = hedger.send(slow_first(responses[0], responses[1]))
+        assert not winner.closed
+        assert [response.closed for response in responses].count(True) == 1
+    hedger.close()
+
+
+def test_trello_api_hedges_gets_only() -> None:
+    """
+    Test that slow lookups are answered by their hedged request, and that POSTs are never sent twice.
+    """
+    transport = SlowFirstTransport(delay=0.5)
+    board = transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",), label_names=("Bug",))
+    trello = TrelloAPI(rate_limit=False, transport=transport, hedging=HedgingPolicy(initial_delay=0.05))
+
+    started = time.monotonic()
+    assert trello.get_label_from_board(board.id, "Bug").name == "Bug"
+    assert time.monotonic() - started < 0.4
+    assert [call[0] for call in transport.calls] == [RequestType.GET] * 2
+
+    list_id = trello.get_desired_list_id(board.id, "TO DO")
+    transport.calls.clear()
+    trello.create_card(list_id, trello.get_label_from_board(board.id, "Bug").id, "Card", "Description")
+    assert [call[0] for call in transport.calls].count(RequestType.POST) == 1
+    assert len(transport.trello.cards) == 1
+    trello.close()
+
+
+def test_operation_deadline(mocker) -> None:
+    """
+    Test that an operation fails once its deadline is exceeded instead of retrying, and that its requests only wait
+    for the time left.
+    """
+    transport = InMemoryTransport()
+    board = transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",))
+    trello = TrelloAPI(rate_limit=False, transport=transport, operation_deadline=0.3)
+
+    def unreachable(request_type, endpoint, payload, timeout=None):
+        time.sleep(0.05)
+        raise APIRequestException("unreachable")
+
+    send = mocker.patch.object(transport, "send", side_effect=unreachable)
+    mocker.patch("trello_cli.utils.retry.random.uniform", return_value=0.1)
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededException):
+        trello.get_desired_list_id(board.id, "TO DO")
+    assert time.monotonic() - started < 0.5
+    assert all(0 < call.args[3] <= 0.3 for call in send.call_args_list)
+
+    # a deadline given by the caller bounds the operations inside it
+    send.reset_mock(side_effect=True)
+    send.side_effect = None
+    trello.operation_deadline = None
+    with trello.deadline(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceededException):
+            trello.get_desired_list_id(board.id, "TO DO")
+    send.assert_not_called()
@@ -0,0 +1,66 @@
+import io
+import json
+
+import pytest
+
+from trello_cli.utils.instrumentation import HistogramSink, Instrumentation, JsonLogSink, PrometheusTextfileSink
+from trello_cli.utils.trello_api import TrelloAPI
+from trello_cli.utils.exceptions import *
+
+
+def mocked_response(mocker, json_value):
+    """Creates a mocked successful requests response"""
+    response = mocker.Mock(status_code=200, headers={}, content=json.dumps(json_value).encode())
+    response.json.return_value = json_value
+    return response
+
+
+def test_mock_instrumented_operations(mocker, tmp_path) -> None:
+    """
+    Test that each TrelloAPI operation is recorded with its requests, bytes and errors on every sink.
+    """
+    histogram = HistogramSink()
+    json_log = io.StringIO()
+    prometheus = PrometheusTextfileSink(tmp_path / "trello_cli.prom")
+    instrumentation = Instrumentation([histogram, JsonLogSink(json_log), prometheus])
+    trello_api = TrelloAPI(rate_limit=False, instrumentation=instrumentation)
+
+    board_lists = [{'id': '423142342hbu3h421', 'name': 'Column 1'}]
+    mocker.patch.object(trello_api.session, 'get', return_value=mocked_response(mocker, board_lists))
+
+    trello_api.get_desired_list_id('f542hb5564h5jn', 'Column 1')
+    with pytest.raises(ListNotFoundException):
+        trello_api.get_desired_list_id('f542hb5564h5jn', 'Column 2')
+    instrumentation.close()
+
+    stats = histogram.stats['get_desired_list_id']
+    assert stats.count == 2
+    assert stats.errors == 1
+    assert stats.bytes_received == 2 * len(json.dumps(board_lists))
+    assert 'get_desired_list_id' in histogram.report()
+
+    events = [json.loads(line) for line in json_log.getvalue().splitlines()]
+    assert events[0]['operation'] == 'get_desired_list_id'
+    assert events[0]['requests'] == 1
+    assert events[0]['status_codes'] == [200]
+    assert events[1]['error'].startswith('ListNotFoundException')
+
+    exported = (tmp_path / "trello_cli.prom").read_text()
+    assert 'trello_cli_operation_seconds_count{operation="get_desired_list_id"} 2' in exported
+    assert 'trello_cli_operation_errors_total{operation="get_desired_list_id"} 1' in exported
+
+
+def test_nested_operations_are_accounted_to_the_outer_one() -> None:
+    """
+    Test that an operation started inside another one in the same thread is recorded as part of the outer one.
+    """
+    histogram = HistogramSink()
+    instrumentation = Instrumentation([histogram])
+
+    with instrumentation.operation('create_card'):
+        instrumentation.record_response(200, 10)
+        with instrumentation.operation('get_board_data'):
+            instrumentation.record_response(200, 5)
+
+    assert list(histogram.stats) == ['create_card']
+    assert histogram.stats['create_card'].bytes_received == 15
@@ -0,0 +1,127 @@
+import io
+import json
+
+import pytest
+
+from trello_cli.trello_cli import main
+from trello_cli.utils.bulk import read_card_specs
+from trello_cli.utils.planner import BatchPlanner, rate_limited_seconds
+from trello_cli.utils.trello_api import TrelloAPI
+from trello_cli.utils.transport import InMemoryTransport
+
+BOARD_URL = "https://trello.com/b/bOaRd123/test-board"
+
+
+def card_rows(count: int) -> str:
+    """JSON Lines input: count valid rows using two labels, then one row for each kind of failure"""
+    rows = [{"board_url": BOARD_URL, "list_name": "TO DO", "card_name": f"Card {index}",
+             "card_description": "Description", "card_comment": "Comment",
+             "label_name": ("Bug", "New", "Other")[index % 3]} for index in range(count)]
+    rows.append({**rows[0], "list_name": "DOING"})
+    rows.append({**rows[0], "board_url": "https://trello.com/b/missing/board"})
+    return "".join(json.dumps(row) + "\n" for row in rows) + '{"card_name": "x"}\n'
+
+
+@pytest.fixture
+def transport():
+    """Create an InMemoryTransport with a single board"""
+    transport = InMemoryTransport()
+    transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",), label_names=("Bug",))
+    return transport
+
+
+def test_plan(mocker, transport) -> None:
+    """
+    Test that the plan resolves each board once, creates each missing label once before the cards, and lists the
+    failing rows.
+    """
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    send = mocker.spy(transport, "send")
+
+    plan = BatchPlanner(trello).plan(read_card_specs(io.StringIO(card_rows(30)), "jsonl"))
+
+    assert send.call_count == plan.resolve_requests == 2
+    assert sorted(plan.errors) == [31, 32, 33]
+    assert [call.description for call in plan.calls[:2]] == ["Create label New on board Test board",
+                                                             "Create label Other on board Test board"]
+    assert all(call.row is not None for call in plan.calls[2:])
+    assert plan.request_count == 2 + 30 * 2
+    assert not transport.trello.cards
+
+    summary = plan.summary()
+    assert "2 label(s) to create" in summary and "62 request(s) to run" in summary
+
+
+def test_execute_plan(mocker, transport) -> None:
+    """
+    Test that running a plan makes exactly the planned requests.
+    """
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    planner = BatchPlanner(trello)
+    plan = planner.plan(read_card_specs(io.StringIO(card_rows(30)), "jsonl"))
+
+    send = mocker.spy(transport, "send")
+    output = io.StringIO()
+    assert planner.execute(plan, output, concurrency=4) == (30, 3)
+
+    assert send.call_count == plan.request_count
+    board = next(iter(transport.trello.boards.values()))
+    assert sorted(board.labels.values()) == ["Bug", "New", "Other"]
+    assert len(transport.trello.cards) == 30
+    assert len(output.getvalue().splitlines()) == 33
+
+
+def test_rate_limited_seconds() -> None:
+    """
+    Test the estimated time under Trello's limits: the burst is free, then requests are spread over the interval.
+    """
+    assert rate_limited_seconds(10) == 0
+    assert rate_limited_seconds(100) == pytest.approx(10.0)
+    assert rate_limited_seconds(100, tokens=3) < rate_limited_seconds(100, tokens=2) < rate_limited_seconds(100)
+    # the key limit caps the gain of more tokens on the same key
+    assert rate_limited_seconds(1000, tokens=6) == rate_limited_seconds(1000, tokens=3)
+
+
+def test_trello_cli_plan(mocker, tmp_path, transport, capsys) -> None:
+    """
+    Test that the cli --plan writes the planned requests without creating anything, and that '--plan run' runs them.
+    """
+    mocker.patch('trello_cli.utils.trello_api.TrelloAPI',
+                 side_effect=lambda **kwargs: TrelloAPI(rate_limit=False, transport=transport))
+    input_file = tmp_path / "cards.jsonl"
+    input_file.write_text(card_rows(3))
+
+    with pytest.raises(SystemExit):
+        main(["--input", str(input_file), "--plan", "--no_cache"])
+    captured = capsys.readouterr()
+    assert [json.loads(line)["route"] for line in captured.out.splitlines()][:3] \
+        == ["/boards/" + next(iter(transport.trello.boards)) + "/labels"] * 2 + ["/cards"]
+    assert "Plan for 6 rows" in captured.err
+    assert not transport.trello.cards
+
+    with pytest.raises(SystemExit):
+        main(["--input", str(input_file), "--plan", "run", "--no_cache"])
+    assert len(transport.trello.cards) == 3
+
+
+def test_plan_shares_board_across_urls(mocker, transport) -> None:
+    """
+    Test that urls of the same board share one snapshot, and that a missing label is created once for both.
+    """
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    planner = BatchPlanner(trello)
+    rows = [{"board_url": board_url, "list_name": "TO DO", "card_name": f"Card {index}",
+             "card_description": "Description", "card_comment": "Comment", "label_name": "New"}
+            for index, board_url in enumerate([BOARD_URL, "https://trello.com/b/bOaRd123"])]
+    plan = planner.plan(read_card_specs(io.StringIO("".join(json.dumps(row) + "\n" for row in rows)), "jsonl"))
+
+    assert len(plan.boards) == 1
+    assert plan.resolve_requests == 1
+    assert plan.request_count == 1 + 2 * 2
+
+    send = mocker.spy(transport, "send")
+    assert planner.execute(plan) == (2, 0)
+
+    assert send.call_count == plan.request_count
+    board = next(iter(transport.trello.boards.values()))
+    assert sorted(board.labels.values()) == ["Bug", "New"]
@@ -0,0 +1,90 @@
+import pytest
+
+from trello_cli.utils.exceptions import DeadlineExceededException
+from trello_cli.utils.rate_limit import RateLimiter, TokenBucket, get_rate_limiter, parse_retry_after
+from trello_cli.utils.trello_api import RequestType
+
+
+def test_token_bucket_never_exceeds_limit() -> None:
+    """
+    Test that the bucket allows the burst immediately and then spreads the rest of the limit over the interval.
+    """
+    bucket = TokenBucket(limit=100, interval=10.0)
+
+    waits = [bucket.reserve() for _ in range(100)]
+
+    assert all(wait == 0 for wait in waits[:10])
+    assert waits[10] > 0
+    # the 100th request of the window waits for the refill of almost the whole interval
+    assert 9.8 < waits[-1] <= 10.0
+
+
+def test_token_bucket_remaining_and_pause() -> None:
+    """
+    Test lowering the tokens to Trello's reported remaining requests and pausing after a 429.
+    """
+    bucket = TokenBucket(limit=100, interval=10.0)
+
+    bucket.limit_remaining(0)
+    assert bucket.reserve() > 0
+
+    bucket.pause(5.0)
+    assert 4.9 < bucket.reserve() <= 5.0
+
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) == 1.0
+
+
+def test_rate_limiters_share_budget() -> None:
+    """
+    Test that rate limiters for the same credentials share their buckets.
+    """
+    first = get_rate_limiter("shared-key", "shared-token")
+    second = get_rate_limiter("shared-key", "other-token")
+
+    assert first.key_bucket is second.key_bucket
+    assert first.token_bucket is not second.token_bucket
+
+
+def test_mock_call_api_retries_rate_limited(mocker, monkeypatch, trello_api) -> None:
+    """
+    Test that call_api waits for the Retry-After time and retries when Trello answers 429.
+    """
+    # isolated buckets, so that the pause does not leak into the other tests sharing the credentials
+    monkeypatch.setattr(trello_api.credential_pool.credentials[0], 'rate_limiter',
+                        RateLimiter(TokenBucket(300, 10.0), TokenBucket(100, 10.0)))
+    rate_limited = mocker.Mock(status_code=429, headers={"Retry-After": "2"})
+    success = mocker.Mock(status_code=200, headers={"x-rate-limit-api-token-remaining": "50"})
+    success.json.return_value = {'id': '423142342hbu3h421'}
+    mocker.patch.object(trello_api.session, 'get', side_effect=[rate_limited, success])
+    mocked_sleep = mocker.patch('trello_cli.utils.rate_limit.time.sleep')
+
+    response = trello_api.call_api(RequestType.GET, 'https://api.trello.com/1/boards/id', trello_api.query)
+
+    assert response == {'id': '423142342hbu3h421'}
+    assert trello_api.session.get.call_count == 2
+    assert mocked_sleep.call_args[0][0] > 1.9
+
+
+def test_mock_call_api_rate_limit_respects_deadline(mocker, monkeypatch, trello_api) -> None:
+    """
+    Test that a Retry-After time ending after the deadline fails the operation instead of waiting for it, and that
+    no request is sent while the rate limiter would wait past the deadline.
+    """
+    monkeypatch.setattr(trello_api.credential_pool.credentials[0], 'rate_limiter',
+                        RateLimiter(TokenBucket(300, 10.0), TokenBucket(100, 10.0)))
+    rate_limited = mocker.Mock(status_code=429, headers={"Retry-After": "5"})
+    mocker.patch.object(trello_api.session, 'get', return_value=rate_limited)
+    mocked_sleep = mocker.patch('trello_cli.utils.rate_limit.time.sleep')
+
+    with trello_api.deadline(1.0):
+        with pytest.raises(DeadlineExceededException):
+            trello_api.call_api(RequestType.GET, 'https://api.trello.com/1/boards/id', trello_api.query)
+        assert trello_api.session.get.call_count == 1
+
+        # the credentials are still paused for the Retry-After time
+        with pytest.raises(DeadlineExceededException):
+            trello_api.call_api(RequestType.GET, 'https://api.trello.com/1/boards/id', trello_api.query)
+        assert trello_api.session.get.call_count == 1
+
+    mocked_sleep.assert_not_called()
@@ -0,0 +1,107 @@
+import time
+
+import pytest
+import requests
+
+from trello_cli.utils.retry import RetryPolicy
+from trello_cli.utils.trello_api import RequestType
+from trello_cli.utils.exceptions import *
+
+
+def mocked_response(mocker, status_code, json_value=None):
+    """Creates a mocked requests response"""
+    response = mocker.Mock(status_code=status_code, headers={})
+    response.json.return_value = json_value
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+    return response
+
+
+def test_retry_policy_delays() -> None:
+    """
+    Test the exponential backoff, the retryable errors and the deadline of the RetryPolicy.
+    """
+    policy = RetryPolicy(max_attempts=4, backoff_base=1.0, backoff_max=3.0, jitter=False, deadline=10.0)
+
+    assert policy.next_delay(1, 0.0, APIRequestException('timeout')) == 1.0
+    assert policy.next_delay(2, 0.0, APIRequestException('503', 503)) == 2.0
+    assert policy.next_delay(3, 0.0, APIRequestException('503', 503)) == 3.0
+    assert policy.next_delay(4, 0.0, APIRequestException('503', 503)) is None
+    assert policy.next_delay(1, 0.0, APIRequestException('404', 404)) is None
+    assert policy.next_delay(1, 9.5, APIRequestException('timeout')) is None
+
+    jittered = RetryPolicy(backoff_base=1.0).next_delay(1, 0.0, APIRequestException('timeout'))
+    assert 0.0 <= jittered <= 1.0
+
+
+def test_mock_call_api_retries_get(mocker, trello_api, caplog) -> None:
+    """
+    Test that GETs are retried on connection errors and 5xx responses, and that each retry is logged.
+    """
+    mocker.patch('trello_cli.utils.trello_api.time.sleep')
+    mocker.patch.object(trello_api.session, 'get', side_effect=[requests.exceptions.ConnectionError(),
+                                                                mocked_response(mocker, 503),
+                                                                mocked_response(mocker, 200, {'id': 'board'})])
+
+    assert trello_api.call_api(RequestType.GET, 'https://api.trello.com/1/boards/id', trello_api.query) == {'id': 'board'}
+    assert trello_api.last_retries == 2
+    assert "Trello request failed (attempt 2). Retrying in" in caplog.messages[-1]
+
+
+def test_mock_call_api_does_not_retry_plain_post(mocker, trello_api) -> None:
+    """
+    Test that POSTs without a way to find a previously created object are never retried.
+    """
+    mocker.patch('trello_cli.utils.trello_api.time.sleep')
+    mocked_post = mocker.patch.object(trello_api.session, 'post', side_effect=requests.exceptions.Timeout())
+
+    with pytest.raises(APIRequestException):
+        trello_api.call_api(RequestType.POST, 'https://api.trello.com/1/cards', trello_api.query)
+    assert mocked_post.call_count == 1
+
+
+def test_mock_create_card_retry_is_idempotent(mocker, trello_api) -> None:
+    """
+    Test that a card created by an attempt that timed out is found instead of being posted again.
+    """
+    mocker.patch('trello_cli.utils.trello_api.time.sleep')
+    mocked_post = mocker.patch.object(trello_api.session, 'post', side_effect=requests.exceptions.Timeout())
+    card_id = f"{int(time.time()):08x}0000000000000000"
+    list_cards = [{'id': '5f0000000000000000000000', 'url': 'https://trello.com/c/old', 'name': 'New Card',
+                   'desc': 'New card description'},
+                  {'id': card_id, 'url': 'https://trello.com/c/new', 'name': 'New Card',
+                   'desc': 'New card description'}]
+    mocker.patch.object(trello_api.session, 'get', return_value=mocked_response(mocker, 200, list_cards))
+
+    card = trello_api.create_card(board_list_id='f43bn5j34b65j2k3',
+                                  label_id='7j5nbj6km4b64',
+                                  card_name='New Card',
+                                  card_description='New card description')
+
+    assert mocked_post.call_count == 1
+    assert card.id == card_id
+    assert card.retries == 1
+
+
+def test_mock_create_card_retry_skips_returned_cards(mocker, trello_api) -> None:
+    """
+    Test that a card already returned for another, identical row is not taken as the card of a failed attempt.
+    """
+    mocker.patch('trello_cli.utils.trello_api.time.sleep')
+    first_id = f"{int(time.time()):08x}0000000000000001"
+    second_id = f"{int(time.time()):08x}0000000000000002"
+    first = {'id': first_id, 'url': 'https://trello.com/c/first', 'name': 'New Card', 'desc': 'New card description'}
+    second = {'id': second_id, 'url': 'https://trello.com/c/second', 'name': 'New Card',
+              'desc': 'New card description'}
+    mocked_post = mocker.patch.object(trello_api.session, 'post',
+                                      side_effect=[mocked_response(mocker, 200, first), requests.exceptions.Timeout(),
+                                                   mocked_response(mocker, 200, second)])
+    mocker.patch.object(trello_api.session, 'get', return_value=mocked_response(mocker, 200, [first]))
+
+    cards = [trello_api.create_card(board_list_id='f43bn5j34b65j2k3',
+                                    label_id='7j5nbj6km4b64',
+                                    card_name='New Card',
+                                    card_description='New card description') for _ in range(2)]
+
+    assert [card.id for card in cards] == [first_id, second_id]
+    assert mocked_post.call_count == 3
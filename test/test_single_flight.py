@@ -0,0 +1,141 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.startup import run_python
+from trello_cli.utils.bulk import BulkCardCreator, CardSpec
+from trello_cli.utils.single_flight import FileLock, SingleFlight
+from trello_cli.utils.trello_api import RequestType, TrelloAPI
+from trello_cli.utils.transport import InMemoryTransport
+
+
+@pytest.fixture
+def transport():
+    """Create an InMemoryTransport with a single board"""
+    transport = InMemoryTransport()
+    transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",), label_names=("Bug",))
+    return transport
+
+
+def test_single_flight_coalesces_calls() -> None:
+    """
+    Test that concurrent calls for the same key run the function once and share its result or exception.
+    """
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow() -> int:
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        first = executor.submit(flight.do, "key", slow)
+        started.wait(5)
+        others = [executor.submit(flight.do, "key", slow) for _ in range(7)]
+        time.sleep(0.05)
+        release.set()
+        assert [future.result() for future in [first, *others]] == [42] * 8
+    assert len(calls) == 1
+
+    # once done, the next call runs again
+    assert flight.do("key", lambda: 7) == 7
+
+    def failing() -> None:
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        flight.do("key", failing)
+
+
+def test_get_or_create_label_concurrently(mocker, transport) -> None:
+    """
+    Test that many threads asking for the same missing label create it once, and that existing labels are found.
+    """
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    board = next(iter(transport.trello.boards.values()))
+    original_send = transport.send
+
+    def slow_send(request_type, endpoint, payload, timeout=None):
+        time.sleep(0.05)
+        return original_send(request_type, endpoint, payload, timeout)
+
+    send = mocker.patch.object(transport, "send", side_effect=slow_send)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(lambda _: trello.get_or_create_label(board.id, "Feature"), range(16)))
+
+    assert len({label.id for label, _ in results}) == 1
+    assert sorted(board.labels.values()) == ["Bug", "Feature"]
+    assert [call.args[0] for call in send.call_args_list] == [RequestType.GET, RequestType.POST]
+
+    label, created = trello.get_or_create_label(board.id, "Bug")
+    assert (label.name, created) == ("Bug", False)
+
+
+def test_get_or_create_label_lock_file(tmp_path, transport) -> None:
+    """
+    Test that instances sharing a lock directory, standing for separate processes, create a missing label once.
+    """
+    board = next(iter(transport.trello.boards.values()))
+    instances = [TrelloAPI(rate_limit=False, transport=transport) for _ in range(4)]
+    for trello in instances:
+        trello.label_lock_dir = tmp_path
+
+    # every instance misses the label first, as if they all looked it up at the same moment
+    barrier = threading.Barrier(len(instances))
+    for trello in instances:
+        original = trello.get_label_from_board
+
+        def get_label_from_board(board_id, label_name, original=original):
+            try:
+                return original(board_id, label_name)
+            finally:
+                barrier.wait(5)
+
+        trello.get_label_from_board = get_label_from_board
+
+    with ThreadPoolExecutor(max_workers=len(instances)) as executor:
+        results = list(executor.map(lambda trello: trello.get_or_create_label(board.id, "Feature"), instances))
+
+    assert sorted(board.labels.values()) == ["Bug", "Feature"]
+    assert sorted(created for _, created in results) == [False, False, False, True]
+    assert len(list(tmp_path.glob("*.lock"))) == 1
+    assert FileLock.for_key(tmp_path, "label", board.id, "Feature").path.exists()
+
+
+def test_bulk_runs_share_label_lock(tmp_path, transport) -> None:
+    """
+    Test that bulk runs of separate instances sharing a lock directory create a missing label once.
+    """
+    board = next(iter(transport.trello.boards.values()))
+    spec = CardSpec("https://trello.com/b/bOaRd123/test-board", "TO DO", "Card", "Description", "Comment", "Feature")
+    instances = [TrelloAPI(rate_limit=False, transport=transport) for _ in range(4)]
+    for trello in instances:
+        trello.label_lock_dir = tmp_path
+    # every run resolves its snapshot before any of them creates the label
+    creators = [BulkCardCreator(trello) for trello in instances]
+    for creator in creators:
+        creator.seed(spec.board_url, creator.trello.get_board_snapshot(board.id))
+
+    with ThreadPoolExecutor(max_workers=len(creators)) as executor:
+        results = list(executor.map(lambda creator: creator.run([spec]), creators))
+
+    assert results == [(1, 0)] * len(creators)
+    assert sorted(board.labels.values()) == ["Bug", "Feature"]
+
+
+def test_trello_api_import_without_fcntl() -> None:
+    """
+    Test that TrelloAPI can be imported where fcntl does not exist, such as on Windows.
+    """
+    code = ("import sys; sys.modules['fcntl'] = None; "
+            "from trello_cli.utils.trello_api import TrelloAPI; print(TrelloAPI.__name__)")
+    result = run_python(["-c", code])
+
+    assert result.stdout.strip() == "TrelloAPI", result.stderr
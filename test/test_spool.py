@@ -0,0 +1,120 @@
+import pytest
+
+from trello_cli.trello_cli import main
+from trello_cli.utils.retry import RetryPolicy
+from trello_cli.utils.spool import CardSpool
+from trello_cli.utils.spool_flusher import SpoolFlusher
+from trello_cli.utils.trello_api import TrelloAPI
+from trello_cli.utils.transport import InMemoryTransport
+from trello_cli.utils.exceptions import *
+
+CARD_SPEC = {"board_url": "https://trello.com/b/bOaRd123/test-board",
+             "list_name": "TO DO",
+             "card_name": "Card",
+             "card_description": "Description",
+             "card_comment": "Comment",
+             "label_name": "Bug"}
+
+
+@pytest.fixture
+def transport():
+    """Create an InMemoryTransport with a single board"""
+    transport = InMemoryTransport()
+    transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",))
+    return transport
+
+
+def test_spool_states(tmp_path) -> None:
+    """
+    Test that spooled jobs are claimed once, scheduled again, failed, and kept across restarts.
+    """
+    spool = CardSpool(tmp_path / "spool.sqlite")
+    first, second = spool.enqueue_many([CARD_SPEC, {**CARD_SPEC, "card_name": "Second"}])
+    with pytest.raises(ValueError):
+        spool.enqueue({"card_name": "Card"})
+
+    jobs = spool.claim(10)
+    assert [job.id for job in jobs] == [first, second]
+    assert jobs[0].spec == CARD_SPEC and jobs[0].attempts == 1
+    assert spool.claim(10) == []
+
+    spool.retry_later(first, 60, "503")
+    spool.mark_failed(second, "404")
+    assert spool.counts() == {"pending": 1, "in_progress": 0, "failed": 1}
+    assert spool.claim(10) == []
+    assert 0 < spool.next_attempt_in() <= 60
+    assert spool.failed_jobs() == [(second, {**CARD_SPEC, "card_name": "Second"}, "404")]
+    spool.close()
+
+    reopened = CardSpool(tmp_path / "spool.sqlite")
+    assert reopened.counts() == {"pending": 1, "in_progress": 0, "failed": 1}
+
+
+def test_flusher_drains_spool(tmp_path, transport) -> None:
+    """
+    Test that the flusher creates every spooled card with its comment and empties the spool.
+    """
+    spool = CardSpool(tmp_path / "spool.sqlite")
+    spool.enqueue_many([{**CARD_SPEC, "card_name": f"Card {index}"} for index in range(5)])
+
+    with TrelloAPI(rate_limit=False, transport=transport) as trello:
+        assert SpoolFlusher(spool, trello, concurrency=2, batch_size=2).run() == (5, 0)
+
+    assert sorted(card["name"] for card in transport.trello.cards.values()) == [f"Card {index}" for index in range(5)]
+    assert all(len(comments) == 1 for comments in transport.trello.comments.values())
+    assert spool.counts() == {"pending": 0, "in_progress": 0, "failed": 0}
+
+
+def test_flusher_resumes_without_duplicates(tmp_path, transport) -> None:
+    """
+    Test that jobs left in progress by a crash neither lose nor duplicate their card and comment.
+    """
+    spool = CardSpool(tmp_path / "spool.sqlite")
+    spool.enqueue_many([CARD_SPEC, {**CARD_SPEC, "card_name": "Recorded card"}])
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    list_id = next(iter(next(iter(transport.trello.boards.values())).lists))
+
+    # the flusher crashed after creating the first card without recording it, and after recording the second one
+    unrecorded, recorded = spool.claim(10)
+    crashed = TrelloAPI(rate_limit=False, transport=transport)
+    crashed.create_card(list_id, "", "Card", "Description")
+    card = crashed.create_card(list_id, "", "Recorded card", "Description")
+    spool.mark_card_created(recorded.id, card.id, card.url)
+
+    assert SpoolFlusher(spool, trello).run() == (2, 0)
+    assert len(transport.trello.cards) == 2
+    assert all(len(comments) == 1 for comments in transport.trello.comments.values())
+
+
+def test_flusher_retries_and_fails(mocker, tmp_path, transport) -> None:
+    """
+    Test that transient errors are scheduled again and permanent ones are kept as failed.
+    """
+    spool = CardSpool(tmp_path / "spool.sqlite")
+    transient, permanent = spool.enqueue_many([CARD_SPEC, {**CARD_SPEC, "list_name": "DONE"}])
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    mocker.patch.object(trello, "create_card", side_effect=APIRequestException("503", 503))
+
+    flusher = SpoolFlusher(spool, trello, retry_policy=RetryPolicy(jitter=False, backoff_base=30, backoff_max=30))
+    assert flusher.run() == (0, 1)
+
+    assert spool.counts() == {"pending": 1, "in_progress": 0, "failed": 1}
+    assert spool.failed_jobs()[0][0] == permanent
+    assert spool.next_attempt_in() > 20
+
+
+def test_trello_cli_spool_and_flush(mocker, tmp_path, transport, capsys) -> None:
+    """
+    Test that the CLI spools a card without calling Trello and creates it on flush.
+    """
+    spool_path = str(tmp_path / "spool.sqlite")
+    trello_api = mocker.patch('trello_cli.utils.trello_api.TrelloAPI',
+                              return_value=TrelloAPI(rate_limit=False, transport=transport))
+
+    main([item for name, value in CARD_SPEC.items() for item in (f"--{name}", value)]
+         + ["--spool", "--spool_path", spool_path])
+    assert "1 card(s) spooled" in capsys.readouterr().out
+    trello_api.assert_not_called()
+
+    main(["--flush", "--spool_path", spool_path, "--no_cache"])
+    assert [card["name"] for card in transport.trello.cards.values()] == ["Card"]
@@ -0,0 +1,32 @@
+from benchmarks.startup import CLI_IMPORT_BUDGET_US, import_times
+from trello_cli.trello_cli import DEFAULT_CACHE_TTL
+from trello_cli.utils.board_cache import DEFAULT_TTL
+
+
+def test_cli_import_within_budget() -> None:
+    """
+    Test that importing the CLI does not load requests nor the Trello API code, and stays within its time budget.
+    """
+    times = import_times(["-c", "import trello_cli.trello_cli"])
+
+    assert "requests" not in times
+    assert "trello_cli.utils.trello_api" not in times
+    assert times["trello_cli.trello_cli"] < CLI_IMPORT_BUDGET_US
+
+
+def test_help_and_arg_errors_skip_api_imports() -> None:
+    """
+    Test that --help and arg validation errors return before loading requests.
+    """
+    for args in (["--help"], ["--board_url", "https://trello.com/b/x"]):
+        times = import_times(["-m", "trello_cli", *args])
+
+        assert "trello_cli.trello_cli" in times
+        assert "requests" not in times
+
+
+def test_cli_cache_ttl_default() -> None:
+    """
+    Test that the CLI default cache TTL, defined there to avoid importing the cache, matches the cache default.
+    """
+    assert DEFAULT_CACHE_TTL == DEFAULT_TTL
@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+
+from trello_cli.utils.task_graph import TaskGraph
+from trello_cli.utils.exceptions import *
+
+
+def test_task_graph_runs_independent_tasks_concurrently() -> None:
+    """
+    Test that tasks sharing a dependency run at the same time and that on_done callbacks follow the added order.
+    """
+    both_started = threading.Barrier(2, timeout=2)
+    callbacks = []
+    graph = TaskGraph()
+
+    graph.add("board", lambda: "board-id", on_done=lambda result: callbacks.append(("board", result)))
+    # both tasks wait for each other, so the graph only finishes if they run concurrently
+    graph.add("list", lambda board: (both_started.wait(), f"{board}-list")[1], depends_on=("board",),
+              on_done=lambda result: callbacks.append(("list", result)))
+    graph.add("label", lambda board: (both_started.wait(), f"{board}-label")[1], depends_on=("board",),
+              on_done=lambda result: callbacks.append(("label", result)))
+    graph.add("card", lambda list_id, label_id: f"{list_id}+{label_id}", depends_on=("list", "label"),
+              on_done=lambda result: callbacks.append(("card", result)))
+
+    results = graph.run()
+
+    assert results["card"] == "board-id-list+board-id-label"
+    assert [name for name, _ in callbacks] == ["board", "list", "label", "card"]
+
+
+def test_task_graph_propagates_exceptions() -> None:
+    """
+    Test that a failing task raises its exception and that its dependents are not run.
+    """
+    ran = []
+
+    def missing_list(_):
+        raise ListNotFoundException("Column 3")
+
+    graph = TaskGraph()
+    graph.add("board", lambda: "board-id")
+    graph.add("list", missing_list, depends_on=("board",))
+    graph.add("card", lambda list_id: ran.append(list_id), depends_on=("list",))
+
+    with pytest.raises(ListNotFoundException):
+        graph.run()
+    assert not ran
+
+    with pytest.raises(ValueError):
+        graph.add("comment", lambda card: card, depends_on=("unknown",))
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from benchmarks.startup import import_times
+from trello_cli.utils.trello_api import CardInfo, RequestType, TrelloAPI
+from trello_cli.utils.transport import InMemoryTransport, RecordingTransport, ReplayTransport
+from trello_cli.utils.exceptions import *
+
+BOARD_URL = "https://trello.com/b/bOaRd123/test-board"
+
+
+def create_card(trello: TrelloAPI) -> CardInfo:
+    """Runs the single card flow of the CLI"""
+    board = trello.get_board_data(BOARD_URL)
+    list_id = trello.get_desired_list_id(board.id, "TO DO")
+    label = trello.create_label(board.id, "Bug")
+    card = trello.create_card(list_id, label.id, "Card", "Description")
+    trello.create_card_comment(card.id, "Comment")
+    return card
+
+
+@pytest.fixture
+def in_memory_transport():
+    """Create an InMemoryTransport with a single board"""
+    transport = InMemoryTransport()
+    transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",))
+    return transport
+
+
+def test_in_memory_transport_runs_full_stack(in_memory_transport) -> None:
+    """
+    Test that the whole TrelloAPI flow runs against the in-memory board model, without any socket.
+    """
+    with TrelloAPI(rate_limit=False, transport=in_memory_transport) as trello:
+        card = create_card(trello)
+
+    fake_trello = in_memory_transport.trello
+    assert fake_trello.cards[card.id]["name"] == "Card"
+    assert fake_trello.comments[card.id][0]["data"]["text"] == "Comment"
+    assert "Bug" in next(iter(fake_trello.boards.values())).labels.values()
+
+
+def test_in_memory_transport_maps_errors(in_memory_transport) -> None:
+    """
+    Test that error responses are mapped to APIRequestException with their status code.
+    """
+    trello = TrelloAPI(rate_limit=False, transport=in_memory_transport)
+
+    with pytest.raises(APIRequestException) as e:
+        trello.call_api(RequestType.GET, trello.boards_list_url.format("missing"), trello.query)
+
+    assert e.value.status_code == 404
+    with pytest.raises(ListNotFoundException):
+        trello.get_desired_list_id(trello.get_board_data(BOARD_URL).id, "DONE")
+
+
+def test_record_and_replay(in_memory_transport, tmp_path) -> None:
+    """
+    Test that recorded traffic is replayed without the credentials, in the recorded order.
+    """
+    recording = tmp_path / "recording.jsonl"
+    with TrelloAPI(rate_limit=False, transport=RecordingTransport(in_memory_transport, recording)) as trello:
+        recorded_card = create_card(trello)
+
+    assert '\\"token\\"' not in recording.read_text()
+    assert len(recording.read_text().splitlines()) == 5
+    assert all(json.loads(line)["status_code"] == 200 for line in recording.read_text().splitlines())
+
+    with TrelloAPI(rate_limit=False, transport=ReplayTransport(recording)) as trello:
+        assert create_card(trello) == recorded_card
+
+        with pytest.raises(RecordingNotFoundException, match="No recording for GET /1/boards/unrecorded/lists"):
+            trello.get_desired_list_id("unrecorded", "TO DO")
+
+
+def test_trello_api_import_skips_fake_trello() -> None:
+    """
+    Test that the test double is only imported with the in-memory transport, not by the production imports.
+    """
+    times = import_times(["-c", "import trello_cli.utils.trello_api"])
+
+    assert "trello_cli.utils.trello_api" in times
+    assert "trello_cli.utils.fake_trello" not in times
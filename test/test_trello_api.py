@@ -1,4 +1,10 @@
-from trello_cli.utils.trello_api import BoardInfo, LabelInfo, CardInfo
+import json
+
+import pytest
+
+from trello_cli.utils.trello_api import (BoardInfo, LabelInfo, CardInfo, ConnectionPoolConfig, RequestType, TrelloAPI,
+                                        parse_board_short_link)
+from trello_cli.utils.transport import InMemoryTransport
 from trello_cli.utils.exceptions import *
 
 
@@ -162,3 +168,129 @@ def test_mock_create_card_comment(mocker, trello_api) -> None:
 
     assert '423142342hbu3h421' == actual_mock_response
 
+
+
+def test_connection_pool_config() -> None:
+    """
+    Test that the TrelloAPI session is mounted with a pooled adapter using the provided settings.
+    """
+    pool_config = ConnectionPoolConfig(pool_connections=2, pool_maxsize=20, keep_alive=False, read_timeout=10)
+
+    with TrelloAPI(pool_config) as trello_api:
+        adapter = trello_api.session.get_adapter("https://api.trello.com/1/cards")
+
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 20
+        assert trello_api.session.headers["Connection"] == "close"
+        assert trello_api.pool_config.timeout == (5.0, 10)
+
+
+def test_mock_call_api_uses_session(mocker, trello_api) -> None:
+    """
+    Test that call_api sends the requests through the shared pooled session.
+    """
+    mocked_response = mocker.Mock(status_code=200, headers={})
+    mocked_response.json.return_value = {'id': '423142342hbu3h421'}
+    mocked_get = mocker.patch.object(trello_api.session, 'get', return_value=mocked_response)
+
+    response = trello_api.call_api(RequestType.GET, 'https://api.trello.com/1/boards/id', trello_api.query)
+
+    assert response == {'id': '423142342hbu3h421'}
+    mocked_get.assert_called_once_with('https://api.trello.com/1/boards/id',
+                                       timeout=trello_api.pool_config.timeout,
+                                       params=trello_api.query)
+
+
+def test_parse_board_short_link() -> None:
+    """
+    Test extracting the shortLink from board urls.
+    """
+    assert parse_board_short_link('https://trello.com/b/zQFa6vj2/canonicaltest') == 'zQFa6vj2'
+    assert parse_board_short_link('https://trello.com/b/zQFa6vj2') == 'zQFa6vj2'
+    assert parse_board_short_link('https://example.com/board') is None
+
+
+def test_mock_get_board_data_fields(mocker, trello_api) -> None:
+    """
+    Test that boards are requested by shortLink with only the needed fields.
+    """
+    mocked_call_api = mocker.patch('trello_cli.utils.trello_api.TrelloAPI.call_api',
+                                   return_value={'id': '423142342hbu3h421', 'name': 'Canonical_test'})
+
+    trello_api.get_board_data(board_url='https://trello.com/b/zQFa6vj2/canonicaltest')
+
+    mocked_call_api.assert_called_once_with(RequestType.GET,
+                                            'https://api.trello.com/1/boards/zQFa6vj2',
+                                            {**trello_api.query, 'fields': 'id,name'})
+
+
+def test_mock_get_board_snapshot(mocker, trello_api) -> None:
+    """
+    Mocked test for the method get_board_snapshot from the TrelloAPI, including name normalization.
+    """
+    mocked_call_api_value = {'id': 'f542hb5564h5jn',
+                             'name': 'Canonical_test',
+                             'lists': [{'id': '423142342hbu3h421', 'name': 'Column 1'},
+                                       {'id': '34234h2ihbj4hu2n3', 'name': 'Column 2'}],
+                             'labels': [{'id': '7j5nbj6km4b64', 'name': 'Custom Label'}]}
+    mocked_call_api = mocker.patch('trello_cli.utils.trello_api.TrelloAPI.call_api',
+                                   return_value=mocked_call_api_value)
+
+    snapshot = trello_api.get_board_snapshot(board_id='f542hb5564h5jn')
+
+    mocked_call_api.assert_called_once()
+    assert snapshot.board == BoardInfo('f542hb5564h5jn', 'Canonical_test')
+    assert snapshot.get_list_id('Column 2') == '34234h2ihbj4hu2n3'
+    assert snapshot.get_label('Custom Label') == LabelInfo('7j5nbj6km4b64', 'Custom Label')
+    with pytest.raises(ListNotFoundException):
+        snapshot.get_list_id('column  2')
+    with pytest.raises(LabelNotFoundException):
+        snapshot.get_label('Custom Label 2')
+
+    snapshot.add_label(LabelInfo('8b5jn6k34jn53jk', 'Custom Label 2'))
+    assert snapshot.get_label('Custom Label 2').id == '8b5jn6k34jn53jk'
+
+    normalized_snapshot = trello_api.get_board_snapshot(board_id='f542hb5564h5jn', normalize=True)
+    assert normalized_snapshot.get_list_id(' column  2') == '34234h2ihbj4hu2n3'
+
+
+def test_iter_cards_pages(mocker) -> None:
+    """
+    Test that iter_cards streams every card of a board, page by page with before cursors, and stops on a short page.
+    """
+    transport = InMemoryTransport()
+    board = transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",))
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    card_ids = [trello.create_card(next(iter(board.lists)), "", f"Card {index}", "").id for index in range(7)]
+    transport.trello.update_card(card_ids[0], closed=True)
+
+    get_cards_page = mocker.spy(trello, "get_cards_page")
+    cards = list(trello.iter_cards("bOaRd123", page_size=3))
+
+    assert [card.id for card in cards] == card_ids[::-1]
+    assert cards[-1].closed and cards[0].name == "Card 6"
+    assert [call.args[1] if len(call.args) > 1 else None for call in get_cards_page.call_args_list] \
+        == [None, card_ids[4], card_ids[1]]
+
+    assert [card.name for card in trello.iter_cards("bOaRd123", since=card_ids[4], page_size=3)] == ["Card 6", "Card 5"]
+    assert len(list(trello.iter_cards("bOaRd123", card_filter="open"))) == 6
+
+
+def test_compact_models() -> None:
+    """
+    Test that the models are slotted, that the ids shared by many cards are stored once, and that records still
+    serialize to plain JSON.
+    """
+    label = LabelInfo.from_dict({'id': '7j5nbj6km4b64', 'name': 'Bug', 'color': None, 'idBoard': 'f542hb5564h5jn'})
+    assert not hasattr(label, '__dict__') and not hasattr(CardInfo(id='1', url=''), '__dict__')
+    assert {label, LabelInfo(id='7j5nbj6km4b64', name='Bug')} == {label}
+
+    transport = InMemoryTransport()
+    board = transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",), label_names=("Bug",))
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    for index in range(2):
+        trello.create_card(next(iter(board.lists)), next(iter(board.labels)), f"Card {index}", "")
+
+    first, second = trello.get_cards_page("bOaRd123")
+    assert first.list_id is second.list_id and first.label_ids[0] is second.label_ids[0]
+    assert json.loads(first.to_json())["label_ids"] == [next(iter(board.labels))]
@@ -1,4 +1,11 @@
+import json
+
+import pytest
+
 from trello_cli.trello_cli import main
+from trello_cli.utils.trello_api import BoardInfo, BoardSnapshot, CardInfo, LabelInfo, TrelloAPI
+from trello_cli.utils.transport import InMemoryTransport
+from trello_cli.utils.exceptions import APIRequestException
 
 
 def test_trello_cli(capsys) -> None:
@@ -27,3 +34,128 @@ def test_trello_cli(capsys) -> None:
 [CHECKPOINT] Card created. Url: {url_created}
 [FINISH] Comment created.
 """
+
+
+def test_mock_trello_cli_bulk(mocker, tmp_path, capsys) -> None:
+    """
+    Mocked test for the trello cli bulk mode, reading the cards from a JSON Lines file.
+    """
+    trello = mocker.MagicMock()
+    trello.__enter__.return_value = trello
+    trello.get_board_data.return_value = BoardInfo('f542hb5564h5jn', 'Canonical_test')
+    trello.get_board_snapshot.return_value = BoardSnapshot.from_dict({'id': 'f542hb5564h5jn',
+                                                                      'name': 'Canonical_test',
+                                                                      'lists': [{'id': 'f43bn5j34b65j2k3',
+                                                                                 'name': 'coluna 1'}],
+                                                                      'labels': [{'id': '7j5nbj6km4b64',
+                                                                                  'name': 'Custom Label'}]})
+    trello.create_card.return_value = CardInfo('423142342hbu3h421', 'https://trello.com/c/fasdfadf/new-card')
+    trello.last_retries = 0
+    mocker.patch('trello_cli.utils.trello_api.TrelloAPI', return_value=trello)
+
+    input_file = tmp_path / "cards.jsonl"
+    input_file.write_text(json.dumps({"board_url": "https://trello.com/b/zQFa6vj2/canonicaltest",
+                                      "list_name": "coluna 1",
+                                      "card_name": "New Card",
+                                      "card_description": "New card description",
+                                      "card_comment": "This is a comment for the new card",
+                                      "label_name": "Custom Label"}) + "\n")
+
+    main(["--input", str(input_file), "--no_cache"])
+
+    output = capsys.readouterr().out
+    assert json.loads(output) == {"row": 1,
+                                  "card_id": "423142342hbu3h421",
+                                  "card_url": "https://trello.com/c/fasdfadf/new-card",
+                                  "retries": 0}
+
+
+def test_mock_trello_cli_refreshes_stale_cache(mocker, monkeypatch, tmp_path, capsys) -> None:
+    """
+    Mocked test for the trello cli, checking that a 404 caused by stale cached IDs refreshes the cache and retries.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    trello = mocker.MagicMock()
+    trello.__enter__.return_value = trello
+    trello.get_board_data.return_value = BoardInfo('f542hb5564h5jn', 'Canonical_test')
+    trello.get_desired_list_id.return_value = 'f43bn5j34b65j2k3'
+    trello.get_label_from_board.return_value = LabelInfo('7j5nbj6km4b64', 'Custom Label')
+    trello.create_card.side_effect = [APIRequestException('404 Client Error', 404),
+                                      CardInfo('423142342hbu3h421', 'https://trello.com/c/fasdfadf/new-card')]
+    mocker.patch('trello_cli.utils.trello_api.TrelloAPI', return_value=trello)
+
+    main(["--board_url", "https://trello.com/b/zQFa6vj2/canonicaltest",
+          "--list_name", "coluna 1",
+          "--card_name", "New Card",
+          "--card_description", "New card description",
+          "--card_comment", "This is a comment for the new card",
+          "--label_name", "Custom Label"])
+
+    assert trello.create_card.call_count == 2
+    assert capsys.readouterr().out.endswith("[CHECKPOINT] Card created. Url: https://trello.com/c/fasdfadf/new-card\n"
+                                            "[FINISH] Comment created.\n")
+
+
+def test_mock_trello_cli_stale_cache_retry_skips_created_card(mocker, monkeypatch, tmp_path) -> None:
+    """
+    Mocked test for the trello cli, checking that a 404 raised once the card is created fails without creating the
+    card again.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    trello = mocker.MagicMock()
+    trello.__enter__.return_value = trello
+    trello.get_board_data.return_value = BoardInfo('f542hb5564h5jn', 'Canonical_test')
+    trello.get_desired_list_id.return_value = 'f43bn5j34b65j2k3'
+    trello.get_label_from_board.return_value = LabelInfo('7j5nbj6km4b64', 'Custom Label')
+    trello.create_card.return_value = CardInfo('423142342hbu3h421', 'https://trello.com/c/fasdfadf/new-card')
+    trello.create_card_comment.side_effect = APIRequestException('404 Client Error', 404)
+    mocker.patch('trello_cli.utils.trello_api.TrelloAPI', return_value=trello)
+
+    with pytest.raises(SystemExit):
+        main(["--board_url", "https://trello.com/b/zQFa6vj2/canonicaltest",
+              "--list_name", "coluna 1",
+              "--card_name", "New Card",
+              "--card_description", "New card description",
+              "--card_comment", "This is a comment for the new card",
+              "--label_name", "Custom Label"])
+
+    assert trello.create_card.call_count == 1
+    trello.cache.invalidate_board_url.assert_not_called()
+
+
+def test_trello_cli_export(mocker, capsys) -> None:
+    """
+    Test that the trello cli export mode writes every card of the board as one NDJSON line.
+    """
+    transport = InMemoryTransport()
+    board = transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",))
+    trello = TrelloAPI(rate_limit=False, transport=transport)
+    for index in range(3):
+        trello.create_card(next(iter(board.lists)), "", f"Card {index}", "Description")
+    mocker.patch('trello_cli.utils.trello_api.TrelloAPI', return_value=trello)
+
+    main(["--export", "--board_url", "https://trello.com/b/bOaRd123/test-board", "--no_cache"])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["Card 2", "Card 1", "Card 0"]
+    assert json.loads(lines[0])["list_id"] == next(iter(board.lists))
+
+
+def test_trello_cli_unknown_list_creates_no_label(mocker) -> None:
+    """
+    Test that a missing label is not created when the list name is wrong, and is created once the list is found.
+    """
+    transport = InMemoryTransport()
+    board = transport.trello.add_board("Test board", "bOaRd123", list_names=("TO DO",))
+    mocker.patch('trello_cli.utils.trello_api.TrelloAPI',
+                 side_effect=lambda **kwargs: TrelloAPI(rate_limit=False, transport=transport))
+    args = ["--board_url", "https://trello.com/b/bOaRd123/test-board", "--card_name", "New Card",
+            "--card_description", "Description", "--card_comment", "Comment", "--label_name", "New label",
+            "--no_cache"]
+
+    with pytest.raises(SystemExit):
+        main([*args, "--list_name", "TO DOO"])
+    assert not board.labels
+
+    main([*args, "--list_name", "TO DO"])
+    assert list(board.labels.values()) == ["New label"]